@@ -2,13 +2,22 @@
 PORT = 5555 # Port for the server to listen on
 HEADER_SIZE = 10 # Fixed size for message length header
 MAX_CLIENTS = 3 # Maximum number of clients the server will accept (including host)
+SUBSCRIBER_PORT = 5556 # Port for privileged snapshot subscribers (relays); no player is created for them
+MAX_SUBSCRIBERS = 4 # Maximum number of relays the server will feed
+RELAY_PORT = 5557 # Port a relay listens on for spectator clients
+RELAY_MAX_SPECTATORS = 64 # Maximum number of spectators a single relay will serve
+RELAY_SEND_TIMEOUT = 0.5 # Seconds before a stalled spectator is dropped by the relay
 
 # Network Variables
 is_host = False
 is_dedicated_host = False # self explanatory dedicated and host (playing) flags
+is_spectator = False # Client watching through a relay: receives snapshots, never sends input
 client_socket = None # Socket for clients connecting to the server
 server_socket = None # Socket for the server listening for clients
+subscriber_socket = None # Socket for the server listening for snapshot subscribers (relays)
 clients = {} # Server: Dictionary to store connected client sockets and addresses {client_socket: address}
+subscribers = {} # Server: Dictionary of relay sockets receiving the default instance's snapshots {subscriber_socket: address}
+client_player_ids = {} # Server: Dictionary mapping client sockets to their player IDs {client_socket: player_id}
 client_threads = [] # Server: List to hold client handling threads
 player_id_counter = 0 # Server: Simple way to assign unique IDs
 network_players = {} # All instances: Dictionary to store player data {player_id: player_object_or_data}
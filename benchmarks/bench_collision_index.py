@@ -0,0 +1,124 @@
+# Benchmark: QuadtreeNode vs StaticGridIndex for overworld collider queries.
+# Run from the repository root:  python -m benchmarks.bench_collision_index
+import math
+import random
+import time
+
+import pygame
+
+from world_structures.world_constants import *
+from world_structures.quadtree import QuadtreeNode, generate_wall_rects
+from world_structures.static_index import StaticGridIndex
+import world_structures.static_index as static_index_module
+
+NUM_TREES = 3000 # Roughly what Poisson-disk sampling places in the forest
+NUM_BUILDINGS = KINGDOM_BUILDING_COUNT
+NUM_QUERIES = 600 # One query per enemy per tick (SWORD_ORC_COUNT)
+TICKS = 60
+
+
+def make_overworld_like_colliders(rng):
+    """Synthetic collider set shaped like the generated overworld (wall stamps, trunks, buildings)."""
+    colliders = []
+    # Kingdom wall: a ring of overlapping stamp rects
+    vertices = []
+    for i in range(KINGDOM_NUM_VERTICES):
+        angle = 2 * math.pi * i / KINGDOM_NUM_VERTICES
+        radius = KINGDOM_RADIUS + rng.uniform(-KINGDOM_RADIUS_VARIATION, KINGDOM_RADIUS_VARIATION)
+        vertices.append((KINGDOM_CENTER_X + radius * math.cos(angle), KINGDOM_CENTER_Y + radius * math.sin(angle)))
+    colliders.extend(generate_wall_rects(vertices, KINGDOM_WALL_THICKNESS, None, None, None))
+    # Tree trunks inside the forest ellipse
+    while len(colliders) < NUM_TREES:
+        angle = rng.uniform(0, 2 * math.pi); r = math.sqrt(rng.random())
+        x = FOREST_CENTER_X + FOREST_RADIUS_X * r * math.cos(angle)
+        y = FOREST_CENTER_Y + FOREST_RADIUS_Y * r * math.sin(angle)
+        w = rng.randint(TRUNK_COLLIDER_WIDTH_MIN, TRUNK_COLLIDER_WIDTH_MAX)
+        h = rng.randint(TRUNK_COLLIDER_HEIGHT_MIN, TRUNK_COLLIDER_HEIGHT_MAX)
+        colliders.append(pygame.Rect(int(x), int(y), w, h))
+    # Buildings inside the kingdom
+    for _ in range(NUM_BUILDINGS):
+        angle = rng.uniform(0, 2 * math.pi); r = rng.uniform(0, KINGDOM_RADIUS * 0.8)
+        colliders.append(pygame.Rect(int(KINGDOM_CENTER_X + r * math.cos(angle)), int(KINGDOM_CENTER_Y + r * math.sin(angle)), 96, 64))
+    return colliders
+
+
+def make_queries(rng, colliders):
+    """Enemy-sized query rects, half of them placed near colliders so results are non-empty."""
+    queries = []
+    for i in range(NUM_QUERIES):
+        if i % 2 == 0:
+            cx, cy = rng.choice(colliders).center
+            cx += rng.randint(-60, 60); cy += rng.randint(-60, 60)
+        else:
+            cx, cy = rng.randint(0, WORLD_WIDTH), rng.randint(0, WORLD_HEIGHT)
+        rect = pygame.Rect(0, 0, 24, 24); rect.center = (cx, cy)
+        queries.append(rect.inflate(2 * 2 + 32, 2 * 2 + 32)) # Same inflation Enemy queries use
+    return queries
+
+
+def time_it(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    print(f"{label:<38} {elapsed_ms:9.2f} ms")
+    return result, elapsed_ms
+
+
+def main():
+    rng = random.Random(RANDOM_SEED)
+    boundary = pygame.Rect(0, 0, WORLD_WIDTH, WORLD_HEIGHT)
+    colliders = [r.clamp(boundary) for r in make_overworld_like_colliders(rng)]
+    queries = make_queries(rng, colliders)
+    print(f"{len(colliders)} colliders, {len(queries)} queries x {TICKS} ticks")
+
+    def build_quadtree():
+        tree = QuadtreeNode(boundary, QT_NODE_CAPACITY)
+        for rect in colliders: tree.insert(rect)
+        return tree
+    quadtree, _ = time_it("build QuadtreeNode", build_quadtree)
+    static_index, _ = time_it("build StaticGridIndex", lambda: StaticGridIndex(boundary, colliders))
+
+    # Check both against a brute-force scan (as sets; order is not part of the contract).
+    # QuadtreeNode.insert files a rect spanning several children under the first child it
+    # overlaps, so the quadtree can miss colliders near child borders; count those misses.
+    quadtree_missed = 0
+    for rect in queries:
+        expected = sorted(tuple(r) for r in colliders if rect.colliderect(r))
+        got = sorted(tuple(r) for r in static_index.query(rect))
+        assert expected == got, f"StaticGridIndex mismatch for {rect}: {expected} != {got}"
+        quadtree_missed += len(expected) - len(quadtree.query(rect))
+    print(f"StaticGridIndex matches brute force for all queries (QuadtreeNode missed {quadtree_missed} hits)")
+
+    def run_quadtree():
+        for _ in range(TICKS):
+            for rect in queries: quadtree.query(rect)
+    def run_static_rects():
+        for _ in range(TICKS):
+            for rect in queries: static_index.query(rect)
+    def run_static_indices():
+        buffer = []
+        for _ in range(TICKS):
+            for rect in queries: static_index.query_indices(rect, buffer)
+
+    def run_static_batch():
+        for _ in range(TICKS):
+            static_index.query_batch(queries)
+
+    # Batch results must equal the one-at-a-time results
+    for rect, batch_result, loop_result in zip(queries, static_index.query_batch(queries), static_index._query_batch_loop(queries)):
+        assert sorted(map(tuple, batch_result)) == sorted(map(tuple, loop_result)) == sorted(map(tuple, static_index.query(rect)))
+
+    _, quadtree_ms = time_it("QuadtreeNode.query", run_quadtree)
+    _, static_ms = time_it("StaticGridIndex.query", run_static_rects)
+    _, indices_ms = time_it("StaticGridIndex.query_indices(buffer)", run_static_indices)
+    _, batch_ms = time_it("StaticGridIndex.query_batch", run_static_batch)
+    per_tick = lambda ms: ms / TICKS
+    print(f"per tick: quadtree {per_tick(quadtree_ms):.3f} ms, static {per_tick(static_ms):.3f} ms "
+          f"({quadtree_ms / max(static_ms, 1e-9):.1f}x), indices {per_tick(indices_ms):.3f} ms "
+          f"({quadtree_ms / max(indices_ms, 1e-9):.1f}x)")
+    print(f"batched: {per_tick(batch_ms):.3f} ms ({quadtree_ms / max(batch_ms, 1e-9):.1f}x)"
+          f"{'' if static_index_module.np is not None else ' (NumPy not installed: per-query fallback)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# Benchmark: per-object Enemy.update loop (with and without AI LOD) vs the EnemySoA array backend.
+# Run from the repository root:  python -m benchmarks.bench_enemy_sim
+# The object loop below mirrors CombatManager.update (combat_manager itself imports the
+# Player module, which needs the full game environment).
+# The backends are compared under a fixed clock: every tick advances the shared animation
+# clock by DT, so all of them play the same animation time and agree tick for tick.
+import math
+import random
+import time
+
+import pygame
+
+from world_structures.world_constants import *
+from world_structures.static_index import StaticGridIndex
+from world_structures.spatial_hash import SpatialHash
+from world_structures.line_of_sight import LineOfSightCache
+from world_structures.entity_registry import EntityRegistry
+from world_structures.collider_cache import refresh_collider_caches
+from world_structures.animation import ANIMATION_CLOCK
+from enemies.sword_orc import Sword_Orc
+import enemies.enemy_soa as enemy_soa_module
+from enemies.enemy_soa import EnemySoA
+from enemies.ai_lod import AILevelOfDetail
+
+ENEMY_COUNTS = (600, 5000, 50000)
+NUM_PLAYERS = 4
+NUM_TREES = 3000
+TICKS = 60
+DT = 1 / 60
+TICK_MS = int(DT * 1000)
+
+
+class BenchPlayer:
+    """Just the fields enemies read from a player."""
+    def __init__(self, player_id, x, y):
+        self.player_id = player_id; self.x = x; self.y = y
+        self.is_dead = False; self.agility = 0.0
+
+
+def make_frames():
+    surface = pygame.Surface((4, 4))
+    return [surface] * 6, [surface] * 8, [surface] * 6, [surface] * 4, [surface] * 6, (48, 48)
+
+
+def make_world(rng, enemy_count):
+    trees = []
+    for _ in range(NUM_TREES):
+        rect = pygame.Rect(rng.randint(0, WORLD_WIDTH - 40), rng.randint(0, WORLD_HEIGHT - 40),
+                           rng.randint(TRUNK_COLLIDER_WIDTH_MIN, TRUNK_COLLIDER_WIDTH_MAX),
+                           rng.randint(TRUNK_COLLIDER_HEIGHT_MIN, TRUNK_COLLIDER_HEIGHT_MAX))
+        trees.append(rect)
+    index = StaticGridIndex(pygame.Rect(0, 0, WORLD_WIDTH, WORLD_HEIGHT), trees)
+    players = {pid: BenchPlayer(pid, rng.uniform(2000, WORLD_WIDTH - 2000), rng.uniform(2000, WORLD_HEIGHT - 2000))
+               for pid in range(NUM_PLAYERS)}
+    # A tenth of the enemies start around the players so chasing/attacking is exercised
+    positions = []
+    player_list = list(players.values())
+    for i in range(enemy_count):
+        if i % 10 == 0:
+            player = player_list[i // 10 % NUM_PLAYERS]
+            angle = rng.uniform(0, 2 * math.pi); dist = rng.uniform(20, 400)
+            positions.append((player.x + dist * math.cos(angle), player.y + dist * math.sin(angle)))
+        else:
+            positions.append((rng.uniform(100, WORLD_WIDTH - 100), rng.uniform(100, WORLD_HEIGHT - 100)))
+    return index, players, positions
+
+
+def make_enemies(positions, frames):
+    registry = EntityRegistry() # Ids as CombatManager.add_enemy assigns them
+    enemies = [Sword_Orc(x, y, *frames) for x, y in positions]
+    for enemy in enemies: enemy.id = registry.add(enemy, 'enemy')
+    return enemies
+
+
+def run_objects(enemies, players, index):
+    los_cache = LineOfSightCache()
+    enemy_grid = SpatialHash(); player_grid = SpatialHash()
+    for enemy in enemies: enemy_grid.insert(enemy, enemy.x, enemy.y)
+    hits = 0
+    for _ in range(TICKS):
+        ANIMATION_CLOCK.now_ms += TICK_MS # Fixed step instead of wall time (run_server_tick uses tick())
+        los_cache.advance()
+        player_grid.sync(players.values())
+        refresh_collider_caches(enemies, index)
+        for enemy in enemies:
+            nearby_players = player_grid.query_radius(enemy.x, enemy.y, enemy.detection_radius)
+            if enemy.update(nearby_players, DT, enemy.collider_cache.colliders, None, index, None,
+                            enemy.collider_cache.segments, None, los_cache) and enemy.target_player:
+                hits += 1
+            enemy_grid.move(enemy, enemy.x, enemy.y)
+    return hits
+
+
+def run_objects_lod(enemies, players, index):
+    los_cache = LineOfSightCache()
+    enemy_grid = SpatialHash(); player_grid = SpatialHash()
+    for enemy in enemies: enemy_grid.insert(enemy, enemy.x, enemy.y)
+    ai_lod = AILevelOfDetail()
+    hits = 0; updated = 0
+    for _ in range(TICKS):
+        ANIMATION_CLOCK.now_ms += TICK_MS # Fixed step instead of wall time (run_server_tick uses tick())
+        los_cache.advance()
+        player_grid.sync(players.values())
+        to_update, timers_only = ai_lod.plan(enemies, enemy_grid, players.values(), DT)
+        for enemy in timers_only: enemy.advance_timers(ai_lod.elapsed(enemy, DT))
+        refresh_collider_caches(to_update, index)
+        for enemy in to_update:
+            nearby_players = player_grid.query_radius(enemy.x, enemy.y, enemy.detection_radius)
+            if enemy.update(nearby_players, ai_lod.update_dt(enemy, DT), enemy.collider_cache.colliders, None, index, None,
+                            enemy.collider_cache.segments, None, los_cache) and enemy.target_player:
+                hits += 1
+            enemy_grid.move(enemy, enemy.x, enemy.y)
+            ai_lod.after_update(enemy)
+        updated += len(to_update)
+    print(f"  AI LOD tiers (last tick): {ai_lod.counts}, {updated / TICKS:.0f} full updates/tick")
+    return hits
+
+
+def run_soa(enemies, players, index):
+    los_cache = LineOfSightCache()
+    enemy_grid = SpatialHash()
+    sim = EnemySoA(seed=RANDOM_SEED)
+    for enemy in enemies:
+        enemy_grid.insert(enemy, enemy.x, enemy.y); sim.add(enemy)
+    hits = 0
+    for _ in range(TICKS):
+        ANIMATION_CLOCK.now_ms += TICK_MS # Fixed step instead of wall time (run_server_tick uses tick())
+        los_cache.advance()
+        hit_views, _ = sim.step(list(players.values()), DT, index, los_cache,
+                                refresh_colliders=lambda movers: refresh_collider_caches(movers, index))
+        hits += len(hit_views)
+        for enemy in sim.moved_views: enemy_grid.move(enemy, enemy.x, enemy.y)
+    return hits
+
+
+def summarize(enemies):
+    """State histogram, to check both backends behave alike."""
+    counts = {}
+    for enemy in enemies: counts[enemy.state] = counts.get(enemy.state, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def main():
+    if enemy_soa_module.np is None:
+        print("NumPy not installed: EnemySoA is unavailable."); return
+    pygame.init()
+    frames = make_frames()
+    for count in ENEMY_COUNTS:
+        rng = random.Random(RANDOM_SEED)
+        index, players, positions = make_world(rng, count)
+        print(f"--- {count} enemies, {NUM_PLAYERS} players, {TICKS} ticks ---")
+        results = {}
+        for label, runner in (("Enemy.update loop", run_objects), ("Enemy.update + AI LOD", run_objects_lod),
+                              ("EnemySoA.step", run_soa)):
+            random.seed(RANDOM_SEED); ANIMATION_CLOCK.now_ms = 0
+            enemies = make_enemies(positions, frames)
+            start = time.perf_counter()
+            hits = runner(enemies, players, index)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            results[label] = elapsed_ms
+            print(f"{label:<22} {elapsed_ms / TICKS:8.2f} ms/tick  hits={hits}  states={summarize(enemies)}")
+        baseline = results['Enemy.update loop']
+        print(f"speedup: AI LOD {baseline / max(results['Enemy.update + AI LOD'], 1e-9):.1f}x, "
+              f"EnemySoA {baseline / max(results['EnemySoA.step'], 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
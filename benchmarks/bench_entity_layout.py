@@ -0,0 +1,66 @@
+# Benchmark: Enemy instance memory and hot-loop attribute access (slots + per-type archetype layout).
+# Run from the repository root:  python -m benchmarks.bench_entity_layout
+# Reports the memory each live enemy costs (frame lists are shared and not counted), the
+# time to read the fields Enemy.update reads every tick, and the object update loop itself.
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from world_structures.world_constants import RANDOM_SEED
+from benchmarks.bench_enemy_sim import make_frames, make_world, make_enemies, run_objects, TICKS
+
+ENEMY_COUNTS = (600, 10000)
+ACCESS_ROUNDS = 20
+
+
+def instance_bytes(enemy):
+    """Shallow size of the instance plus its attribute dict (if it has one)."""
+    size = sys.getsizeof(enemy)
+    if hasattr(enemy, '__dict__'): size += sys.getsizeof(enemy.__dict__)
+    return size
+
+
+def measure_memory(positions, frames):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    enemies = make_enemies(positions, frames)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return enemies, allocated
+
+
+def measure_access(enemies):
+    """Reads the per-tick fields of Enemy.update the way the loop does (instance state + stats)."""
+    start = time.perf_counter()
+    total = 0.0
+    for _ in range(ACCESS_ROUNDS):
+        for enemy in enemies:
+            arch = getattr(enemy, 'archetype', enemy) # Stats come from the archetype when there is one
+            total += enemy.x + enemy.y + enemy.attack_cooldown_timer + enemy.wander_timer
+            total += arch.speed + arch.detection_radius_sq + arch.stopping_range_sq + arch.attack_trigger_range_sq
+    return (time.perf_counter() - start) * 1e9 / (ACCESS_ROUNDS * len(enemies))
+
+
+def main():
+    pygame.init()
+    frames = make_frames()
+    for count in ENEMY_COUNTS:
+        rng = random.Random(RANDOM_SEED)
+        index, players, positions = make_world(rng, count)
+        print(f"--- {count} enemies ---")
+        random.seed(RANDOM_SEED)
+        enemies, allocated = measure_memory(positions, frames)
+        print(f"memory:        {allocated / 1024:9.1f} KiB total, {allocated / count:7.0f} B/enemy "
+              f"(instance + __dict__: {instance_bytes(enemies[0])} B)")
+        print(f"field reads:   {measure_access(enemies):9.1f} ns/enemy (8 hot fields)")
+        start = time.perf_counter()
+        run_objects(enemies, players, index)
+        print(f"update loop:   {(time.perf_counter() - start) * 1000.0 / TICKS:9.2f} ms/tick")
+
+
+if __name__ == "__main__":
+    main()
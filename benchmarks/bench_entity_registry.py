@@ -0,0 +1,56 @@
+# Benchmark: removing dead enemies with list.remove (the old CombatManager path) vs EntityRegistry.
+# Run from the repository root:  python -m benchmarks.bench_entity_registry
+import random
+import time
+
+from world_structures.world_constants import RANDOM_SEED
+from world_structures.entity_registry import EntityRegistry
+
+ENTITY_COUNTS = (600, 5000, 50000)
+DEATH_FRACTION = 0.02 # Share of the enemies that die (and are replaced) each tick
+TICKS = 60
+
+
+class BenchEntity:
+    """Stand-in for an Enemy: only identity and an id matter here."""
+    def __init__(self):
+        self.id = None
+
+
+def run_list(count, rng):
+    enemies = [BenchEntity() for _ in range(count)]
+    per_tick = max(1, int(count * DEATH_FRACTION))
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        for enemy in rng.sample(enemies, per_tick): enemies.remove(enemy)
+        enemies.extend(BenchEntity() for _ in range(per_tick))
+        for enemy in enemies: pass # Per-tick iteration
+    return (time.perf_counter() - start) * 1000.0
+
+
+def run_registry(count, rng):
+    registry = EntityRegistry()
+    for _ in range(count):
+        enemy = BenchEntity(); enemy.id = registry.add(enemy, 'enemy')
+    enemies = registry.entities('enemy')
+    per_tick = max(1, int(count * DEATH_FRACTION))
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        for enemy in rng.sample(enemies, per_tick): registry.remove(enemy.id)
+        for _ in range(per_tick):
+            enemy = BenchEntity(); enemy.id = registry.add(enemy, 'enemy')
+        for enemy in enemies: pass # Per-tick iteration over the dense range
+    return (time.perf_counter() - start) * 1000.0
+
+
+def main():
+    for count in ENTITY_COUNTS:
+        print(f"--- {count} enemies, {DEATH_FRACTION:.0%} replaced per tick, {TICKS} ticks ---")
+        list_ms = run_list(count, random.Random(RANDOM_SEED))
+        registry_ms = run_registry(count, random.Random(RANDOM_SEED))
+        print(f"list.remove      {list_ms / TICKS:8.3f} ms/tick")
+        print(f"EntityRegistry   {registry_ms / TICKS:8.3f} ms/tick  ({list_ms / max(registry_ms, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Benchmark: the old per-entity movement (Vector2 direction + normalize, first-collider-only
+# axis pushes) vs the shared kinematic mover (plain floats, preallocated rects, batch API).
+# Run from the repository root:  python -m benchmarks.bench_kinematics
+# Reports time per tick and the memory blocks allocated per mover per tick (tracemalloc).
+import math
+import random
+import time
+import tracemalloc
+
+import pygame
+
+from world_structures.world_constants import RANDOM_SEED, WORLD_WIDTH, WORLD_HEIGHT
+from world_structures.kinematics import move_body, clamp_body, move_bodies
+from world_structures.collider_cache import ColliderCache
+
+MOVER_COUNTS = (600, 5000)
+COLLIDERS_PER_MOVER = 12
+TICKS = 60
+DT = 1 / 60
+SPEED = 2.0
+RADIUS = 10
+
+
+class BenchMover:
+    """x/y, a preallocated rect, a target and a collider cache: what the movers share."""
+    def __init__(self, rng):
+        self.x = rng.uniform(1000, WORLD_WIDTH - 1000); self.y = rng.uniform(1000, WORLD_HEIGHT - 1000)
+        self.rect = pygame.Rect(0, 0, RADIUS * 2, RADIUS * 2); self.rect.center = (int(self.x), int(self.y))
+        self.radius = RADIUS
+        self.target = (self.x + rng.uniform(-300, 300), self.y + rng.uniform(-300, 300))
+        self.last_direction = pygame.math.Vector2(1, 0)
+        self.collider_cache = ColliderCache()
+        self.collider_cache.colliders = [pygame.Rect(int(self.x + rng.uniform(-80, 80)), int(self.y + rng.uniform(-80, 80)),
+                                                     rng.randint(8, 30), rng.randint(8, 30)) for _ in range(COLLIDERS_PER_MOVER)]
+
+
+def old_step(mover):
+    """The removed Enemy.update/apply_move path (the NPC one also copied the rect per axis)."""
+    direction = pygame.math.Vector2(mover.target) - pygame.math.Vector2(mover.x, mover.y)
+    if direction.length_squared() <= 1: return
+    move_vector = direction.normalize()
+    mover.last_direction = move_vector.copy()
+    final_move_vector = move_vector * SPEED * DT * 60
+    colliders = mover.collider_cache.colliders
+    mover.x += final_move_vector.x
+    mover.rect.centerx = int(mover.x)
+    for obstacle in colliders:
+        if mover.rect.colliderect(obstacle):
+            if final_move_vector.x > 0: mover.rect.right = obstacle.left
+            elif final_move_vector.x < 0: mover.rect.left = obstacle.right
+            mover.x = mover.rect.centerx
+            break
+    mover.y += final_move_vector.y
+    mover.rect.centery = int(mover.y)
+    for obstacle in colliders:
+        if mover.rect.colliderect(obstacle):
+            if final_move_vector.y > 0: mover.rect.bottom = obstacle.top
+            elif final_move_vector.y < 0: mover.rect.top = obstacle.bottom
+            mover.y = mover.rect.centery
+            break
+    mover.x = mover.rect.centerx; mover.y = mover.rect.centery
+    mover.x = max(RADIUS, min(mover.x, WORLD_WIDTH - RADIUS)); mover.y = max(RADIUS, min(mover.y, WORLD_HEIGHT - RADIUS))
+    mover.rect.center = (int(mover.x), int(mover.y))
+
+
+def new_step(mover):
+    to_x = mover.target[0] - mover.x; to_y = mover.target[1] - mover.y
+    dist_sq = to_x * to_x + to_y * to_y
+    if dist_sq <= 1: return
+    dist = math.sqrt(dist_sq)
+    mover.last_direction.update(to_x / dist, to_y / dist)
+    step = SPEED * DT * 60 / dist
+    cache = mover.collider_cache
+    move_body(mover, to_x * step, to_y * step, cache.colliders, cache.segments)
+    clamp_body(mover, RADIUS, WORLD_WIDTH, WORLD_HEIGHT)
+
+
+def batch_step(movers):
+    moves_x = []; moves_y = []
+    for mover in movers:
+        to_x = mover.target[0] - mover.x; to_y = mover.target[1] - mover.y
+        dist = math.sqrt(to_x * to_x + to_y * to_y)
+        scale = SPEED * DT * 60 / dist if dist > 1 else 0.0
+        moves_x.append(to_x * scale); moves_y.append(to_y * scale)
+    move_bodies(movers, moves_x, moves_y, True, WORLD_WIDTH, WORLD_HEIGHT)
+
+
+def run(count, tick):
+    movers = [BenchMover(random.Random(RANDOM_SEED + i)) for i in range(count)]
+    start = time.perf_counter()
+    for _ in range(TICKS): tick(movers)
+    elapsed_ms = (time.perf_counter() - start) * 1000.0 / TICKS
+    # Allocation count for one more tick (separate run: tracemalloc slows everything down)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tick(movers)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return elapsed_ms, blocks / count
+
+
+def main():
+    pygame.init()
+    backends = (("old Vector2 path", lambda movers: [old_step(m) for m in movers]),
+                ("move_body", lambda movers: [new_step(m) for m in movers]),
+                ("move_bodies (batch)", batch_step))
+    for count in MOVER_COUNTS:
+        print(f"--- {count} movers, {COLLIDERS_PER_MOVER} colliders each, {TICKS} ticks ---")
+        for name, tick in backends:
+            elapsed_ms, blocks = run(count, tick)
+            print(f"{name:20s} {elapsed_ms:8.3f} ms/tick  {blocks:5.2f} live blocks/mover after a tick")
+
+
+if __name__ == "__main__":
+    main()
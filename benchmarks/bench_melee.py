@@ -0,0 +1,91 @@
+# Benchmark: resolving one melee swing by scanning every enemy vs a SpatialHash broadphase
+# followed by melee_targets (per-candidate loop and one NumPy pass) and apply_melee_damage.
+# Run from the repository root:  python -m benchmarks.bench_melee
+# Swing latency should stay flat with the broadphase as the enemy count grows.
+import math
+import random
+import time
+
+import enemies.melee as melee_module
+from world_structures.world_constants import RANDOM_SEED, WORLD_WIDTH, WORLD_HEIGHT
+from world_structures.spatial_hash import SpatialHash
+from enemies.melee import melee_targets, apply_melee_damage
+from enemies.stat_constants import PLAYER_ATTACK_RANGE, PLAYER_ATTACK_POWER # Same values combat_mech exports
+
+ENEMY_COUNTS = (600, 5000, 50000)
+CROWD = 40 # Enemies packed around the attacker (a mob fight), the rest spread over the world
+SWINGS = 500
+
+
+class BenchTarget:
+    """The fields a swing reads from an enemy, and a take_damage that only reports the damage."""
+    def __init__(self, enemy_id, x, y):
+        self.id = enemy_id; self.x = x; self.y = y
+        self.radius = 12.0; self.agility = 0.05; self.is_dead = False
+
+    def take_damage(self, amount):
+        return amount
+
+
+def make_targets(rng, count, center):
+    targets = []
+    for i in range(count):
+        if i < CROWD:
+            angle = rng.uniform(0, 2 * math.pi); dist = rng.uniform(0, PLAYER_ATTACK_RANGE * 1.5)
+            targets.append(BenchTarget(i, center[0] + dist * math.cos(angle), center[1] + dist * math.sin(angle)))
+        else:
+            targets.append(BenchTarget(i, rng.uniform(0, WORLD_WIDTH), rng.uniform(0, WORLD_HEIGHT)))
+    return targets
+
+
+def swing_full_scan(targets, grid, center_x, center_y, reach_sq, max_radius):
+    """Distance from the attack center to every enemy, one random() per overlap (the pre-broadphase path)."""
+    events = []
+    for target in targets:
+        if target.is_dead: continue
+        if (target.x - center_x) ** 2 + (target.y - center_y) ** 2 < reach_sq + target.radius ** 2:
+            if random.random() < target.agility: continue
+            events.append({'target_id': target.id, 'damage': target.take_damage(PLAYER_ATTACK_POWER)})
+    return events
+
+
+def swing_broadphase(targets, grid, center_x, center_y, reach_sq, max_radius):
+    """What CombatManager.handle_player_attack does for enemies."""
+    events = []
+    candidates = [t for t in grid.query_radius(center_x, center_y, math.sqrt(reach_sq + max_radius ** 2)) if not t.is_dead]
+    hit, dodged = melee_targets(candidates, center_x, center_y, reach_sq)
+    apply_melee_damage(0, 'enemy', hit, dodged, PLAYER_ATTACK_POWER, 'id', events)
+    return events
+
+
+def run(swing, targets, grid, center):
+    reach_sq = (PLAYER_ATTACK_RANGE * 0.8) ** 2
+    events = 0
+    start = time.perf_counter()
+    for _ in range(SWINGS):
+        events += len(swing(targets, grid, center[0], center[1], reach_sq, 12.0))
+    return (time.perf_counter() - start) * 1e6 / SWINGS, events / SWINGS
+
+
+def main():
+    center = (WORLD_WIDTH / 2, WORLD_HEIGHT / 2)
+    for count in ENEMY_COUNTS:
+        targets = make_targets(random.Random(RANDOM_SEED), count, center)
+        grid = SpatialHash()
+        for target in targets: grid.insert(target, target.x, target.y)
+        print(f"--- {count} enemies ({CROWD} around the attacker), {SWINGS} swings ---")
+        scan_us, scan_events = run(swing_full_scan, targets, grid, center)
+        print(f"full scan                  {scan_us:9.1f} us/swing  {scan_events:5.1f} hits/swing")
+        vectorize_min = melee_module.MELEE_VECTORIZE_MIN
+        melee_module.MELEE_VECTORIZE_MIN = float('inf') # Force the per-candidate loop
+        loop_us, loop_events = run(swing_broadphase, targets, grid, center)
+        melee_module.MELEE_VECTORIZE_MIN = 0 # Force the NumPy pass
+        array_us, array_events = run(swing_broadphase, targets, grid, center)
+        melee_module.MELEE_VECTORIZE_MIN = vectorize_min
+        print(f"broadphase + loop          {loop_us:9.1f} us/swing  {loop_events:5.1f} events/swing (hits + dodges)")
+        if melee_module.np is not None:
+            print(f"broadphase + NumPy pass    {array_us:9.1f} us/swing  {array_events:5.1f} events/swing (hits + dodges)")
+
+
+if __name__ == "__main__":
+    main()
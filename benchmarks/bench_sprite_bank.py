@@ -0,0 +1,75 @@
+# Benchmark: drawing on-screen enemies with a per-draw transform.flip (the old Enemy.draw path)
+# vs indexing the prebuilt AnimationBank variants.
+# Run from the repository root:  python -m benchmarks.bench_sprite_bank
+# Uses SDL's dummy video driver so convert_alpha() has a display format without opening a window.
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from world_structures.world_constants import RANDOM_SEED, SCREEN_WIDTH, SCREEN_HEIGHT
+from world_structures.animation import ANIMATION_CLOCK
+from world_structures.sprite_bank import AnimationBank
+from enemies.sword_orc import Sword_Orc
+
+ENEMY_COUNTS = (100, 500, 2000)
+FRAME_SIZE = (48, 48)
+FRAMES = 60
+
+
+def make_animations(rng):
+    """Sprite-sized per-pixel-alpha frames (like load_sprite_sheet output)."""
+    def frames(count):
+        result = []
+        for _ in range(count):
+            frame = pygame.Surface(FRAME_SIZE, pygame.SRCALPHA)
+            frame.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256), 200))
+            result.append(frame)
+        return result
+    return {'idle': frames(6), 'walk': frames(8), 'attack': frames(6), 'hurt': frames(4), 'death': frames(6),
+            'dims': FRAME_SIZE}
+
+
+def draw_flip_per_call(enemy, surface, camera):
+    """The old draw path: pick the frame, flip a fresh copy when facing left, blit."""
+    frames = getattr(enemy, enemy.current_animation_type + '_animation_frames')
+    image = frames[min(enemy.current_frame_index, len(frames) - 1)]
+    if not enemy.facing_right: image = pygame.transform.flip(image, True, False)
+    x, y = camera(enemy.x, enemy.y)
+    surface.blit(image, (x - enemy.frame_width // 2, y - enemy.frame_height // 2))
+
+
+def run(enemies, surface, draw):
+    camera = lambda x, y: (int(x), int(y))
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        ANIMATION_CLOCK.tick()
+        for enemy in enemies: draw(enemy, surface, camera)
+    return (time.perf_counter() - start) * 1000.0 / FRAMES
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = random.Random(RANDOM_SEED)
+    animations = make_animations(rng)
+    start = time.perf_counter()
+    AnimationBank.of(animations) # What run_loading_screen does once per type
+    print(f"bank build: {(time.perf_counter() - start) * 1000.0:.2f} ms (one-time, at load)")
+    frames = [animations[name] for name in ('idle', 'walk', 'attack', 'hurt', 'death')]
+    for count in ENEMY_COUNTS:
+        enemies = [Sword_Orc(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), *frames, FRAME_SIZE)
+                   for _ in range(count)]
+        for enemy in enemies:
+            enemy.facing_right = rng.random() < 0.5; enemy.start_animation(rng.choice(('idle', 'walk')))
+        print(f"--- {count} on-screen enemies, {FRAMES} frames ---")
+        flip_ms = run(enemies, screen, draw_flip_per_call)
+        bank_ms = run(enemies, screen, lambda enemy, surface, camera: enemy.draw(surface, camera))
+        print(f"flip per draw    {flip_ms:8.3f} ms/frame")
+        print(f"AnimationBank    {bank_ms:8.3f} ms/frame  ({flip_ms / max(bank_ms, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
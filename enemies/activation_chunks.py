@@ -0,0 +1,112 @@
+from collections import namedtuple
+
+from .stat_constants import ENEMY_CHUNK_SIZE, ENEMY_ACTIVATION_RADIUS, ENEMY_SLEEP_GRACE
+from .ai_lod import LOD_BUSY_STATES
+
+# Compact record for an enemy that is not being simulated (health None = full health)
+DormantEnemy = namedtuple('DormantEnemy', ('type_name', 'x', 'y', 'health'))
+
+
+# --- Dormant Enemy Chunks ---
+class EnemyActivationChunks:
+    """
+    Splits the world into square chunks. Chunks with no player within
+    `activation_radius` hold their enemies as DormantEnemy records (filed by spawn
+    point) only; update() reports which records to instantiate when a player comes
+    near and which live enemies to put back to sleep once the chunk they are in now
+    has been out of range for `sleep_grace` seconds. Enemies that are busy (chasing,
+    attacking, ...) or have a target never sleep. CombatManager does the actual
+    creating/removing.
+    """
+    def __init__(self, chunk_size=ENEMY_CHUNK_SIZE, activation_radius=ENEMY_ACTIVATION_RADIUS,
+                 sleep_grace=ENEMY_SLEEP_GRACE):
+        self.chunk_size = chunk_size
+        self.activation_radius = activation_radius
+        self.sleep_grace = sleep_grace
+        self.time = 0.0
+        self.dormant = {} # {chunk: [DormantEnemy, ...]}
+        self.awake = {} # {chunk: time a player was last in range}
+        self.chunk_enemies = {} # {chunk: set of live enemies currently in it}
+        self.enemy_chunks = {} # {enemy: chunk}
+        self.dormant_count = 0
+
+    def chunk_of(self, x, y):
+        return (int(x // self.chunk_size), int(y // self.chunk_size))
+
+    # --- Records / Tracking ---
+    def add_record(self, type_name, x, y, health=None):
+        """Registers an enemy that starts asleep (it is created once a player comes near)."""
+        self.dormant.setdefault(self.chunk_of(x, y), []).append(DormantEnemy(type_name, x, y, health))
+        self.dormant_count += 1
+
+    def track(self, enemy):
+        """Files a live enemy under the chunk it is in."""
+        chunk = self.chunk_of(enemy.x, enemy.y)
+        self.chunk_enemies.setdefault(chunk, set()).add(enemy)
+        self.enemy_chunks[enemy] = chunk
+        # A chunk nobody has seen yet starts its grace period now (otherwise it would never expire)
+        if chunk not in self.awake: self.awake[chunk] = self.time
+
+    def refile(self, enemies):
+        """Moves enemies that crossed a chunk boundary since the last call to their new chunk."""
+        enemy_chunks = self.enemy_chunks; size = self.chunk_size
+        for enemy in enemies:
+            chunk = (int(enemy.x // size), int(enemy.y // size))
+            if enemy_chunks.get(enemy) != chunk:
+                self.forget(enemy); self.track(enemy)
+
+    def forget(self, enemy):
+        chunk = self.enemy_chunks.pop(enemy, None)
+        if chunk is None: return
+        members = self.chunk_enemies.get(chunk)
+        if members is not None:
+            members.discard(enemy)
+            if not members: del self.chunk_enemies[chunk]
+
+    def put_to_sleep(self, enemy):
+        """Stores a live enemy back as a record at its spawn point (it walks home while asleep)."""
+        self.forget(enemy)
+        health = enemy.health if enemy.health < enemy.max_health else None
+        self.add_record(enemy.enemy_type, enemy.spawn_x, enemy.spawn_y, health)
+
+    # --- Per Tick ---
+    def chunks_in_range(self, players):
+        """Chunks whose area comes within activation_radius of any player."""
+        size = self.chunk_size; radius = self.activation_radius; radius_sq = radius * radius
+        chunks = set()
+        for player in players:
+            if player is None: continue
+            px, py = player.x, player.y
+            for cy in range(int((py - radius) // size), int((py + radius) // size) + 1):
+                # Vertical distance from the player to this chunk row (0 inside it)
+                dy = max(cy * size - py, 0, py - (cy + 1) * size)
+                for cx in range(int((px - radius) // size), int((px + radius) // size) + 1):
+                    dx = max(cx * size - px, 0, px - (cx + 1) * size)
+                    if dx * dx + dy * dy <= radius_sq: chunks.add((cx, cy))
+        return chunks
+
+    def update(self, players, dt):
+        """
+        Advances the chunk clock. Returns (records to wake, live enemies to put to sleep);
+        the caller creates/removes them.
+        """
+        self.time += dt
+        to_wake = []
+        for chunk in self.chunks_in_range(players):
+            self.awake[chunk] = self.time
+            records = self.dormant.pop(chunk, None)
+            if records:
+                to_wake.extend(records)
+                self.dormant_count -= len(records)
+
+        to_sleep = []
+        expired = [chunk for chunk, last_seen in self.awake.items() if self.time - last_seen > self.sleep_grace]
+        for chunk in expired:
+            busy = False
+            for enemy in self.chunk_enemies.get(chunk, ()):
+                if enemy.target_player is not None or enemy.state in LOD_BUSY_STATES: busy = True
+                else: to_sleep.append(enemy)
+            # Busy enemies stay awake; their chunk gets a fresh grace period instead of sleeping
+            if busy: self.awake[chunk] = self.time
+            else: del self.awake[chunk]
+        return to_wake, to_sleep
@@ -0,0 +1,97 @@
+from .stat_constants import (ENEMY_LOD_NEAR_DISTANCE, ENEMY_LOD_MID_DISTANCE,
+                             ENEMY_LOD_MID_INTERVAL, ENEMY_LOD_FAR_INTERVAL)
+
+# States that keep an enemy at least at the mid tier wherever it is (it is doing something)
+LOD_BUSY_STATES = ('chasing', 'attacking', 'returning', 'hurt', 'dead')
+
+
+# --- AI Level of Detail ---
+class AILevelOfDetail:
+    """
+    Decides which enemies get a full update this tick, based on the distance to the
+    closest player:
+      near (<= near_distance): every tick
+      mid  (<= mid_distance, or busy anywhere): every `mid_interval` ticks, staggered by enemy id
+      far  (everything else): timers only, a 1/`far_interval` slice of the list per tick
+    Skipped time is not lost: each enemy remembers the LOD clock at its last update and
+    gets the elapsed time as its dt (capped at `max_update_dt`; the remainder goes to its
+    timers so a long-idle enemy does not jump across the map when it is promoted).
+    """
+    def __init__(self, near_distance=ENEMY_LOD_NEAR_DISTANCE, mid_distance=ENEMY_LOD_MID_DISTANCE,
+                 mid_interval=ENEMY_LOD_MID_INTERVAL, far_interval=ENEMY_LOD_FAR_INTERVAL):
+        self.near_distance = near_distance
+        self.mid_distance = mid_distance
+        self.mid_interval = max(1, mid_interval)
+        self.far_interval = max(1, far_interval)
+        self.tick = 0
+        self.time = 0.0 # Seconds of simulated time, the clock enemy.lod_last_time refers to
+        self.max_update_dt = 0.0
+        self.busy = set() # Enemies in LOD_BUSY_STATES after their last update
+
+        # Tier sizes and work done in the last plan() (read by CombatManager for the tick profiler)
+        self.counts = {}
+
+    def plan(self, enemies, enemy_grid, players, dt):
+        """
+        Advances the LOD clock and returns (enemies to update this tick, far enemies
+        whose timers advance this tick).
+        """
+        self.tick += 1
+        self.time += dt
+        self.max_update_dt = dt * self.mid_interval
+        near_sq = self.near_distance * self.near_distance
+        mid_sq = self.mid_distance * self.mid_distance
+
+        # Closest-player distance tier for every enemy within mid distance of someone
+        near = set(); mid = set()
+        for player in players:
+            if player is None: continue
+            px, py = player.x, player.y
+            for enemy in enemy_grid.query_cells(px - self.mid_distance, py - self.mid_distance,
+                                                px + self.mid_distance, py + self.mid_distance):
+                dist_sq = (enemy.x - px) ** 2 + (enemy.y - py) ** 2
+                if dist_sq <= near_sq: near.add(enemy)
+                elif dist_sq <= mid_sq: mid.add(enemy)
+        mid -= near
+        mid |= self.busy - near
+
+        bucket = self.tick % self.mid_interval
+        to_update = list(near)
+        mid_updated = 0
+        for enemy in mid:
+            if enemy.id % self.mid_interval == bucket:
+                to_update.append(enemy); mid_updated += 1
+
+        # Far enemies: this tick's slice of the list, minus anyone in a closer tier
+        far_slice = enemies[self.tick % self.far_interval::self.far_interval]
+        timers_only = [enemy for enemy in far_slice if enemy not in near and enemy not in mid]
+
+        self.counts = {
+            'lod_near': len(near),
+            'lod_mid': len(mid),
+            'lod_far': len(enemies) - len(near) - len(mid),
+            'lod_mid_updated': mid_updated,
+            'lod_far_ticked': len(timers_only),
+        }
+        return to_update, timers_only
+
+    def elapsed(self, enemy, dt):
+        """Time since the enemy was last updated or had its timers advanced; restarts its clock."""
+        last = enemy.lod_last_time
+        enemy.lod_last_time = self.time
+        return dt if last is None else self.time - last
+
+    def update_dt(self, enemy, dt):
+        """dt for a full update; time beyond max_update_dt is applied to the timers only."""
+        elapsed = self.elapsed(enemy, dt)
+        if elapsed > self.max_update_dt:
+            enemy.advance_timers(elapsed - self.max_update_dt)
+            elapsed = self.max_update_dt
+        return elapsed
+
+    def after_update(self, enemy):
+        if enemy.state in LOD_BUSY_STATES: self.busy.add(enemy)
+        else: self.busy.discard(enemy)
+
+    def forget(self, enemy):
+        self.busy.discard(enemy)
@@ -1,10 +1,22 @@
 import random
+import math
 
 import enemies.player as player_module
 from combat_mech import PLAYER_ATTACK_POWER, PLAYER_ATTACK_RANGE
 
 from enemies.enemy_base import Enemy
+from enemies.enemy_soa import EnemySoA
+from enemies.ai_lod import AILevelOfDetail
+from enemies.melee import melee_targets, apply_melee_damage
+from enemies.activation_chunks import EnemyActivationChunks
+from enemies.population import SpawnCells, PopulationDirector, choose_enemy_type
+import enemies.enemy_soa as enemy_soa_module
 from world_struct import *
+from world_structures.spatial_hash import SpatialHash
+from world_structures.line_of_sight import LineOfSightCache
+from world_structures.navigation import FlowFieldManager
+from world_structures.entity_registry import EntityRegistry
+from world_structures.collider_cache import refresh_collider_caches
 
 from NETconfig import is_host
 
@@ -14,7 +26,7 @@ from .stat_constants import *
 
 class CombatManager:
     def __init__(self, world_data, collision_quadtree, is_point_in_polygon_func,
-                 all_enemy_animations, network_players_dict):
+                 all_enemy_animations, network_players_dict, sim_backend=ENEMY_SIM_BACKEND, registry=None):
         """
         Manages combat interactions, enemy spawning, updates, and drawing.
 
@@ -24,11 +36,14 @@ class CombatManager:
             is_point_in_polygon_func: Function to check point-in-polygon containment.
             all_enemy_animations (dict): Nested dictionary mapping enemy type names to their animation data
                                          (e.g., {"Sword_Orc": {"idle": [...], "walk": [...], ... "dims": (w,h)}}).
+            sim_backend (str): 'objects' updates each Enemy in turn, 'soa' runs them all through EnemySoA arrays.
+            registry (EntityRegistry): Id space shared with the instance's players and NPCs (a private one if None).
         """
         self.world_data = world_data
         self.quadtree = collision_quadtree
         self.is_point_in_polygon = is_point_in_polygon_func
-        self.enemies = [] # List to hold active enemy instances
+        # (Server) Live enemies are the registry's dense 'enemy' list; enemy.id is their registry id
+        self.registry = registry if registry is not None else EntityRegistry()
         
         self.client_enemies = {} # <<< NETWORK: Client: Dictionary of Enemy objects {enemy_id: enemy_obj}
         self.network_players = network_players_dict # Reference to the shared player dictionary
@@ -44,161 +59,178 @@ class CombatManager:
         if not self.available_enemy_types:
              print("WARNING: No enemy types defined/mapped in CombatManager!")
 
-        # Reset enemy ID counter at initialization (server side)
-        Enemy._enemy_id_counter = 0
+        # Spatial hashes for moving entities so attacks/targeting only look at nearby cells
+        self.enemy_grid = SpatialHash() # (Server) All live enemies, moved after each update
+        self.player_grid = SpatialHash() # (Server) Players, re-synced from network_players each tick
+        self.max_enemy_radius = 0.0 # Pads center-point queries so large enemies are not missed
+        self.wall_field = None # (Server) WallDistanceField for wall-aware steering; set by the overworld instance
+        self.los_cache = LineOfSightCache() # (Server) Enemy -> player visibility, re-traced every few ticks
+        self.flow_fields = None # (Server) FlowFieldManager for obstacle-aware chasing, created on first update
+        self.max_detection_radius = 0.0 # How far flow fields must reach around a chased player
+        self.nav_grid = None # (Server) Shared NavGrid, set by the overworld instance (otherwise built on demand)
+        self.path_planner = None # (Server) HPA* PathPlanner for returning to spawn, set by the overworld instance
+
+        # (Server) Optional array-backed simulation; the Enemy objects become views it writes back to
+        self.enemy_sim = None
+        if sim_backend == 'soa':
+            if enemy_soa_module.np is not None: self.enemy_sim = EnemySoA()
+            else: print("[SERVER] Warning: numpy not available, using the per-object enemy simulation.")
+
+        # (Server) AI level of detail for the per-object path: far-away enemies update less often
+        self.ai_lod = AILevelOfDetail() if ENEMY_LOD_ENABLED and self.enemy_sim is None else None
+
+        # (Server) Enemies far from every player sleep as compact records in activation chunks
+        self.activation_chunks = EnemyActivationChunks() if ENEMY_DORMANT_CHUNKS_ENABLED else None
+        self.spawn_cells = None # (Server) SpawnCells for this instance, built by the spawn_enemies_in_* call
+        self.population = None # (Server) PopulationDirector topping up enemies around players
+
+        # Per-tick counters from the last update() call (read by the server tick profiler)
+        self.last_update_counts = {}
+
+    @property
+    def enemies(self):
+        """(Server) Packed list of live enemies (owned by the registry; copy it to add/remove while iterating)."""
+        return self.registry.entities('enemy')
+
+    def add_enemy(self, enemy):
+        """(Server Only) Registers an enemy (assigning its id) and adds it to the spatial hash."""
+        enemy.id = self.registry.add(enemy, 'enemy')
+        self.enemy_grid.insert(enemy, enemy.x, enemy.y)
+        if self.enemy_sim is not None: self.enemy_sim.add(enemy)
+        self.max_enemy_radius = max(self.max_enemy_radius, enemy.radius)
+        self.max_detection_radius = max(self.max_detection_radius, enemy.detection_radius)
+        if self.activation_chunks is not None: self.activation_chunks.track(enemy)
+
+    def remove_enemy(self, enemy):
+        """(Server Only) Unregisters an enemy and removes it from the spatial hash (O(1))."""
+        if self.registry.remove(enemy.id) is None: return
+        self._forget_enemy(enemy)
+
+    def remove_enemies(self, enemies):
+        """(Server Only) remove_enemy for many enemies at once."""
+        for enemy in enemies: self.remove_enemy(enemy)
+
+    def _forget_enemy(self, enemy):
+        self.enemy_grid.remove(enemy)
+        if self.enemy_sim is not None: self.enemy_sim.remove(enemy)
+        if self.ai_lod is not None: self.ai_lod.forget(enemy)
+        if self.activation_chunks is not None: self.activation_chunks.forget(enemy)
+        if self.population is not None: self.population.forget(enemy)
+
+    def create_enemy(self, enemy_type_name, x, y):
+        """Instantiates an enemy of the given type at (x, y); None if the type or its animations are missing."""
+        EnemyClass = self.enemy_classes.get(enemy_type_name)
+        animations = self.enemy_animations.get(enemy_type_name)
+        if not EnemyClass or not animations:
+            print(f"[SERVER] Warning: Could not find class or animations for {enemy_type_name}.")
+            return None
+        try:
+            return EnemyClass(x, y,
+                              animations['idle'], animations['walk'],
+                              animations['attack'], animations['hurt'],
+                              animations['death'], animations['dims'])
+        except KeyError as e:
+            print(f"[SERVER] ERROR: Missing animation key '{e}' for {enemy_type_name}.")
+        except Exception as e:
+            print(f"[SERVER] ERROR: Failed to instantiate {enemy_type_name}: {e}")
+        return None
+
+    def spawn_enemy(self, enemy_type_name, x, y):
+        """(Server Only) Adds an enemy: as a dormant record when activation chunks are on, otherwise live."""
+        if self.activation_chunks is not None:
+            if enemy_type_name not in self.enemy_classes: return False
+            self.activation_chunks.add_record(enemy_type_name, x, y)
+            return True
+        new_enemy = self.create_enemy(enemy_type_name, x, y)
+        if new_enemy is None: return False
+        self.add_enemy(new_enemy)
+        return True
+
+    def update_activation(self, network_players_dict, dt):
+        """(Server Only) Wakes dormant enemies near players and puts idle enemies in long-empty chunks to sleep."""
+        chunks = self.activation_chunks
+        chunks.refile(self.enemies) # Enemies sleep by the chunk they are in now, not their spawn chunk
+        to_wake, to_sleep = chunks.update(network_players_dict.values(), dt)
+        for record in to_wake:
+            enemy = self.create_enemy(record.type_name, record.x, record.y)
+            if enemy is None: continue
+            if record.health is not None: enemy.health = record.health
+            self.add_enemy(enemy)
+        # Dying enemies finish their animation and are removed as usual
+        sleepers = [enemy for enemy in to_sleep if not enemy.is_dead]
+        for enemy in sleepers:
+            if not enemy.spawned_by_director: chunks.put_to_sleep(enemy) # Director enemies are just dropped
+        self.remove_enemies(sleepers)
+        return {'chunks_awake': len(chunks.awake), 'enemies_dormant': chunks.dormant_count,
+                'enemies_woken': len(to_wake), 'enemies_slept': len(sleepers)}
 
     def spawn_enemies_in_overworld(self, count):
         """(Server Only) Spawns enemies in the overworld."""
         print(f"[SERVER] Spawning {count} enemies in Overworld...")
         if not self.available_enemy_types: return
-
-        spawned_count = 0
-        attempts = 0
-        max_attempts = count * 20
-        forest_poly = self.world_data.get("forest_poly_points")
-        kingdom_poly = self.world_data.get("kingdom_poly_points")
         world_w = self.world_data.get("WORLD_WIDTH", 20000)
         world_h = self.world_data.get("WORLD_HEIGHT", 20000)
-
-        while spawned_count < count and attempts < max_attempts:
-            attempts += 1
-            spawn_x = random.randint(0, world_w)
-            spawn_y = random.randint(0, world_h)
-            spawn_point = (spawn_x, spawn_y)
-
-            # Check validity (e.g., outside kingdom)
-            in_kingdom = kingdom_poly and self.is_point_in_polygon(spawn_point, kingdom_poly)
-            if not in_kingdom:
-                enemy_type_name = random.choice(self.available_enemy_types)
-                EnemyClass = self.enemy_classes.get(enemy_type_name)
-                animations = self.enemy_animations.get(enemy_type_name)
-
-                if EnemyClass and animations:
-                    try:
-                        new_enemy = EnemyClass(spawn_x, spawn_y,
-                                               animations['idle'], animations['walk'],
-                                               animations['attack'], animations['hurt'],
-                                               animations['death'], animations['dims'])
-                        self.enemies.append(new_enemy) # Add to server list
-                        spawned_count += 1
-                    except KeyError as e:
-                        print(f"[SERVER] ERROR: Missing animation key '{e}' for {enemy_type_name}.")
-                    except Exception as e:
-                         print(f"[SERVER] ERROR: Failed to instantiate {enemy_type_name}: {e}")
-                else:
-                    print(f"[SERVER] Warning: Could not find class or animations for {enemy_type_name}.")
-
-        print(f"[SERVER] Successfully spawned {spawned_count} enemies in Overworld.")
-
+        # Valid spawn cells (outside the kingdom zone, not blocked), tagged plains/forest for the spawn tables
+        self.spawn_cells = SpawnCells.from_overworld(self.world_data, self.quadtree, world_w, world_h)
+        self._spawn_initial(count, "Overworld")
 
     def spawn_enemies_in_dungeon(self, count):
         """(Server Only) Spawns enemies in the dungeon."""
         print(f"[SERVER] Spawning {count} enemies in Dungeon...")
         if not self.available_enemy_types: return
-
-        spawned_count = 0
-        attempts = 0
-        max_attempts = count * 20
-        dungeon_rooms = self.world_data.get("dungeon_rooms_grid", [])
-        dungeon_grid = self.world_data.get("dungeon_grid")
-        TILE_FLOOR = TILE_FLOOR # Get from world_struct
-        DUNGEON_TILE_SIZE = DUNGEON_TILE_SIZE
-
-        if not dungeon_rooms or not dungeon_grid:
+        if not self.world_data.get("dungeon_rooms_grid") or not self.world_data.get("dungeon_grid"):
             print("[SERVER] Warning: Cannot spawn dungeon enemies, grid/rooms missing.")
             return
+        # Floor tiles inside rooms
+        self.spawn_cells = SpawnCells.from_dungeon(self.world_data)
+        self._spawn_initial(count, "Dungeon")
 
-        while spawned_count < count and attempts < max_attempts:
-             attempts += 1
-             try:
-                 room = random.choice(dungeon_rooms)
-                 grid_x = random.randint(room.left, room.right - 1)
-                 grid_y = random.randint(room.top, room.bottom - 1)
-
-                 if 0 <= grid_y < len(dungeon_grid) and 0 <= grid_x < len(dungeon_grid[0]) and dungeon_grid[grid_y][grid_x] == TILE_FLOOR:
-                     spawn_x = grid_x * DUNGEON_TILE_SIZE + DUNGEON_TILE_SIZE // 2
-                     spawn_y = grid_y * DUNGEON_TILE_SIZE + DUNGEON_TILE_SIZE // 2
-
-                     enemy_type_name = random.choice(self.available_enemy_types)
-                     EnemyClass = self.enemy_classes.get(enemy_type_name)
-                     animations = self.enemy_animations.get(enemy_type_name)
-
-                     if EnemyClass and animations:
-                         try:
-                             new_enemy = EnemyClass(spawn_x, spawn_y,
-                                                  animations['idle'], animations['walk'],
-                                                  animations['attack'], animations['hurt'],
-                                                  animations['death'], animations['dims'])
-                             self.enemies.append(new_enemy) # Add to server list
-                             spawned_count += 1
-                         except KeyError as e:
-                              print(f"[SERVER] ERROR: Missing animation key '{e}' for {enemy_type_name}.")
-                         except Exception as e:
-                             print(f"[SERVER] ERROR: Failed to instantiate {enemy_type_name}: {e}")
-                     else:
-                        print(f"[SERVER] Warning: Could not find class/animations for {enemy_type_name}.")
-
-             except IndexError: continue
-             except ValueError: continue
-
-        print(f"[SERVER] Successfully spawned {spawned_count} enemies in Dungeon.")
+    def _spawn_initial(self, count, where):
+        """Spreads `count` enemies over self.spawn_cells, then starts the population director on them."""
+        spawned_count = 0
+        for spawn_x, spawn_y, zone in self.spawn_cells.sample(count):
+            enemy_type_name = choose_enemy_type(zone, self.enemy_classes)
+            if enemy_type_name and self.spawn_enemy(enemy_type_name, spawn_x, spawn_y):
+                spawned_count += 1
+        if ENEMY_DIRECTOR_ENABLED: self.population = PopulationDirector(self.spawn_cells)
+        asleep = " (asleep until a player comes near)" if self.activation_chunks is not None else ""
+        print(f"[SERVER] Successfully spawned {spawned_count} enemies in {where}{asleep} "
+              f"({len(self.spawn_cells.valid_cells)} valid spawn cells).")
 
     # <<< NETWORK: handle_player_attack takes the specific player object >>>
     def handle_player_attack(self, player):
-        """(Server Only) Processes an attack action from a specific player."""
+        """(Server Only) Processes an attack action from a specific player.
+           Returns the swing's hit events (hits and dodges on enemies and other players, see apply_melee_damage)."""
+        events = []
         if player.is_dead or not player.is_attacking:
-            return
+            return events
 
         # Calculate attack hitbox based on player's facing direction
-        attack_center_offset = player.last_direction * (PLAYER_ATTACK_RANGE / 2)
-        attack_center_x = player.x + attack_center_offset.x
-        attack_center_y = player.y + attack_center_offset.y
+        attack_center_x = player.x + player.last_direction.x * (PLAYER_ATTACK_RANGE / 2)
+        attack_center_y = player.y + player.last_direction.y * (PLAYER_ATTACK_RANGE / 2)
         # Use a squared range for efficient distance checking
         attack_range_sq = (PLAYER_ATTACK_RANGE * 0.8)**2 # Adjust hitbox size as needed
 
-        enemies_hit_count = 0
-        for enemy in self.enemies:
-            if enemy.is_dead: continue
-
-            # Check distance from attack center to enemy center
-            dist_sq = (enemy.x - attack_center_x)**2 + (enemy.y - attack_center_y)**2
-            # Add enemy radius to check for overlap
-            if dist_sq < attack_range_sq + (enemy.radius**2):
-                # Check Enemy Agility (Dodge)
-                if random.random() < enemy.agility:
-                    # print(f"{enemy.name} ({enemy.id}) dodged Player {player.player_id} attack!")
-                    continue # Enemy dodged
-
-                # Apply damage (take_damage handles defense)
-                damage_dealt = enemy.take_damage(PLAYER_ATTACK_POWER)
-                if damage_dealt > 0:
-                     enemies_hit_count += 1
-                # Optional: Add knockback effect here
-        
+        # --- 1. Enemies: broadphase query, then one overlap/dodge pass and one damage batch ---
+        # Only enemies whose center could satisfy the overlap test are considered
+        enemy_query_radius = math.sqrt(attack_range_sq + self.max_enemy_radius**2)
+        candidates = [enemy for enemy in self.enemy_grid.query_radius(attack_center_x, attack_center_y, enemy_query_radius)
+                      if not enemy.is_dead]
+        hit, dodged = melee_targets(candidates, attack_center_x, attack_center_y, attack_range_sq)
+        damaged = apply_melee_damage(player.player_id, 'enemy', hit, dodged, PLAYER_ATTACK_POWER, 'id', events)
+        if self.enemy_sim is not None:
+            for enemy in damaged: self.enemy_sim.pull(enemy) # Hurt/death state back into the arrays
+
         # --- 2. Check for hits against OTHER PLAYERS (PvP) ---
-        players_hit_count = 0
-        # Iterate through all players known to the server (including the attacker)
-        for target_player_id, target_player in self.network_players.items():
-            # Skip the attacking player and dead players
-            if target_player_id == player.player_id or target_player.is_dead:
-                continue
-
-            # Check distance from attack center to the target player's center
-            dist_sq = (target_player.x - attack_center_x)**2 + (target_player.y - attack_center_y)**2
-            # Add target player radius for overlap check
-            if dist_sq < attack_range_sq + (target_player.radius**2):
-                # Check Target Player Agility (Dodge)
-                if random.random() < target_player.agility:
-                    print(f"Player {target_player_id} dodged Player {player.player_id}'s attack!")
-                    continue # Target player dodged
-
-                # Apply damage to the target player
-                print(f"PVP HIT! Player {player.player_id} hits Player {target_player_id}") # Debug
-                damage_dealt = target_player.take_damage(PLAYER_ATTACK_POWER)
-                if damage_dealt > 0:
-                    players_hit_count += 1
-
-        # print(f"Player {player.player_id} attack hit {enemies_hit_count} enemies.") # Debug
+        # Players near the attack center (the attacker itself is skipped)
+        self.player_grid.sync(self.network_players.values())
+        player_query_radius = math.sqrt(attack_range_sq + PLAYER_RADIUS**2)
+        candidates = [target for target in self.player_grid.query_radius(attack_center_x, attack_center_y, player_query_radius)
+                      if target.player_id != player.player_id and not target.is_dead]
+        hit, dodged = melee_targets(candidates, attack_center_x, attack_center_y, attack_range_sq)
+        apply_melee_damage(player.player_id, 'player', hit, dodged, PLAYER_ATTACK_POWER, 'player_id', events)
+
+        return events
 
 
     # <<< NETWORK: handle_enemy_attack takes the specific player object being attacked >>>
@@ -227,19 +259,56 @@ class CombatManager:
 
     def update(self, network_players_dict, dt, collision_quadtree, game_state):
         """(Server Only) Updates all enemies."""
+        self.last_update_counts = {'enemies_updated': 0, 'collider_queries': 0, 'los_traces': 0}
+        if self.activation_chunks is not None:
+            self.last_update_counts.update(self.update_activation(network_players_dict, dt))
         if not network_players_dict: return # Don't update if no players
+        if self.population is not None:
+            self.last_update_counts.update(self.population.update(self, network_players_dict.values(), dt))
+        self.los_cache.advance()
+        los_cache = self.los_cache if collision_quadtree else None
+        # Chasers share one flow field per player; the nav grid is built from the collision index once
+        if collision_quadtree and (self.flow_fields is None or self.flow_fields.index is not collision_quadtree):
+            bounds = collision_quadtree.boundary
+            self.flow_fields = FlowFieldManager(collision_quadtree, bounds.right, bounds.bottom, nav=self.nav_grid)
+        flow_fields = self.flow_fields if collision_quadtree else None
+        if flow_fields is not None:
+            flow_fields.reach = self.max_detection_radius
+            flow_fields.advance()
+
+        # Players moved this tick; bring their cells up to date once for all enemies
+        self.player_grid.sync(network_players_dict.values())
+
+        if self.enemy_sim is not None:
+            self._update_soa(network_players_dict, dt, collision_quadtree, los_cache, flow_fields)
+            return
 
         enemies_to_remove = []
-        for enemy in self.enemies:
-            # Get nearby colliders for this enemy
-            potential_colliders = []
-            if collision_quadtree:
-                 query_range = enemy.rect.inflate(enemy.speed * 2 + 32, enemy.speed * 2 + 32)
-                 potential_colliders = collision_quadtree.query(query_range)
+        ai_lod = self.ai_lod
+        if ai_lod is not None:
+            # Near enemies every tick, mid ones in staggered buckets, far ones only advance their timers
+            enemies_to_update, timers_only = ai_lod.plan(self.enemies, self.enemy_grid, network_players_dict.values(), dt)
+            for enemy in timers_only:
+                enemy.advance_timers(ai_lod.elapsed(enemy, dt))
+        else:
+            enemies_to_update = self.enemies
+
+        # Collider broadphase for the enemies being updated (refreshed in one batch where needed)
+        collider_queries = self.refresh_collider_caches(enemies_to_update, collision_quadtree) if collision_quadtree else 0
+
+        for enemy in enemies_to_update:
+            # Get nearby colliders for this enemy (from its cache, refreshed above if needed)
+            potential_colliders = enemy.collider_cache.colliders if collision_quadtree else []
+            wall_segments = enemy.collider_cache.segments if collision_quadtree else ()
 
             # Enemy update logic (targeting, movement, animation)
-            # Pass the dictionary of players to the enemy's update method
-            reached_hit_frame = enemy.update(network_players_dict, dt, potential_colliders, game_state, collision_quadtree, self.is_point_in_polygon)
+            # Only players inside the enemy's detection radius are passed in
+            nearby_players = self.player_grid.query_radius(enemy.x, enemy.y, enemy.detection_radius)
+            enemy_dt = ai_lod.update_dt(enemy, dt) if ai_lod is not None else dt # Includes any ticks it skipped
+            reached_hit_frame = enemy.update(nearby_players, enemy_dt, potential_colliders, game_state, collision_quadtree, self.is_point_in_polygon, wall_segments, self.wall_field,
+                                             los_cache, flow_fields, self.path_planner)
+            self.enemy_grid.move(enemy, enemy.x, enemy.y)
+            if ai_lod is not None: ai_lod.after_update(enemy)
 
             # If the update indicated the attack hit frame was reached, process the attack
             if reached_hit_frame and enemy.target_player:
@@ -250,14 +319,44 @@ class CombatManager:
             if enemy.is_dead and enemy.animation_finished:
                 enemies_to_remove.append(enemy)
 
+        self.last_update_counts['enemies_updated'] = len(enemies_to_update)
+        if ai_lod is not None: self.last_update_counts.update(ai_lod.counts)
+        self.last_update_counts['collider_queries'] = collider_queries
+        self.last_update_counts['los_traces'] = self.los_cache.traces
+        self.last_update_counts['flow_fields_built'] = flow_fields.fields_built if flow_fields is not None else 0
+
         # Remove dead enemies from the main list
         if enemies_to_remove:
              # print(f"[SERVER] Removing {len(enemies_to_remove)} defeated enemies.")
-             for enemy in enemies_to_remove:
-                 self.enemies.remove(enemy)
+             self.remove_enemies(enemies_to_remove)
              # Optional: Send message to clients about enemy removal? State update handles disappearance.
 
 
+    def refresh_collider_caches(self, enemies, collision_index):
+        """Batched collider-cache refresh for these enemies (see collider_cache.refresh_collider_caches). Returns the query count."""
+        return refresh_collider_caches(enemies, collision_index)
+
+    def _update_soa(self, network_players_dict, dt, collision_quadtree, los_cache, flow_fields):
+        """(Server Only) update() through EnemySoA: whole-array passes, then per-object work for the few that need it."""
+        sim = self.enemy_sim
+        collider_queries = [0]
+        def refresh_colliders(movers):
+            collider_queries[0] += self.refresh_collider_caches(movers, collision_quadtree)
+        hits, finished_dead = sim.step(list(network_players_dict.values()), dt, collision_quadtree, los_cache, flow_fields,
+                                       self.path_planner, self.wall_field, refresh_colliders if collision_quadtree else None)
+        # Only enemies that moved change spatial hash cells
+        for enemy in sim.moved_views:
+            self.enemy_grid.move(enemy, enemy.x, enemy.y)
+        for enemy in hits:
+            self.handle_enemy_attack(enemy, enemy.target_player)
+
+        self.last_update_counts['enemies_updated'] = len(self.enemies)
+        self.last_update_counts['enemies_moved'] = sim.movers
+        self.last_update_counts['collider_queries'] = collider_queries[0]
+        self.last_update_counts['los_traces'] = self.los_cache.traces
+        self.last_update_counts['flow_fields_built'] = flow_fields.fields_built if flow_fields is not None else 0
+        self.remove_enemies(finished_dead)
+
     def draw(self, surface, camera_apply_point_func):
         """(Client & Host) Draws enemies based on received state or local state."""
         # Determine which list of enemies to draw from
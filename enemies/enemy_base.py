@@ -1,83 +1,175 @@
 import pygame
 import random
 import math
+from operator import attrgetter
 # Import constants using a clear alias or specific names
 from .stat_constants import *
-
-class Enemy:
-    # <<< NETWORK: Added unique ID >>>
-    _enemy_id_counter = 0
-    def __init__(self, x, y, health, speed, attack_power, attack_range, attack_cooldown, detection_radius,
+from world_structures.collider_cache import ColliderCache
+from world_structures.kinematics import move_body, clamp_body
+from world_structures.world_constants import HPA_MIN_PATH_DISTANCE
+from world_structures.animation import ANIMATION_CLOCK, Animated, frame_counts, frame_reached
+from world_structures.sprite_bank import AnimationBank, flash_phase
+
+# --- Per-Type Data ---
+class EnemyArchetype:
+    """
+    Everything enemies of one type share: animation frames, base stats and attack timing.
+    One instance per type and frame set (see shared()); each Enemy only holds its own state.
+    """
+    __slots__ = ('name', 'base_health', 'speed', 'attack_power', 'attack_range', 'stopping_range', 'stopping_range_sq',
+                 'attack_trigger_range_sq', 'attack_cooldown_duration', 'detection_radius', 'detection_radius_sq',
+                 'defense', 'agility', 'wander_radius', 'chase_timeout', 'invulnerability_duration', 'radius',
+                 'frame_width', 'frame_height', 'idle_animation_frames', 'walk_animation_frames',
+                 'attack_animation_frames', 'hurt_animation_frames', 'death_animation_frames', 'frame_counts',
+                 'attack_hit_frame_index', 'bank')
+    _shared = {} # {(name, frame list ids, frame_dims): EnemyArchetype}
+
+    def __init__(self, name, health, speed, attack_power, attack_range, attack_cooldown, detection_radius,
                  defense, agility, idle_frames, walk_frames, attack_frames, hurt_frames, death_frames,
-                 frame_dims, name="Enemy", attack_hit_frame_index=None):
-
-        self.id = Enemy._enemy_id_counter
-        Enemy._enemy_id_counter += 1
-        self.enemy_type = name # Store the type name (e.g., "Sword_Orc")
-
-        self.x = float(x); self.y = float(y); self.spawn_x = float(x); self.spawn_y = float(y)
-        self.health = health; self.max_health = health
+                 frame_dims, attack_hit_frame_index=None):
+        self.name = name # Type name (e.g., "Sword_Orc")
+        self.base_health = health
         self.speed = speed; self.attack_power = attack_power; self.attack_range = attack_range
         # Use constants for range buffer
         self.stopping_range = max(5, attack_range - SWORD_ORC_ATTACK_RANGE_BUFFER) # Example: use SWORD_ORC buffer, or make generic ENEMY_ATTACK_RANGE_BUFFER
         self.stopping_range_sq = self.stopping_range * self.stopping_range
         self.attack_trigger_range_sq = attack_range * attack_range
-        self.attack_cooldown_timer = 0.0; self.attack_cooldown_duration = attack_cooldown
+        self.attack_cooldown_duration = attack_cooldown
+        self.detection_radius = detection_radius
         self.detection_radius_sq = detection_radius * detection_radius
 
         # Use generic enemy caps
         self.defense = max(0.0, min(defense, ENEMY_MAX_DEFENSE))
         self.agility = max(0.0, min(agility, ENEMY_MAX_AGILITY))
+        self.wander_radius = SWORD_ORC_WANDER_RADIUS
+        self.chase_timeout = SWORD_ORC_CHASE_TIMEOUT
+        self.invulnerability_duration = ENEMY_INVULNERABILITY_DURATION
+
+        # --- Animation Frames ---
+        self.radius = frame_dims[0] / 4 if frame_dims else 10
+        self.idle_animation_frames = idle_frames
+        self.walk_animation_frames = walk_frames
+        self.attack_animation_frames = attack_frames
+        self.hurt_animation_frames = hurt_frames
+        self.death_animation_frames = death_frames
+        self.frame_width, self.frame_height = frame_dims if frame_dims else (self.radius*2, self.radius*2)
+        self.frame_counts = frame_counts({'idle': idle_frames, 'walk': walk_frames, 'attack': attack_frames,
+                                          'hurt': hurt_frames, 'death': death_frames})
+        self.bank = None # AnimationBank, fetched on first draw (the server never draws)
+
+        # --- Attack Timing ---
+        num_attack_frames = len(self.attack_animation_frames) if self.attack_animation_frames else 0
+        if attack_hit_frame_index is None and num_attack_frames > 1:
+            # Default hit frame (e.g., 60% through animation)
+            self.attack_hit_frame_index = max(0, min(int(num_attack_frames * 0.6), num_attack_frames - 1))
+        elif attack_hit_frame_index is not None:
+            # Use provided index, ensuring it's valid
+            self.attack_hit_frame_index = max(0, min(attack_hit_frame_index, num_attack_frames - 1)) if num_attack_frames > 0 else -1
+        else: # No frames or index provided
+            self.attack_hit_frame_index = -1
+
+    @classmethod
+    def shared(cls, name, *stats, idle_frames, walk_frames, attack_frames, hurt_frames, death_frames, frame_dims,
+               attack_hit_frame_index=None):
+        """The archetype for this type and frame set, built on first use (stats are fixed per type name)."""
+        frames = (idle_frames, walk_frames, attack_frames, hurt_frames, death_frames)
+        key = (name, tuple(map(id, frames)), tuple(frame_dims) if frame_dims else None)
+        archetype = cls._shared.get(key)
+        if archetype is None: # The archetype keeps the frame lists alive, so their ids stay unique
+            archetype = cls._shared[key] = cls(name, *stats, *frames, frame_dims, attack_hit_frame_index)
+        return archetype
+
+    def animation_bank(self):
+        """Flipped/flash frame variants for this type (prebuilt by run_loading_screen)."""
+        if self.bank is None:
+            self.bank = AnimationBank.of({'idle': self.idle_animation_frames, 'walk': self.walk_animation_frames,
+                                          'attack': self.attack_animation_frames, 'hurt': self.hurt_animation_frames,
+                                          'death': self.death_animation_frames})
+        return self.bank
+
+
+class Enemy(Animated):
+    # Only per-enemy state lives on the instance; per-type data is on self.archetype.
+    # Animation is just (current_animation_type, anim_start_ms); frames are derived from ANIMATION_CLOCK
+    __slots__ = ('id', 'archetype', 'x', 'y', 'spawn_x', 'spawn_y', 'health', 'max_health', 'attack_cooldown_timer',
+                 'state', 'target_player', 'target_position', 'wander_timer', 'chase_timer', 'return_path',
+                 'lod_last_time', 'spawned_by_director', 'rect', 'last_direction', 'facing_right', 'collider_cache',
+                 'said_greeting', 'current_animation_type', 'anim_start_ms', 'is_dead', 'is_attacking', 'is_invulnerable', 'invulnerability_timer',
+                 'dialogue_text', 'dialogue_timer', 'attack_hit_triggered_this_cycle')
+
+    def __init__(self, x, y, health, speed, attack_power, attack_range, attack_cooldown, detection_radius,
+                 defense, agility, idle_frames, walk_frames, attack_frames, hurt_frames, death_frames,
+                 frame_dims, name="Enemy", attack_hit_frame_index=None):
+
+        # <<< NETWORK: Unique ID >>> Assigned by the server's EntityRegistry (CombatManager.add_enemy); clients copy the server's
+        self.id = None
+        self.archetype = EnemyArchetype.shared(
+            name, health, speed, attack_power, attack_range, attack_cooldown, detection_radius, defense, agility,
+            idle_frames=idle_frames, walk_frames=walk_frames, attack_frames=attack_frames, hurt_frames=hurt_frames,
+            death_frames=death_frames, frame_dims=frame_dims, attack_hit_frame_index=attack_hit_frame_index)
+
+        self.x = float(x); self.y = float(y); self.spawn_x = float(x); self.spawn_y = float(y)
+        self.health = health; self.max_health = health
+        self.attack_cooldown_timer = 0.0
 
         self.state = 'idle' # idle, walking, chasing, returning, attacking, hurt, dead
         self.target_player = None # <<< NETWORK: Store the player object being targeted >>>
         self.target_position = None
         self.wander_timer = random.uniform(SWORD_ORC_WANDER_TIME_MIN, SWORD_ORC_WANDER_TIME_MAX)
         self.chase_timer = 0.0
-        self.wander_radius = SWORD_ORC_WANDER_RADIUS
-        self.chase_timeout = SWORD_ORC_CHASE_TIMEOUT
+        self.return_path = None # (Server) PathRequest home while 'returning' a long way
+        self.lod_last_time = None # (Server) AI LOD clock time of the last update/timer advance
+        self.spawned_by_director = False # (Server) Ambient enemy the PopulationDirector may despawn
 
         # Rect and facing
-        self.radius = frame_dims[0] / 4 if frame_dims else 10
-        self.rect = pygame.Rect(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
+        radius = self.archetype.radius
+        self.rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
         self.last_direction = pygame.math.Vector2(1, 0)
         self.facing_right = True
-        self.name = name
+        self.collider_cache = ColliderCache() # (Server) Static colliders around the enemy, re-queried only when it moves away
         self.said_greeting = False # Specific dialogue trigger flag
 
         # --- Animation State ---
-        self.idle_animation_frames = idle_frames
-        self.walk_animation_frames = walk_frames
-        self.attack_animation_frames = attack_frames
-        self.hurt_animation_frames = hurt_frames
-        self.death_animation_frames = death_frames
-        self.frame_width, self.frame_height = frame_dims if frame_dims else (self.radius*2, self.radius*2)
-        self.current_frame_index = 0
-        self.last_animation_update = pygame.time.get_ticks()
-        self.current_animation_type = 'idle' # idle, walk, attack, hurt, death
-        self.animation_finished = True
+        self.start_animation('idle') # idle, walk, attack, hurt, death
         self.is_dead = False
         self.is_attacking = False
         self.is_invulnerable = False
         self.invulnerability_timer = 0.0
-        self.invulnerability_duration = ENEMY_INVULNERABILITY_DURATION
 
         # --- Dialogue Attributes ---
         self.dialogue_text = None
         self.dialogue_timer = 0.0
 
         # --- Attack Timing Attributes ---
-        num_attack_frames = len(self.attack_animation_frames) if self.attack_animation_frames else 0
-        if attack_hit_frame_index is None and num_attack_frames > 1:
-            # Default hit frame (e.g., 60% through animation)
-            self.attack_hit_frame_index = max(0, min(int(num_attack_frames * 0.6), num_attack_frames - 1))
-        elif attack_hit_frame_index is not None:
-            # Use provided index, ensuring it's valid
-            self.attack_hit_frame_index = max(0, min(attack_hit_frame_index, num_attack_frames - 1)) if num_attack_frames > 0 else -1
-        else: # No frames or index provided
-            self.attack_hit_frame_index = -1
         self.attack_hit_triggered_this_cycle = False
 
+    # Per-type data reads through to the archetype (read-only; hot loops read self.archetype directly)
+    enemy_type = property(attrgetter('archetype.name'))
+    name = property(attrgetter('archetype.name'))
+    speed = property(attrgetter('archetype.speed'))
+    attack_power = property(attrgetter('archetype.attack_power'))
+    attack_range = property(attrgetter('archetype.attack_range'))
+    stopping_range = property(attrgetter('archetype.stopping_range'))
+    stopping_range_sq = property(attrgetter('archetype.stopping_range_sq'))
+    attack_trigger_range_sq = property(attrgetter('archetype.attack_trigger_range_sq'))
+    attack_cooldown_duration = property(attrgetter('archetype.attack_cooldown_duration'))
+    detection_radius = property(attrgetter('archetype.detection_radius'))
+    detection_radius_sq = property(attrgetter('archetype.detection_radius_sq'))
+    defense = property(attrgetter('archetype.defense'))
+    agility = property(attrgetter('archetype.agility'))
+    wander_radius = property(attrgetter('archetype.wander_radius'))
+    chase_timeout = property(attrgetter('archetype.chase_timeout'))
+    invulnerability_duration = property(attrgetter('archetype.invulnerability_duration'))
+    radius = property(attrgetter('archetype.radius'))
+    frame_width = property(attrgetter('archetype.frame_width'))
+    frame_height = property(attrgetter('archetype.frame_height'))
+    idle_animation_frames = property(attrgetter('archetype.idle_animation_frames'))
+    walk_animation_frames = property(attrgetter('archetype.walk_animation_frames'))
+    attack_animation_frames = property(attrgetter('archetype.attack_animation_frames'))
+    hurt_animation_frames = property(attrgetter('archetype.hurt_animation_frames'))
+    death_animation_frames = property(attrgetter('archetype.death_animation_frames'))
+    attack_hit_frame_index = property(attrgetter('archetype.attack_hit_frame_index'))
+
 
     def set_dialogue(self, text, duration=DIALOGUE_DEFAULT_DURATION):
         """Sets the dialogue text and starts the timer."""
@@ -88,13 +180,8 @@ class Enemy:
             # Fallback to print if font failed
             print(f"{self.name} ({self.id}) says: {text} (Dialogue font failed)")
 
-    # <<< NETWORK: Update now takes dictionary of players >>>
-    def update(self, network_players, dt, colliders_nearby, game_state, quadtree, is_point_in_polygon):
-        """ Server-side authoritative update logic for the enemy. """
-        current_time_ms = pygame.time.get_ticks()
-        previous_state_for_dialogue = self.state
-
-        # --- Timers ---
+    def advance_timers(self, dt):
+        """ Cooldown, wander, invulnerability and dialogue timers (all AI LOD 'far' enemies get). """
         self.attack_cooldown_timer = max(0.0, self.attack_cooldown_timer - dt)
         self.wander_timer = max(0.0, self.wander_timer - dt)
         if self.is_invulnerable:
@@ -106,6 +193,16 @@ class Enemy:
             if self.dialogue_timer <= 0:
                 self.dialogue_text = None
 
+    # <<< NETWORK: Update takes the players near this enemy (from CombatManager.player_grid) >>>
+    def update(self, nearby_players, dt, colliders_nearby, game_state, quadtree, is_point_in_polygon, wall_segments=(), wall_field=None,
+               los_cache=None, flow_fields=None, path_planner=None):
+        """ Server-side authoritative update logic for the enemy. """
+        arch = self.archetype
+        previous_state_for_dialogue = self.state
+
+        # --- Timers ---
+        self.advance_timers(dt)
+
         # --- State Logic (Determine the INTENDED action/state) ---
         if self.is_dead:
             self.state = 'dead'
@@ -113,16 +210,17 @@ class Enemy:
         if self.state != 'dead' and not (self.state == 'hurt' and not self.animation_finished):
             # --- Find Closest Visible Player ---
             closest_player = None
-            min_dist_sq = self.detection_radius_sq # Start with max detection range
+            min_dist_sq = arch.detection_radius_sq # Start with max detection range
 
-            # Iterate through the dictionary of player objects
-            for p_id, player in network_players.items():
+            # Iterate through the nearby player objects
+            for player in nearby_players:
                 if player and not player.is_dead: # Check if player object exists and is alive
                     dist_sq = (player.x - self.x)**2 + (player.y - self.y)**2
                     if dist_sq < min_dist_sq:
-                        # Basic line of sight check (optional, can be complex)
-                        # For now, assume if within radius, can be seen
-                        # if is_visible(self.x, self.y, player.x, player.y, colliders_nearby):
+                        # Line of sight: walls, trees and buildings hide players (cached per pair for a few ticks)
+                        if los_cache is not None and \
+                           not los_cache.is_visible(quadtree, (self.id, player.player_id), self.x, self.y, player.x, player.y):
+                            continue
                         min_dist_sq = dist_sq
                         closest_player = player
 
@@ -133,23 +231,23 @@ class Enemy:
                 self.chase_timer = SWORD_ORC_CHASE_TIMEOUT # Reset chase timer while seeing a player
 
                 # Use attack_trigger_range_sq for ATTACK DECISION
-                if min_dist_sq < self.attack_trigger_range_sq and self.attack_cooldown_timer <= 0:
+                if min_dist_sq < arch.attack_trigger_range_sq and self.attack_cooldown_timer <= 0:
                     if self.state != 'hurt': # Don't attack if recovering from hit
                         self.state = 'attacking'
                         self.target_position = None # Stop pathfinding when attacking
                 elif self.state not in ['attacking', 'hurt']: # If not attacking or hurt
                      # Use stopping_range_sq to decide if needing to move closer
-                     if min_dist_sq > self.stopping_range_sq:
+                     if min_dist_sq > arch.stopping_range_sq:
                           self.state = 'chasing'
                           # Target the player's current position
-                          self.target_position = pygame.math.Vector2(self.target_player.x, self.target_player.y)
+                          self.set_target_position(self.target_player.x, self.target_player.y)
                      else:
                           # Within stopping range, but maybe not attack range/cooldown ready
                           # Stop moving, wait for attack opportunity (state remains 'chasing' intention but movement stops)
                           self.state = 'chasing' # Still intends to chase/attack
                           self.target_position = None # Clear pathfinding target
                 # Let attack animation finish even if player moves slightly out of range
-                elif self.state == 'attacking' and min_dist_sq >= self.attack_trigger_range_sq:
+                elif self.state == 'attacking' and min_dist_sq >= arch.attack_trigger_range_sq:
                      pass # Animation state machine handles transition after anim finishes
 
             else: # Player not visible or dead, or no players left
@@ -159,17 +257,25 @@ class Enemy:
                     if self.chase_timer <= 0:
                          # Give up chase, return to spawn
                          self.state = 'returning'
-                         self.target_position = pygame.math.Vector2(self.spawn_x, self.spawn_y)
+                         self.set_target_position(self.spawn_x, self.spawn_y)
+                         # Far from home: ask for an HPA* path (answered within a few ticks)
+                         if path_planner is not None and \
+                            (self.x - self.spawn_x)**2 + (self.y - self.spawn_y)**2 > HPA_MIN_PATH_DISTANCE**2:
+                             self.return_path = path_planner.request(self.x, self.y, self.spawn_x, self.spawn_y)
                     # else: keep chasing last known spot? Or just switch to return? Let's return.
                 elif self.state == 'returning':
                     # Check if close enough to spawn point
                     dist_to_spawn_sq = (self.x - self.spawn_x)**2 + (self.y - self.spawn_y)**2
                     # Use a small threshold to stop jittering at spawn
-                    if dist_to_spawn_sq < (self.speed * dt * 10)**2:
+                    if dist_to_spawn_sq < (arch.speed * dt * 10)**2:
                         self.state = 'idle'
                         self.target_position = None
                     else: # Continue moving towards spawn
-                        self.target_position = pygame.math.Vector2(self.spawn_x, self.spawn_y)
+                        # Follow the path home once the planner has answered (straight line until then)
+                        if self.return_path is not None and self.return_path.status == 'done':
+                            self.set_target_position(*self.return_path.path.next_point(self.x, self.y))
+                        else:
+                            self.set_target_position(self.spawn_x, self.spawn_y)
                 elif self.state == 'wander':
                     if self.target_position is None or self.wander_timer <= 0:
                         # Wander finished or timer expired, go idle
@@ -178,7 +284,7 @@ class Enemy:
                     else:
                         # Check if reached wander target
                         dist_to_target_sq = (self.x - self.target_position.x)**2 + (self.y - self.target_position.y)**2
-                        if dist_to_target_sq < (self.speed * dt * 10)**2: # Close enough
+                        if dist_to_target_sq < (arch.speed * dt * 10)**2: # Close enough
                             self.state = 'idle'
                             self.target_position = None
                             self.wander_timer = random.uniform(SWORD_ORC_WANDER_TIME_MIN, SWORD_ORC_WANDER_TIME_MAX)
@@ -194,54 +300,63 @@ class Enemy:
                         # Clamp target to stay somewhat near spawn area
                         target_x = max(self.spawn_x - max_dist_from_spawn, min(target_x, self.spawn_x + max_dist_from_spawn))
                         target_y = max(self.spawn_y - max_dist_from_spawn, min(target_y, self.spawn_y + max_dist_from_spawn))
-                        self.target_position = pygame.math.Vector2(target_x, target_y)
+                        self.set_target_position(target_x, target_y)
                         self.state = 'wander'
 
 
+        # Drop the path home once no longer returning (reached spawn or spotted a player)
+        if self.return_path is not None and self.state != 'returning':
+            if path_planner is not None: path_planner.cancel(self.return_path)
+            self.return_path = None
+
         # --- Movement Calculation (Based on target_position) ---
-        move_vector = pygame.math.Vector2(0, 0)
+        # Plain floats (unit direction move_x, move_y): no Vector2 temporaries per tick
+        move_x = move_y = 0.0
         should_move = False # Flag if movement should occur
 
         # Determine if movement is needed based on state and target
         if self.state in ['wander', 'returning'] and self.target_position:
-             direction = self.target_position - pygame.math.Vector2(self.x, self.y)
-             dist_to_target_sq = direction.length_squared()
-             if dist_to_target_sq > (self.speed * dt * 10)**2: # Jitter prevention threshold
+             to_x = self.target_position[0] - self.x; to_y = self.target_position[1] - self.y
+             if to_x * to_x + to_y * to_y > (arch.speed * dt * 10)**2: # Jitter prevention threshold
                   should_move = True
         elif self.state == 'chasing' and self.target_player:
              # Check distance to the *current* player position
-             player_pos = pygame.math.Vector2(self.target_player.x, self.target_player.y)
-             direction = player_pos - pygame.math.Vector2(self.x, self.y)
-             dist_to_target_sq = direction.length_squared()
+             to_x = self.target_player.x - self.x; to_y = self.target_player.y - self.y
+             dist_to_target_sq = to_x * to_x + to_y * to_y
              # Move only if further than stopping range
-             if dist_to_target_sq > self.stopping_range_sq:
+             if dist_to_target_sq > arch.stopping_range_sq:
                   should_move = True
-                  self.target_position = player_pos # Update pathfinding target
+                  self.set_target_position(self.target_player.x, self.target_player.y) # Update pathfinding target
              else:
                   # Within stopping range, don't move, clear pathfinding target
                   self.target_position = None
                   should_move = False
                   # Update facing direction even when stopped
                   if dist_to_target_sq > 1:
-                       norm_direction = direction.normalize()
-                       self.last_direction = norm_direction.copy()
-                       self.facing_right = (norm_direction.x >= 0)
+                       dist = math.sqrt(dist_to_target_sq)
+                       self.last_direction.update(to_x / dist, to_y / dist)
+                       self.facing_right = (to_x >= 0)
 
 
-        # Calculate move_vector if movement should occur
+        # Calculate the move direction if movement should occur
         if should_move and self.target_position:
-            direction = self.target_position - pygame.math.Vector2(self.x, self.y)
-            if direction.length_squared() > 1: # Avoid normalizing zero vector
-                move_vector = direction.normalize()
-                self.last_direction = move_vector.copy()
-                self.facing_right = (move_vector.x >= 0)
-            else:
-                move_vector = pygame.math.Vector2(0, 0)
-        else: # Not moving or no target
-            move_vector = pygame.math.Vector2(0, 0)
+            to_x = self.target_position[0] - self.x; to_y = self.target_position[1] - self.y
+            dist_sq = to_x * to_x + to_y * to_y
+            if dist_sq > 1: # Avoid normalizing zero vector
+                dist = math.sqrt(dist_sq)
+                move_x = to_x / dist; move_y = to_y / dist
+                # Chasing: follow the player's shared flow field around obstacles (None = straight line is fine)
+                if self.state == 'chasing' and flow_fields is not None and self.target_player:
+                    flow_step = flow_fields.direction(self.target_player, self.x, self.y)
+                    if flow_step is not None: move_x, move_y = flow_step
+                # Slide along the kingdom wall instead of walking into it (overworld only)
+                if wall_field is not None:
+                    move_x, move_y = wall_field.steer(self.x, self.y, move_x, move_y, ENEMY_WALL_STEER_DISTANCE)
+                self.last_direction.update(move_x, move_y)
+                self.facing_right = (move_x >= 0)
 
         # Determine Target Base Animation (idle or walk)
-        target_base_anim = 'walk' if move_vector.length_squared() > 0 else 'idle'
+        target_base_anim = 'walk' if (move_x or move_y) else 'idle'
 
         # --- Animation State Machine ---
         previous_animation_type = self.current_animation_type
@@ -250,27 +365,26 @@ class Enemy:
         # 1. DEAD State
         if self.state == 'dead':
             if self.current_animation_type != 'death':
-                new_animation_type = 'death'; self.animation_finished = False; self.is_attacking = False
+                new_animation_type = 'death'; self.is_attacking = False
         # 2. HURT State
         elif self.state == 'hurt':
              # If not already hurt or dead, switch to hurt anim
             if self.current_animation_type not in ['hurt', 'death']:
                  # Interrupt other actions
-                new_animation_type = 'hurt'; self.animation_finished = False; self.is_attacking = False
+                new_animation_type = 'hurt'; self.is_attacking = False
             elif self.current_animation_type == 'hurt' and self.animation_finished:
                 # Hurt finished, revert to base state (re-evaluate targeting)
                 # Note: State logic above already finds the closest player
                 if self.target_player:
                     dist_sq = (self.target_player.x - self.x)**2 + (self.target_player.y - self.y)**2
-                    if dist_sq < self.attack_trigger_range_sq and self.attack_cooldown_timer <= 0:
+                    if dist_sq < arch.attack_trigger_range_sq and self.attack_cooldown_timer <= 0:
                         self.state = 'attacking'
                         new_animation_type = 'attack' # Try to attack immediately
-                        self.animation_finished = False
                         self.is_attacking = True
                         self.attack_hit_triggered_this_cycle = False
                     else:
                          # Check if need to move closer or just idle/wait
-                         if dist_sq > self.stopping_range_sq:
+                         if dist_sq > arch.stopping_range_sq:
                               self.state = 'chasing'
                               new_animation_type = 'walk'
                          else:
@@ -289,22 +403,22 @@ class Enemy:
             )
             if can_start_attack_anim:
                 # Start the attack animation
-                new_animation_type = 'attack'; self.animation_finished = False
+                new_animation_type = 'attack'
                 self.is_attacking = True; self.attack_hit_triggered_this_cycle = False
             elif self.current_animation_type == 'attack' and self.animation_finished:
                 # Attack animation finished
                 self.is_attacking = False
                 # Reset attack cooldown timer
-                self.attack_cooldown_timer = self.attack_cooldown_duration
+                self.attack_cooldown_timer = arch.attack_cooldown_duration
                 # Re-evaluate state after attack
                 if self.target_player: # Check if target still exists
                     dist_sq = (self.target_player.x - self.x)**2 + (self.target_player.y - self.y)**2
-                    if dist_sq < self.attack_trigger_range_sq and self.attack_cooldown_timer <= 0: # Can we attack again immediately? (Unlikely due to cooldown)
-                         new_animation_type = 'attack'; self.animation_finished = False
+                    if dist_sq < arch.attack_trigger_range_sq and self.attack_cooldown_timer <= 0: # Can we attack again immediately? (Unlikely due to cooldown)
+                         self.start_animation('attack') # Same animation type: restart it from frame 0
                          self.is_attacking = True; self.attack_hit_triggered_this_cycle = False
                     else:
                          # Need to chase or just wait?
-                         if dist_sq > self.stopping_range_sq:
+                         if dist_sq > arch.stopping_range_sq:
                               self.state = 'chasing'
                               new_animation_type = 'walk'
                          else:
@@ -324,9 +438,7 @@ class Enemy:
 
         # Apply Animation Change
         if new_animation_type != previous_animation_type:
-            self.current_animation_type = new_animation_type
-            self.current_frame_index = 0
-            self.animation_finished = (new_animation_type in ['idle', 'walk']) # Looping anims don't 'finish' in one cycle
+            self.start_animation(new_animation_type) # Looping anims count as finished, one-shots run from frame 0
             # Reset attack flags if changing away from attack
             if previous_animation_type == 'attack' and new_animation_type != 'attack':
                  if self.is_attacking: self.is_attacking = False
@@ -339,113 +451,32 @@ class Enemy:
              self.is_attacking = True
 
 
-        # --- Select Current Animation Frames --- (No changes needed)
-        current_frames = None; is_one_shot_animation = False; looping_animation = False
-        if self.current_animation_type == 'idle': current_frames = self.idle_animation_frames; looping_animation = True
-        elif self.current_animation_type == 'walk': current_frames = self.walk_animation_frames; looping_animation = True
-        elif self.current_animation_type == 'attack': current_frames = self.attack_animation_frames; is_one_shot_animation = True
-        elif self.current_animation_type == 'hurt': current_frames = self.hurt_animation_frames; is_one_shot_animation = True
-        elif self.current_animation_type == 'death': current_frames = self.death_animation_frames; is_one_shot_animation = True
-
-        # --- Animation Progression & Hit Frame Check ---
+        # --- Hit Frame Check ---
+        # Frames are derived from the shared animation clock (nothing to step per tick); an attack
+        # hits once per swing, on the first update at or past its hit frame
         triggered_hit_this_frame = False # Flag to return
-        if current_frames and len(current_frames) > 0:
-            anim_speed = ANIMATION_SPEED_MS # Use constant speed
-            # Check if frame should advance
-            advance_frame = (not self.animation_finished) or \
-                            (self.current_animation_type == 'death' and self.current_frame_index < len(current_frames) - 1) # Allow death anim to reach last frame
-
-            if advance_frame and (current_time_ms - self.last_animation_update > anim_speed):
-                previous_frame_index = self.current_frame_index # Store previous frame for hit check
-                next_frame_index = self.current_frame_index + 1
-
-                if next_frame_index >= len(current_frames): # Reached end of animation
-                    if is_one_shot_animation:
-                        self.animation_finished = True
-                        # Hold last frame for death, otherwise reset index (state machine handles transition)
-                        self.current_frame_index = len(current_frames) - 1 if self.current_animation_type == 'death' else 0
-                        # Reset attack-specific flags if attack animation finished
-                        if self.current_animation_type == 'attack':
-                            # Cooldown reset is now handled in the state logic after anim finishes
-                            self.attack_hit_triggered_this_cycle = False # Reset flag for next attack
-                    elif looping_animation: # Loop idle/walk
-                         self.current_frame_index = 0
-                         self.animation_finished = False # Looping never truly 'finishes'
-                    else: # Should not happen if flags are set correctly
-                         self.current_frame_index = 0
-                         self.animation_finished = True
-                else: # Advance to next frame
-                    self.current_frame_index = next_frame_index
-                    self.animation_finished = False # Still playing
-
-                # Check if the attack hit frame was crossed
-                if self.current_animation_type == 'attack' and \
-                   self.is_attacking and \
-                   not self.attack_hit_triggered_this_cycle and \
-                   self.attack_hit_frame_index >= 0 and \
-                   self.current_frame_index >= self.attack_hit_frame_index and \
-                   previous_frame_index < self.attack_hit_frame_index: # Check if just passed the hit frame
-                        self.attack_hit_triggered_this_cycle = True # Mark hit as triggered for this attack cycle
-                        triggered_hit_this_frame = True # Signal main loop to check for damage
-
-                self.last_animation_update = current_time_ms # Update time even if frame index didn't change (e.g. held last death frame)
-
-        elif not current_frames or len(current_frames) == 0: # No frames for current anim type
-             self.animation_finished = True # Consider animation finished
+        if self.current_animation_type == 'attack' and \
+           self.is_attacking and \
+           not self.attack_hit_triggered_this_cycle and \
+           frame_reached(arch.attack_hit_frame_index, self.animation_elapsed_ms()):
+                self.attack_hit_triggered_this_cycle = True # Mark hit as triggered for this attack cycle
+                triggered_hit_this_frame = True # Signal main loop to check for damage
 
 
         # --- Movement Application & Collision (AUTHORITATIVE on Server) ---
         # Check if movement is allowed based on animation state and if a move vector exists
         can_move_now = (self.current_animation_type in ['idle', 'walk'] or (self.current_animation_type == 'attack' and self.animation_finished)) and \
                        not self.is_dead and \
-                       move_vector.length_squared() > 0 # Check if move_vector is non-zero
-
-        effective_speed = self.speed if can_move_now else 0
-        final_move_vector = move_vector * effective_speed * dt * 60 # Apply speed and scale by FPS
-
-        if final_move_vector.length_squared() > 0: # Only apply movement if vector is non-zero
-            # Store position before moving
-            prev_x, prev_y = self.x, self.y
-
-            # Move X
-            self.x += final_move_vector.x
-            self.rect.centerx = int(self.x)
-            collided_x = False
-            for obstacle in colliders_nearby:
-                if self.rect.colliderect(obstacle):
-                    if final_move_vector.x > 0: self.rect.right = obstacle.left
-                    elif final_move_vector.x < 0: self.rect.left = obstacle.right
-                    self.x = self.rect.centerx
-                    collided_x = True
-                    break
-
-            # Move Y
-            self.y += final_move_vector.y
-            self.rect.centery = int(self.y)
-            collided_y = False
-            for obstacle in colliders_nearby:
-                if self.rect.colliderect(obstacle):
-                    if final_move_vector.y > 0: self.rect.bottom = obstacle.top
-                    elif final_move_vector.y < 0: self.rect.top = obstacle.bottom
-                    self.y = self.rect.centery
-                    collided_y = True
-                    break
-
-            # Update final position from potentially adjusted rect
-            self.x = self.rect.centerx
-            self.y = self.rect.centery
-
-            # World boundary clamp (Get bounds from world_struct or config)
-            world_w = 20000 # Placeholder - use actual effective world size
-            world_h = 20000
-            self.x = max(self.radius, min(self.x, world_w - self.radius))
-            self.y = max(self.radius, min(self.y, world_h - self.radius))
-            self.rect.center = (int(self.x), int(self.y))
+                       (move_x or move_y) # Check if the move direction is non-zero
+
+        if can_move_now:
+            step = arch.speed * dt * 60 # Apply speed and scale by FPS
+            if step: self.apply_move(move_x * step, move_y * step, colliders_nearby, wall_segments)
 
 
         # --- Dialogue Trigger ---
         if self.target_player and self.state in ['chasing', 'attacking'] and previous_state_for_dialogue not in ['chasing', 'attacking'] and not self.said_greeting:
-            if self.name == "Sword_Orc":
+            if arch.name == "Sword_Orc":
                 self.set_dialogue("Meat?") # Example greeting
             self.said_greeting = True
         elif not self.target_player and self.state not in ['chasing', 'attacking']:
@@ -455,45 +486,32 @@ class Enemy:
         return triggered_hit_this_frame
 
 
+    def set_target_position(self, x, y):
+        """Points target_position at (x, y), reusing the existing Vector2 (no new object per tick)."""
+        if self.target_position is None: self.target_position = pygame.math.Vector2(x, y)
+        else: self.target_position.update(x, y)
+
+    def apply_move(self, move_x, move_y, colliders_nearby, wall_segments=()):
+        """ Moves by (move_x, move_y) with the shared kinematic mover, then clamps to the world. """
+        move_body(self, move_x, move_y, colliders_nearby, wall_segments)
+        clamp_body(self, self.archetype.radius, WORLD_WIDTH, WORLD_HEIGHT)
+
+
     def draw(self, surface, camera_apply_point_func):
         """ Draws the enemy sprite based on current animation state. """
+        arch = self.archetype
         enemy_screen_pos = camera_apply_point_func(self.x, self.y)
-        current_frame_image = None
-        current_frames = None
-
-        # Select frame set based on current animation type
-        if self.current_animation_type == 'idle': current_frames = self.idle_animation_frames
-        elif self.current_animation_type == 'walk': current_frames = self.walk_animation_frames
-        elif self.current_animation_type == 'attack': current_frames = self.attack_animation_frames
-        elif self.current_animation_type == 'hurt': current_frames = self.hurt_animation_frames
-        elif self.current_animation_type == 'death': current_frames = self.death_animation_frames
-
-        # Get the specific frame image, ensuring index is valid
-        if current_frames and len(current_frames) > 0:
-            safe_frame_index = max(0, min(self.current_frame_index, len(current_frames) - 1))
-            try:
-                current_frame_image = current_frames[safe_frame_index]
-            except IndexError:
-                 print(f"WARN: Frame index {safe_frame_index} out of bounds for anim '{self.current_animation_type}' (len {len(current_frames)}) for Enemy {self.id}")
-                 current_frame_image = None
+        # Pick the prebuilt variant (facing, invulnerability flash) for the current frame
+        flash = self.is_invulnerable and flash_phase(ANIMATION_CLOCK.now_ms)
+        image_to_draw = arch.animation_bank().frame(self.current_animation_type, self.current_frame_index,
+                                                    self.facing_right, flash)
 
         # Draw the image or fallback shape
-        if current_frame_image:
-            image_to_draw = current_frame_image
-            # Flip image based on facing direction
-            if not self.facing_right:
-                image_to_draw = pygame.transform.flip(current_frame_image, True, False)
+        if image_to_draw:
             # Calculate draw position (top-left corner)
-            draw_x = enemy_screen_pos[0] - self.frame_width // 2
-            draw_y = enemy_screen_pos[1] - self.frame_height // 2
-
-            # Apply invulnerability blink effect
-            if self.is_invulnerable:
-                 # Simple blink effect
-                 if int(pygame.time.get_ticks() / 100) % 2 == 0:
-                      surface.blit(image_to_draw, (draw_x, draw_y))
-            else:
-                 surface.blit(image_to_draw, (draw_x, draw_y))
+            draw_x = enemy_screen_pos[0] - arch.frame_width // 2
+            draw_y = enemy_screen_pos[1] - arch.frame_height // 2
+            surface.blit(image_to_draw, (draw_x, draw_y))
 
             # Draw Health Bar (Optional)
             # ... (health bar drawing logic) ...
@@ -502,10 +520,10 @@ class Enemy:
              # Use enemy color or default
              color = getattr(self, 'color', (200, 0, 0)) # Use self.color if defined, else default
              # Apply invulnerability blink effect
-             if self.is_invulnerable and pygame.time.get_ticks() % 200 < 100:
+             if self.is_invulnerable and ANIMATION_CLOCK.now_ms % 200 < 100:
                   pass # Don't draw
              else:
-                  pygame.draw.circle(surface, color, enemy_screen_pos, int(self.radius))
+                  pygame.draw.circle(surface, color, enemy_screen_pos, int(arch.radius))
 
         # <<< Draw Dialogue >>>
         if self.dialogue_text and self.dialogue_timer > 0 and DIALOGUE_FONT:
@@ -517,7 +535,7 @@ class Enemy:
                 # Position above the enemy sprite
                 text_rect.centerx = enemy_screen_pos[0]
                 # Adjust vertical position based on frame height
-                text_rect.bottom = enemy_screen_pos[1] - (self.frame_height // 2) - 5
+                text_rect.bottom = enemy_screen_pos[1] - (arch.frame_height // 2) - 5
 
                 # Draw background
                 bg_rect = text_rect.inflate(6, 4) # Add padding
@@ -528,32 +546,31 @@ class Enemy:
                 # Draw the actual text
                 surface.blit(text_surface, text_rect.topleft)
             except Exception as e: # Catch potential font rendering errors
-                print(f"Error rendering dialogue for {self.name} ({self.id}): {e}")
+                print(f"Error rendering dialogue for {arch.name} ({self.id}): {e}")
                 self.dialogue_text = None # Stop trying to render
 
 
     def take_damage(self, amount):
         """Applies damage, defense, triggers hurt/death state. (Server Authority)"""
         if self.is_dead or self.is_invulnerable: return 0 # Return 0 damage taken
+        arch = self.archetype
 
         # Apply Defense
-        damage_multiplier = max(0.0, 1.0 - self.defense)
+        damage_multiplier = max(0.0, 1.0 - arch.defense)
         actual_damage = round(amount * damage_multiplier)
-        if actual_damage <= 0 and amount > 0 and self.defense < 1.0: actual_damage = 1 # Min 1 damage
+        if actual_damage <= 0 and amount > 0 and arch.defense < 1.0: actual_damage = 1 # Min 1 damage
 
         self.health -= actual_damage
-        # print(f"{self.name} ({self.id}) took {actual_damage} damage ({amount} base). Health: {self.health}/{self.max_health}") # Debug
+        # print(f"{arch.name} ({self.id}) took {actual_damage} damage ({amount} base). Health: {self.health}/{self.max_health}") # Debug
 
         if self.health <= 0:
             self.health = 0
             if not self.is_dead:
-                # print(f"{self.name} ({self.id}) defeated!") # Debug
+                # print(f"{arch.name} ({self.id}) defeated!") # Debug
                 self.is_dead = True
                 self.state = 'dead' # Set final state
                 if self.current_animation_type != 'death':
-                    self.current_animation_type = 'death'
-                    self.current_frame_index = 0
-                    self.animation_finished = False # Start the animation
+                    self.start_animation('death')
                 self.is_attacking = False # Cannot attack while dead
                 self.target_player = None # Clear target
                 self.target_position = None
@@ -561,12 +578,10 @@ class Enemy:
             # Took damage but not dead, trigger hurt state and animation
             self.state = 'hurt'
             if self.current_animation_type != 'hurt':
-                 self.current_animation_type = 'hurt'
-                 self.current_frame_index = 0
-                 self.animation_finished = False # Start the animation
+                 self.start_animation('hurt')
             self.is_attacking = False # Hurt interrupts attack
             self.is_invulnerable = True
-            self.invulnerability_timer = self.invulnerability_duration
+            self.invulnerability_timer = arch.invulnerability_duration
 
         return actual_damage # Return actual damage dealt
 
@@ -582,8 +597,7 @@ class Enemy:
             'max_health': self.max_health,
             'facing_right': self.facing_right,
             'anim_type': self.current_animation_type,
-            'anim_frame': self.current_frame_index,
-            'anim_finished': self.animation_finished,
+            'anim_start': self.anim_start_ms, # Clients derive frames from this and their synced clock
             'is_dead': self.is_dead,
             'is_invulnerable': self.is_invulnerable,
             'is_attacking': self.is_attacking,
@@ -606,18 +620,9 @@ class Enemy:
         self.dialogue_text = state_data.get('dialogue_text', self.dialogue_text)
         self.dialogue_timer = state_data.get('dialogue_timer', self.dialogue_timer)
 
-        # Update animation state carefully
-        new_anim_type = state_data.get('anim_type', self.current_animation_type)
-        new_anim_frame = state_data.get('anim_frame', self.current_frame_index)
-        new_anim_finished = state_data.get('anim_finished', self.animation_finished)
-
-        if new_anim_type != self.current_animation_type:
-            self.current_animation_type = new_anim_type
-            self.current_frame_index = new_anim_frame # Use server's frame on change
-        elif self.current_animation_type == new_anim_type:
-             self.current_frame_index = new_anim_frame # Sync frame
-
-        self.animation_finished = new_anim_finished
+        # Animation: type and start time (server clock); the frame is derived locally when drawing
+        self.current_animation_type = state_data.get('anim_type', self.current_animation_type)
+        self.anim_start_ms = state_data.get('anim_start', self.anim_start_ms)
 
         # Update rect based on new position
         self.rect.center = (int(self.x), int(self.y))
\ No newline at end of file
@@ -0,0 +1,443 @@
+import math
+
+try:
+    import numpy as np
+except ImportError: # Optional: EnemySoA is unavailable and CombatManager keeps the per-object path
+    np = None
+
+from .stat_constants import *
+from world_structures.world_constants import HPA_MIN_PATH_DISTANCE
+from world_structures.animation import ANIMATION_CLOCK
+from world_structures.kinematics import move_bodies
+
+# --- Structure-of-Arrays Enemy Simulation ---
+# Alternative to calling Enemy.update() once per enemy: every per-enemy field the
+# server tick touches lives in a NumPy array (one slot per enemy) and timers, target
+# search, state transitions, animation and movement run as whole-array passes.
+# Only the few enemies doing something expensive (moving into colliders, tracing
+# line of sight, following a path) drop back to per-object code.
+#
+# The Enemy objects stay around as thin views: they are written back after every
+# step so drawing, replication (get_network_state) and combat code keep working,
+# and pull() copies a view's fields back in after take_damage() changed them.
+
+# State / animation codes (index = code)
+STATE_NAMES = ('idle', 'wander', 'chasing', 'attacking', 'returning', 'hurt', 'dead')
+ST_IDLE, ST_WANDER, ST_CHASING, ST_ATTACKING, ST_RETURNING, ST_HURT, ST_DEAD = range(len(STATE_NAMES))
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+ANIM_NAMES = ('idle', 'walk', 'attack', 'hurt', 'death')
+AN_IDLE, AN_WALK, AN_ATTACK, AN_HURT, AN_DEATH = range(len(ANIM_NAMES))
+ANIM_CODES = {name: code for code, name in enumerate(ANIM_NAMES)}
+
+SOA_INITIAL_CAPACITY = 1024
+# Fields mirrored onto the Enemy views; only slots where one of them changed are written back
+SYNCED_FIELDS = ('x', 'y', 'state', 'anim', 'anim_start', 'attacking', 'hit_triggered',
+                 'invulnerable', 'facing_right', 'target_pid', 'dialogue_timer')
+
+
+class EnemySoA:
+    """
+    Array-backed simulation for a CombatManager's enemies (requires numpy).
+    add()/remove() keep slots dense (removal swaps the last enemy in);
+    step() advances every enemy by dt and returns (hit_views, finished_dead_views).
+    """
+    # Per-slot arrays: name -> dtype
+    FIELDS = {
+        'x': 'f8', 'y': 'f8', 'spawn_x': 'f8', 'spawn_y': 'f8',
+        'speed': 'f8', 'radius': 'f8',
+        'detection_sq': 'f8', 'attack_sq': 'f8', 'stopping_sq': 'f8',
+        'attack_cd': 'f8', 'attack_cd_duration': 'f8',
+        'wander_timer': 'f8', 'chase_timer': 'f8', 'invuln_timer': 'f8', 'dialogue_timer': 'f8',
+        'target_x': 'f8', 'target_y': 'f8', 'has_target_pos': '?',
+        'target_pid': 'i8', # player_id of target_player, -1 for none
+        'state': 'i1', 'anim': 'i1', 'anim_start': 'i8', # Animation = (type, start time on ANIMATION_CLOCK)
+        'attacking': '?', 'hit_triggered': '?', 'hit_frame': 'i4',
+        'dead': '?', 'invulnerable': '?', 'facing_right': '?', 'said_greeting': '?',
+        'type_id': 'i4',
+    }
+
+    def __init__(self, capacity=SOA_INITIAL_CAPACITY, seed=None):
+        if np is None: raise ImportError("EnemySoA requires numpy")
+        self.count = 0
+        self.capacity = 0
+        self.views = [] # Slot -> Enemy
+        self.slot_of = {} # Enemy -> slot
+        self.type_ids = {} # EnemyArchetype -> row of type_frames
+        self.type_frames = np.zeros((0, len(ANIM_NAMES)), dtype=np.int32) # Frame counts per type and animation
+        self.return_paths = {} # Enemy -> PathRequest home (only enemies returning a long way)
+        self.rng = np.random.default_rng(seed)
+        self._grow(capacity)
+
+        # Counters from the last step() (read by CombatManager for the tick profiler)
+        self.movers = 0
+        self.los_checks = 0
+        self.moved_views = [] # Enemies that moved in the last step (CombatManager re-buckets only these)
+        self.views_synced = 0
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, capacity):
+        for name, dtype in self.FIELDS.items():
+            new_array = np.zeros(capacity, dtype=dtype)
+            if self.capacity: new_array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, new_array)
+        self.capacity = capacity
+
+    def _finished(self, anim, anim_start, now_ms):
+        """Same rule as animation_finished(): looping/frameless animations always, one-shots after their last frame."""
+        frame_count = self.type_frames[self.type_id[:len(anim)], anim]
+        return (anim < AN_ATTACK) | (frame_count <= 0) | (now_ms - anim_start >= frame_count * ANIMATION_SPEED_MS)
+
+    def _type_id(self, enemy):
+        """Row of type_frames for the enemy's archetype (frame counts are shared by a type)."""
+        arch = enemy.archetype
+        type_id = self.type_ids.get(arch)
+        if type_id is None:
+            counts = [len(frames) if frames else 0 for frames in
+                      (arch.idle_animation_frames, arch.walk_animation_frames, arch.attack_animation_frames,
+                       arch.hurt_animation_frames, arch.death_animation_frames)]
+            type_id = self.type_ids[arch] = len(self.type_frames)
+            self.type_frames = np.vstack([self.type_frames, np.array([counts], dtype=np.int32)])
+        return type_id
+
+    # --- Slots ---
+    def add(self, enemy):
+        if enemy in self.slot_of: return
+        if self.count == self.capacity: self._grow(self.capacity * 2)
+        slot = self.count
+        self.count += 1
+        self.views.append(enemy)
+        self.slot_of[enemy] = slot
+        self.x[slot] = enemy.x; self.y[slot] = enemy.y
+        self.spawn_x[slot] = enemy.spawn_x; self.spawn_y[slot] = enemy.spawn_y
+        self.speed[slot] = enemy.speed; self.radius[slot] = enemy.radius
+        self.detection_sq[slot] = enemy.detection_radius_sq
+        self.attack_sq[slot] = enemy.attack_trigger_range_sq
+        self.stopping_sq[slot] = enemy.stopping_range_sq
+        self.attack_cd[slot] = enemy.attack_cooldown_timer
+        self.attack_cd_duration[slot] = enemy.attack_cooldown_duration
+        self.wander_timer[slot] = enemy.wander_timer; self.chase_timer[slot] = enemy.chase_timer
+        self.dialogue_timer[slot] = enemy.dialogue_timer
+        target = enemy.target_position
+        self.has_target_pos[slot] = target is not None
+        if target is not None: self.target_x[slot], self.target_y[slot] = target.x, target.y
+        self.hit_triggered[slot] = enemy.attack_hit_triggered_this_cycle
+        self.hit_frame[slot] = enemy.attack_hit_frame_index
+        self.facing_right[slot] = enemy.facing_right
+        self.said_greeting[slot] = enemy.said_greeting
+        self.type_id[slot] = self._type_id(enemy)
+        self.pull(enemy)
+
+    def remove(self, enemy):
+        """Frees the enemy's slot by moving the last enemy into it."""
+        slot = self.slot_of.pop(enemy, None)
+        if slot is None: return False
+        last = self.count - 1
+        if slot != last:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            moved = self.views[last]
+            self.views[slot] = moved
+            self.slot_of[moved] = slot
+        self.views.pop()
+        self.count = last
+        self.return_paths.pop(enemy, None)
+        return True
+
+    def pull(self, enemy):
+        """Copies the fields combat code may change on a view (take_damage) back into the arrays."""
+        slot = self.slot_of.get(enemy)
+        if slot is None: return
+        self.state[slot] = STATE_CODES.get(enemy.state, ST_IDLE)
+        self.anim[slot] = ANIM_CODES.get(enemy.current_animation_type, AN_IDLE)
+        self.anim_start[slot] = enemy.anim_start_ms
+        self.attacking[slot] = enemy.is_attacking
+        self.dead[slot] = enemy.is_dead
+        self.invulnerable[slot] = enemy.is_invulnerable
+        self.invuln_timer[slot] = enemy.invulnerability_timer
+        self.target_pid[slot] = enemy.target_player.player_id if enemy.target_player is not None else -1
+        if enemy.target_position is None: self.has_target_pos[slot] = False
+
+    # --- Simulation ---
+    def step(self, players, dt, index=None, los_cache=None, flow_fields=None, path_planner=None,
+             wall_field=None, refresh_colliders=None):
+        """
+        Advances every enemy by dt (same rules as Enemy.update). `players` is the list of
+        player objects; `refresh_colliders(views)` brings the movers' collider caches up to
+        date before they move. Returns (views whose attack hit frame was reached this step,
+        dead views whose death animation finished).
+        """
+        n = self.count
+        self.movers = 0; self.los_checks = 0; self.moved_views = []
+        if n == 0: return [], []
+        now_ms = ANIMATION_CLOCK.now_ms
+        synced_before = [getattr(self, name)[:n].copy() for name in SYNCED_FIELDS]
+        x = self.x[:n]; y = self.y[:n]; speed = self.speed[:n]
+        state = self.state[:n]; anim = self.anim[:n]; anim_start = self.anim_start[:n]
+        finished = self._finished(anim, anim_start, now_ms) # Derived from the animation clock, not stored
+        attacking = self.attacking[:n]; hit_triggered = self.hit_triggered[:n]
+        target_x = self.target_x[:n]; target_y = self.target_y[:n]; has_target_pos = self.has_target_pos[:n]
+        attack_cd = self.attack_cd[:n]; wander_timer = self.wander_timer[:n]; chase_timer = self.chase_timer[:n]
+        target_pid = self.target_pid[:n]
+        views = self.views
+
+        # --- Timers ---
+        np.maximum(attack_cd - dt, 0.0, out=attack_cd)
+        np.maximum(wander_timer - dt, 0.0, out=wander_timer)
+        invulnerable = self.invulnerable[:n]; invuln_timer = self.invuln_timer[:n]
+        invuln_timer[invulnerable] -= dt
+        invulnerable &= invuln_timer > 0
+        dialogue_timer = self.dialogue_timer[:n]
+        talking = dialogue_timer > 0
+        dialogue_timer[talking] -= dt
+        dialogue_expired = np.flatnonzero(talking & (dialogue_timer <= 0))
+        previous_state = state.copy()
+
+        # --- Target Search (closest visible living player inside the detection radius) ---
+        state[self.dead[:n]] = ST_DEAD
+        active = (state != ST_DEAD) & ~((state == ST_HURT) & ~finished)
+        live_players = [p for p in players if p is not None and not p.is_dead]
+        best_sq = np.where(active, self.detection_sq[:n], -1.0) # Inactive slots never match
+        target_col = np.full(n, -1, dtype=np.int64)
+        for col, player in enumerate(live_players):
+            dist_sq = (player.x - x) ** 2 + (player.y - y) ** 2
+            closer = dist_sq < best_sq
+            if los_cache is not None:
+                # Line of sight only for the (few) enemies the player is close to
+                for slot in np.flatnonzero(closer).tolist():
+                    self.los_checks += 1
+                    if not los_cache.is_visible(index, (views[slot].id, player.player_id), x[slot], y[slot], player.x, player.y):
+                        closer[slot] = False
+            best_sq[closer] = dist_sq[closer]
+            target_col[closer] = col
+        has_target = target_col >= 0
+        if live_players:
+            player_pids = np.array([p.player_id for p in live_players], dtype=np.int64)
+            target_pid[active] = np.where(has_target, player_pids[target_col], -1)[active]
+        else:
+            target_pid[active] = -1
+        # Distance to the current target (inf when none), used by the animation state machine
+        target_sq = np.where(has_target, best_sq, np.inf)
+
+        # --- React Based on Closest Player ---
+        seen = active & has_target
+        chase_timer[seen] = SWORD_ORC_CHASE_TIMEOUT
+        attack_sq = self.attack_sq[:n]; stopping_sq = self.stopping_sq[:n]
+        start_attack = seen & (best_sq < attack_sq) & (attack_cd <= 0)
+        to_attack = start_attack & (state != ST_HURT)
+        state[to_attack] = ST_ATTACKING; has_target_pos[to_attack] = False
+        to_chase = seen & ~start_attack & (state != ST_ATTACKING) & (state != ST_HURT)
+        state[to_chase] = ST_CHASING; has_target_pos[to_chase] = False # Chasers aim at the player below
+
+        # --- No Player: give up, return home, wander ---
+        unseen = active & ~has_target
+        state_before = state.copy()
+        spawn_x = self.spawn_x[:n]; spawn_y = self.spawn_y[:n]
+        close_sq = (speed * dt * 10) ** 2 # Jitter prevention threshold
+        losing = unseen & ((state_before == ST_CHASING) | (state_before == ST_ATTACKING))
+        chase_timer[losing] -= dt
+        give_up = losing & (chase_timer <= 0)
+        state[give_up] = ST_RETURNING
+        target_x[give_up] = spawn_x[give_up]; target_y[give_up] = spawn_y[give_up]; has_target_pos[give_up] = True
+        if path_planner is not None:
+            home_sq = (x - spawn_x) ** 2 + (y - spawn_y) ** 2
+            for slot in np.flatnonzero(give_up & (home_sq > HPA_MIN_PATH_DISTANCE ** 2)).tolist():
+                self.return_paths[views[slot]] = path_planner.request(x[slot], y[slot], spawn_x[slot], spawn_y[slot])
+
+        returning = unseen & (state_before == ST_RETURNING)
+        home = returning & ((x - spawn_x) ** 2 + (y - spawn_y) ** 2 < close_sq)
+        state[home] = ST_IDLE; has_target_pos[home] = False
+        heading_home = returning & ~home
+        target_x[heading_home] = spawn_x[heading_home]; target_y[heading_home] = spawn_y[heading_home]
+        has_target_pos[heading_home] = True
+        if self.return_paths:
+            # Follow the path home once the planner has answered (straight line until then)
+            for view, request in self.return_paths.items():
+                slot = self.slot_of[view]
+                if heading_home[slot] and request.status == 'done':
+                    target_x[slot], target_y[slot] = request.path.next_point(x[slot], y[slot])
+
+        wandering = unseen & (state_before == ST_WANDER)
+        wander_done = wandering & (~has_target_pos | (wander_timer <= 0) |
+                                   ((x - target_x) ** 2 + (y - target_y) ** 2 < close_sq))
+        reached = wander_done & has_target_pos & (wander_timer > 0)
+        has_target_pos[reached] = False
+        state[wander_done] = ST_IDLE
+        wander_timer[wander_done] = self.rng.uniform(SWORD_ORC_WANDER_TIME_MIN, SWORD_ORC_WANDER_TIME_MAX, int(wander_done.sum()))
+
+        start_wander = unseen & (state_before == ST_IDLE) & (wander_timer <= 0)
+        if start_wander.any():
+            # Random wander point near spawn, clamped to stay somewhat near the spawn area
+            count = int(start_wander.sum())
+            angle = self.rng.uniform(0, 2 * math.pi, count)
+            dist = self.rng.uniform(0, SWORD_ORC_WANDER_RADIUS, count)
+            max_dist_from_spawn = SWORD_ORC_WANDER_RADIUS * 1.5
+            sx = spawn_x[start_wander]; sy = spawn_y[start_wander]
+            target_x[start_wander] = np.clip(sx + dist * np.cos(angle), sx - max_dist_from_spawn, sx + max_dist_from_spawn)
+            target_y[start_wander] = np.clip(sy + dist * np.sin(angle), sy - max_dist_from_spawn, sy + max_dist_from_spawn)
+            has_target_pos[start_wander] = True
+            state[start_wander] = ST_WANDER
+
+        # Drop paths home once no longer returning (reached spawn or spotted a player)
+        if self.return_paths:
+            for view in [v for v in self.return_paths if state[self.slot_of[v]] != ST_RETURNING]:
+                if path_planner is not None: path_planner.cancel(self.return_paths[view])
+                del self.return_paths[view]
+
+        # --- Movement Direction ---
+        facing_right = self.facing_right[:n]
+        player_x = np.zeros(n); player_y = np.zeros(n)
+        if live_players:
+            cols = np.maximum(target_col, 0)
+            player_x = np.array([p.x for p in live_players])[cols]
+            player_y = np.array([p.y for p in live_players])[cols]
+        walk_to_point = ((state == ST_WANDER) | (state == ST_RETURNING)) & has_target_pos & \
+                        ((target_x - x) ** 2 + (target_y - y) ** 2 > close_sq)
+        chasing = (state == ST_CHASING) & has_target
+        chase_move = chasing & (target_sq > stopping_sq)
+        target_x[chase_move] = player_x[chase_move]; target_y[chase_move] = player_y[chase_move]
+        has_target_pos[chase_move] = True
+        holding = chasing & ~chase_move
+        has_target_pos[holding] = False
+        # Face the player even when stopped
+        turn = holding & (target_sq > 1)
+        facing_right[turn] = player_x[turn] >= x[turn]
+
+        dir_x = target_x - x; dir_y = target_y - y
+        length_sq = dir_x * dir_x + dir_y * dir_y
+        moving = (walk_to_point | chase_move) & (length_sq > 1)
+        length = np.sqrt(np.where(moving, length_sq, 1.0))
+        dir_x = np.where(moving, dir_x / length, 0.0); dir_y = np.where(moving, dir_y / length, 0.0)
+        if moving.any() and (flow_fields is not None or wall_field is not None):
+            for slot in np.flatnonzero(moving).tolist():
+                move_x, move_y = dir_x[slot], dir_y[slot]
+                # Chasing: follow the player's shared flow field around obstacles
+                if flow_fields is not None and chase_move[slot]:
+                    flow_step = flow_fields.direction(live_players[target_col[slot]], x[slot], y[slot])
+                    if flow_step is not None: move_x, move_y = flow_step
+                # Slide along the kingdom wall instead of walking into it
+                if wall_field is not None:
+                    move_x, move_y = wall_field.steer(x[slot], y[slot], move_x, move_y, ENEMY_WALL_STEER_DISTANCE)
+                dir_x[slot] = move_x; dir_y[slot] = move_y
+            moving &= (dir_x != 0) | (dir_y != 0)
+        facing_right[moving] = dir_x[moving] >= 0
+        base_anim = np.where(moving, AN_WALK, AN_IDLE).astype(np.int8)
+
+        # --- Animation State Machine (branches keyed on the state going in) ---
+        machine_state = state.copy()
+        previous_anim = anim.copy()
+        new_anim = anim.copy()
+        looping = (anim == AN_IDLE) | (anim == AN_WALK)
+        want_move = target_sq > stopping_sq
+
+        dying = (machine_state == ST_DEAD) & (anim != AN_DEATH)
+        new_anim[dying] = AN_DEATH; finished[dying] = False; attacking[dying] = False
+
+        hurt = machine_state == ST_HURT
+        hurt_start = hurt & (anim != AN_HURT) & (anim != AN_DEATH)
+        new_anim[hurt_start] = AN_HURT; finished[hurt_start] = False; attacking[hurt_start] = False
+        recovered = hurt & (anim == AN_HURT) & finished
+        recovered_attack = recovered & has_target & (target_sq < attack_sq) & (attack_cd <= 0)
+        recovered_chase = recovered & has_target & ~recovered_attack
+        recovered_idle = recovered & ~has_target
+
+        swinging = machine_state == ST_ATTACKING
+        swing_start = swinging & (anim != AN_ATTACK) & (anim != AN_HURT) & (anim != AN_DEATH) & (finished | looping)
+        swing_done = swinging & ~swing_start & (anim == AN_ATTACK) & finished
+        attacking[swing_done] = False
+        attack_cd[swing_done] = self.attack_cd_duration[:n][swing_done]
+        swing_again = swing_done & has_target & (target_sq < attack_sq) & (attack_cd <= 0)
+        swing_chase = swing_done & has_target & ~swing_again
+        swing_idle = swing_done & ~has_target
+
+        begin_attack = recovered_attack | swing_start | swing_again
+        state[recovered_attack] = ST_ATTACKING
+        new_anim[begin_attack] = AN_ATTACK; finished[begin_attack] = False
+        attacking[begin_attack] = True; hit_triggered[begin_attack] = False
+        resume_chase = recovered_chase | swing_chase
+        state[resume_chase] = ST_CHASING
+        new_anim[resume_chase] = np.where(want_move, AN_WALK, AN_IDLE)[resume_chase]
+        go_idle = recovered_idle | swing_idle
+        state[go_idle] = ST_IDLE; new_anim[go_idle] = AN_IDLE
+
+        base = (machine_state != ST_DEAD) & ~hurt & ~swinging & (finished | looping) & (anim != base_anim)
+        new_anim[base] = base_anim[base]
+
+        # Apply Animation Change (a second swing restarts the same animation)
+        changed = new_anim != previous_anim
+        anim[changed] = new_anim[changed]
+        anim_start[changed | swing_again] = now_ms
+        finished = self._finished(anim, anim_start, now_ms)
+        left_attack = changed & (previous_anim == AN_ATTACK)
+        attacking[left_attack] = False; hit_triggered[left_attack] = False
+        # Final State Consistency Check
+        is_attack_anim = anim == AN_ATTACK
+        attacking &= is_attack_anim
+        attacking |= is_attack_anim & ~finished
+
+        # --- Hit Frame Check (frames themselves are derived from the clock; nothing is stepped) ---
+        hit_frame = self.hit_frame[:n]
+        hit_now = is_attack_anim & attacking & ~hit_triggered & (hit_frame >= 0) & \
+                  (now_ms - anim_start >= hit_frame * ANIMATION_SPEED_MS)
+        hit_triggered |= hit_now
+
+        # --- Movement Application & Collision ---
+        can_move = ((anim == AN_IDLE) | (anim == AN_WALK) | (is_attack_anim & finished)) & ~self.dead[:n] & moving
+        movers = np.flatnonzero(can_move).tolist()
+        self.movers = len(movers)
+        if movers:
+            step_scale = speed[movers] * dt * 60
+            move_x = (dir_x[movers] * step_scale).tolist(); move_y = (dir_y[movers] * step_scale).tolist()
+            mover_views = self.moved_views = [views[slot] for slot in movers]
+            if refresh_colliders is not None: refresh_colliders(mover_views)
+            for slot, view in zip(movers, mover_views):
+                view.x = x[slot]; view.y = y[slot]
+            # One batch through the shared kinematic mover (same resolution as Enemy.apply_move)
+            move_bodies(mover_views, move_x, move_y, refresh_colliders is not None, WORLD_WIDTH, WORLD_HEIGHT)
+            x[movers] = [view.x for view in mover_views]; y[movers] = [view.y for view in mover_views]
+
+        # --- Dialogue Trigger ---
+        has_target_now = target_pid >= 0
+        engaged = (state == ST_CHASING) | (state == ST_ATTACKING)
+        was_engaged = (previous_state == ST_CHASING) | (previous_state == ST_ATTACKING)
+        said_greeting = self.said_greeting[:n]
+        greet = has_target_now & engaged & ~was_engaged & ~said_greeting
+        for slot in np.flatnonzero(greet).tolist():
+            view = views[slot]
+            if view.name == "Sword_Orc":
+                view.set_dialogue("Meat?")
+                dialogue_timer[slot] = view.dialogue_timer
+        said_greeting |= greet
+        said_greeting &= has_target_now | engaged
+
+        self._sync_views(n, synced_before, live_players, dialogue_expired)
+        hits = [views[slot] for slot in np.flatnonzero(hit_now & has_target).tolist()]
+        done = [views[slot] for slot in np.flatnonzero(self.dead[:n] & finished).tolist()]
+        return hits, done
+
+    def _sync_views(self, n, synced_before, live_players, dialogue_expired):
+        """Writes the fields drawing and replication read back onto the Enemy views that changed this step."""
+        views = self.views
+        for slot in dialogue_expired.tolist(): views[slot].dialogue_text = None
+        dirty = np.zeros(n, dtype=bool)
+        for name, before in zip(SYNCED_FIELDS, synced_before):
+            dirty |= getattr(self, name)[:n] != before
+        slots = np.flatnonzero(dirty)
+        self.views_synced = len(slots)
+        if not len(slots): return
+        players_by_pid = {player.player_id: player for player in live_players}
+        for slot, x, y, state, anim, anim_start, attacking, hit, invulnerable, facing, pid, dialogue in zip(
+                slots.tolist(), *(getattr(self, name)[slots].tolist() for name in SYNCED_FIELDS)):
+            view = views[slot]
+            view.x = x; view.y = y
+            view.state = STATE_NAMES[state]
+            view.current_animation_type = ANIM_NAMES[anim]
+            view.anim_start_ms = anim_start
+            view.is_attacking = attacking
+            view.attack_hit_triggered_this_cycle = hit
+            view.is_invulnerable = invulnerable
+            view.facing_right = facing
+            view.dialogue_timer = dialogue
+            view.target_player = players_by_pid.get(pid)
@@ -0,0 +1,62 @@
+import random
+from operator import attrgetter
+try:
+    import numpy as np
+except ImportError: # Optional: hit tests fall back to a per-candidate loop
+    np = None
+
+from .stat_constants import MELEE_VECTORIZE_MIN
+
+MELEE_RNG = np.random.default_rng() if np is not None else None # Dodge rolls for the array path
+_get_x, _get_y, _get_radius, _get_agility = map(attrgetter, ('x', 'y', 'radius', 'agility')) # Column gathers
+
+
+# --- Melee Hit Resolution ---
+# A swing is resolved in three steps: the caller gets candidates from a SpatialHash
+# query around the attack center (so the cost depends on what is nearby, not on how
+# many enemies exist), melee_targets() runs the overlap and dodge tests for all of
+# them at once, and apply_melee_damage() applies the damage and records one event per
+# target. Every hit and dodge of one swing ends up in a single event list.
+
+def melee_targets(candidates, center_x, center_y, reach_sq):
+    """
+    Splits candidates into (hit, dodged): those whose circle overlaps the attack circle
+    (center distance^2 < reach_sq + radius^2), with an agility dodge roll each.
+    One array pass when numpy is available and there are enough candidates.
+    """
+    if not candidates: return [], []
+    if np is not None and len(candidates) >= MELEE_VECTORIZE_MIN:
+        count = len(candidates)
+        dx = np.fromiter(map(_get_x, candidates), np.float64, count) - center_x
+        dy = np.fromiter(map(_get_y, candidates), np.float64, count) - center_y
+        radius = np.fromiter(map(_get_radius, candidates), np.float64, count)
+        inside = dx * dx + dy * dy < reach_sq + radius * radius
+        dodge = inside & (MELEE_RNG.random(count) < np.fromiter(map(_get_agility, candidates), np.float64, count))
+        return ([candidates[i] for i in np.flatnonzero(inside & ~dodge).tolist()],
+                [candidates[i] for i in np.flatnonzero(dodge).tolist()])
+
+    hit = []; dodged = []
+    for candidate in candidates:
+        if (candidate.x - center_x) ** 2 + (candidate.y - center_y) ** 2 < reach_sq + candidate.radius ** 2:
+            if random.random() < candidate.agility: dodged.append(candidate)
+            else: hit.append(candidate)
+    return hit, dodged
+
+
+def apply_melee_damage(attacker_id, target_kind, hit, dodged, amount, id_attr, events):
+    """
+    Applies `amount` (before each target's defense) to every hit target and appends one
+    event per damaged or dodging target to `events`: {'attacker', 'target', 'target_id', 'damage', 'dodged'}.
+    Returns the targets that actually took damage.
+    """
+    damaged = []
+    for target in hit:
+        damage = target.take_damage(amount)
+        if damage <= 0: continue # Invulnerable (just hit) or already dead: no event
+        damaged.append(target)
+        events.append({'attacker': attacker_id, 'target': target_kind, 'target_id': getattr(target, id_attr),
+                       'damage': damage, 'dodged': False})
+    for target in dodged:
+        events.append({'attacker': attacker_id, 'target': target_kind, 'target_id': getattr(target, id_attr),
+                       'damage': 0, 'dodged': True})
+    return damaged
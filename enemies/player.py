@@ -1,21 +1,72 @@
 import pygame
+from operator import attrgetter
 from open_world_dir.ui import ui_font
 import combat_mech as combat_mech_stable
 import world_struct as world_struct_stable
 import asset.assets as assets
+from world_structures.collider_cache import ColliderCache
+from world_structures.kinematics import move_body, clamp_body
+from world_structures.animation import ANIMATION_CLOCK, Animated, frame_counts
+from world_structures.sprite_bank import AnimationBank, flash_phase
+
+# --- Per-Type Data ---
+class PlayerArchetype:
+    """Animation frames, size and color every player shares (one instance per frame set, see shared())."""
+    __slots__ = ('radius', 'color', 'idle_animation_frames', 'walk_animation_frames', 'attack_animation_frames',
+                 'hurt_animation_frames', 'death_animation_frames', 'frame_counts', 'frame_width', 'frame_height',
+                 'invulnerability_duration', 'bank')
+    _shared = {} # {(radius, color, frame list ids): PlayerArchetype}
+
+    def __init__(self, radius, color, animations):
+        self.radius = radius
+        self.color = color # Fallback color if sprite fails
+        self.idle_animation_frames = animations.get('idle')
+        self.walk_animation_frames = animations.get('walk')
+        self.attack_animation_frames = animations.get('attack')
+        self.hurt_animation_frames = animations.get('hurt')
+        self.death_animation_frames = animations.get('death')
+        self.frame_counts = frame_counts({name: animations.get(name) for name in ('idle', 'walk', 'attack', 'hurt', 'death')})
+        frame_dims = animations.get('dims')
+        self.frame_width, self.frame_height = frame_dims if frame_dims else (radius * 4, radius * 4)
+        self.invulnerability_duration = 0.5 # seconds
+        self.bank = None # AnimationBank, fetched on first draw (the server never draws)
+
+    @classmethod
+    def shared(cls, radius, color, animations):
+        frames = tuple(animations.get(name) for name in ('idle', 'walk', 'attack', 'hurt', 'death'))
+        key = (radius, tuple(color), tuple(map(id, frames)), tuple(animations.get('dims') or ()))
+        archetype = cls._shared.get(key)
+        if archetype is None: # The archetype keeps the frame lists alive, so their ids stay unique
+            archetype = cls._shared[key] = cls(radius, color, animations)
+        return archetype
+
+    def animation_bank(self):
+        """Flipped/flash frame variants for the player frames (prebuilt by run_loading_screen)."""
+        if self.bank is None:
+            self.bank = AnimationBank.of({'idle': self.idle_animation_frames, 'walk': self.walk_animation_frames,
+                                          'attack': self.attack_animation_frames, 'hurt': self.hurt_animation_frames,
+                                          'death': self.death_animation_frames})
+        return self.bank
+
 
 # --- Player Class ---
-class Player:
+class Player(Animated):
+    # Only per-player state lives on the instance; shared frames/size are on self.archetype
+    # Animation is just (current_animation_type, anim_start_ms); frames are derived from ANIMATION_CLOCK
+    __slots__ = ('archetype', 'x', 'y', 'player_name', 'level', 'expirience', 'player_id', 'speed', 'rect',
+                 'last_direction', 'health', 'max_health', 'defense', 'agility', 'in_fight', 'is_attacking',
+                 'facing_right', 'current_animation_type', 'anim_start_ms', 'is_dead', 'is_invulnerable', 'invulnerability_timer', 'last_known_move_vector',
+                 'attack_requested', 'interact_requested', 'instance_id', 'entity_id', 'portal_armed', 'collider_cache')
+
     def __init__(self, player_id, x, y, radius, speed, color, animations):
+        self.archetype = PlayerArchetype.shared(radius, color, animations)
         self.x = x
         self.y = y
         self.player_name = f"{"Play_Tester"}_{player_id}" # Simple name differentiation
         self.level = 0
         self.expirience = 0
         self.player_id = player_id
-        self.radius = radius
         self.speed = speed
-        self.color = color # Fallback color if sprite fails
         self.rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
         self.last_direction = pygame.math.Vector2(1, 0) # Default facing right
         self.health = combat_mech_stable.PLAYER_MAX_HEALTH
@@ -27,27 +78,34 @@ class Player:
         self.facing_right = True
 
         # --- Animation State ---
-        self.idle_animation_frames = animations.get('idle')
-        self.walk_animation_frames = animations.get('walk')
-        self.attack_animation_frames = animations.get('attack')
-        self.hurt_animation_frames = animations.get('hurt')
-        self.death_animation_frames = animations.get('death')
-        frame_dims = animations.get('dims')
-        self.frame_width, self.frame_height = frame_dims if frame_dims else (radius * 4, radius * 4)
-        self.current_frame_index = 0
-        self.last_animation_update = pygame.time.get_ticks()
-        self.current_animation_type = 'idle'
-        self.animation_finished = True
+        self.start_animation('idle')
         self.is_dead = False
         self.is_invulnerable = False
         self.invulnerability_timer = 0.0
-        self.invulnerability_duration = 0.5 # seconds
 
         # <<< NETWORK: State relevant for sending/receiving >>>
         self.last_known_move_vector = pygame.math.Vector2(0, 0)
         self.attack_requested = False # Flag input requests
         self.interact_requested = False
 
+        # Server: which world instance this player is in and whether portals may fire
+        self.instance_id = None
+        self.entity_id = None # Id in the instance's EntityRegistry (player_id stays the network key)
+        self.portal_armed = True
+        self.collider_cache = ColliderCache() # Server: static colliders around the player, re-queried only when needed
+
+    # Shared data reads through to the archetype (read-only)
+    radius = property(attrgetter('archetype.radius'))
+    color = property(attrgetter('archetype.color'))
+    idle_animation_frames = property(attrgetter('archetype.idle_animation_frames'))
+    walk_animation_frames = property(attrgetter('archetype.walk_animation_frames'))
+    attack_animation_frames = property(attrgetter('archetype.attack_animation_frames'))
+    hurt_animation_frames = property(attrgetter('archetype.hurt_animation_frames'))
+    death_animation_frames = property(attrgetter('archetype.death_animation_frames'))
+    frame_width = property(attrgetter('archetype.frame_width'))
+    frame_height = property(attrgetter('archetype.frame_height'))
+    invulnerability_duration = property(attrgetter('archetype.invulnerability_duration'))
+
     def handle_input(self):
         keys = pygame.key.get_pressed()
         move_vector = pygame.math.Vector2(0, 0)
@@ -80,12 +138,10 @@ class Player:
         # Note: attack_requested and interact_requested are set by KEYDOWN events in main loop now
         return move_vector
 
-    def update(self, move_vector, potential_colliders, dt, world_width, world_height):
+    def update(self, move_vector, potential_colliders, dt, world_width, world_height, wall_segments=()):
         """Updates player state based on movement, animation, and game rules.
            On the server, this is the authoritative update.
            On the client, this is less critical as state is overwritten by server."""
-        current_time_ms = pygame.time.get_ticks()
-
         # --- Invulnerability Timer ---
         if self.is_invulnerable:
             self.invulnerability_timer -= dt
@@ -113,87 +169,24 @@ class Player:
             if previous_animation_type == 'attack' and self.animation_finished:
                 self.is_attacking = False # Ensure this resets reliably
 
-        # Reset frame index if animation type changed
+        # Restart the clock if animation type changed (frames follow from the start time)
         if self.current_animation_type != previous_animation_type:
-            self.current_frame_index = 0
-            # Only non-looping animations truly 'finish' in this state machine sense
-            self.animation_finished = (self.current_animation_type in ['idle', 'walk'])
+            self.start_animation(self.current_animation_type)
             # Ensure is_attacking is true ONLY when attack animation starts
             self.is_attacking = (self.current_animation_type == 'attack')
 
-        # --- Select Current Animation Frames ---
-        current_frames = None
-        is_one_shot_animation = False
-        if self.current_animation_type == 'idle': current_frames = self.idle_animation_frames
-        elif self.current_animation_type == 'walk': current_frames = self.walk_animation_frames
-        elif self.current_animation_type == 'attack': current_frames = self.attack_animation_frames; is_one_shot_animation = True
-        elif self.current_animation_type == 'hurt': current_frames = self.hurt_animation_frames; is_one_shot_animation = True
-        elif self.current_animation_type == 'death': current_frames = self.death_animation_frames; is_one_shot_animation = True
-
-        # --- Animation Progression ---
-        if current_frames and not self.animation_finished:
-            anim_speed = assets.ANIMATION_SPEED_MS # Use constant from assets
-            if current_time_ms - self.last_animation_update > anim_speed:
-                next_frame_index = self.current_frame_index + 1
-                if next_frame_index >= len(current_frames):
-                    if is_one_shot_animation:
-                        self.animation_finished = True
-                        # Hold last frame for death, otherwise allow transition
-                        if self.current_animation_type == 'death':
-                             self.current_frame_index = len(current_frames) - 1
-                        # else: # Let state transition handle reset for hurt/attack
-                        #     self.current_frame_index = 0 # Or let state machine handle transition
-                    else: # Loop idle/walk
-                        self.current_frame_index = 0
-                else:
-                    self.current_frame_index = next_frame_index
-                self.last_animation_update = current_time_ms
-
         # --- Movement Lock and Speed Calculation ---
         # Player can only move if not dead and in an interruptible state (idle/walk)
         can_move = (self.current_animation_type in ['idle', 'walk']) and not self.is_dead
-        effective_speed = self.speed if can_move else 0
-        final_move_vector = move_vector * effective_speed
 
-        # --- Movement & Collision ---
-        if final_move_vector.length_squared() > 0:
-            prev_x, prev_y = self.x, self.y
+        # --- Movement & Collision (shared kinematic mover; no Vector2/Rect temporaries) ---
+        if can_move and (move_vector.x or move_vector.y):
             # Adjust speed based on delta time (scale by FPS target for consistency)
-            move_delta_x = final_move_vector.x * dt * 60
-            move_delta_y = final_move_vector.y * dt * 60
-
-            # Move X
-            self.x += move_delta_x
-            self.rect.centerx = int(round(self.x)) # Use round for better centering
-            for obstacle in potential_colliders:
-                if self.rect.colliderect(obstacle):
-                    if move_delta_x > 0: # Moving right
-                        self.rect.right = obstacle.left
-                    elif move_delta_x < 0: # Moving left
-                        self.rect.left = obstacle.right
-                    self.x = float(self.rect.centerx) # Update float pos from collision corrected rect
-                    break # Stop checking collisions for this axis
-
-            # Move Y
-            self.y += move_delta_y
-            self.rect.centery = int(round(self.y))
-            for obstacle in potential_colliders:
-                if self.rect.colliderect(obstacle):
-                    if move_delta_y > 0: # Moving down
-                        self.rect.bottom = obstacle.top
-                    elif move_delta_y < 0: # Moving up
-                        self.rect.top = obstacle.bottom
-                    self.y = float(self.rect.centery) # Update float pos from collision corrected rect
-                    break # Stop checking collisions for this axis
-
-            # Final position update from rect (redundant if updated above, but safe)
-            self.x = float(self.rect.centerx)
-            self.y = float(self.rect.centery)
+            step = self.speed * dt * 60
+            move_body(self, move_vector.x * step, move_vector.y * step, potential_colliders, wall_segments)
 
         # --- World Boundary Check ---
-        self.x = max(self.radius, min(self.x, world_width - self.radius))
-        self.y = max(self.radius, min(self.y, world_height - self.radius))
-        self.rect.center = (int(round(self.x)), int(round(self.y))) # Update rect final position
+        clamp_body(self, self.radius, world_width, world_height)
 
         # --- Passive Health Regeneration ---
         if self.in_fight and self.health < self.max_health and not self.is_dead:
@@ -202,41 +195,17 @@ class Player:
 
     def draw(self, surface, camera_apply_point_func, is_local_player):
         player_screen_pos = camera_apply_point_func(self.x, self.y)
-        current_frame_image = None
-        current_frames = None
-
-        # Select frame list based on current animation type
-        if self.current_animation_type == 'idle': current_frames = self.idle_animation_frames
-        elif self.current_animation_type == 'walk': current_frames = self.walk_animation_frames
-        elif self.current_animation_type == 'attack': current_frames = self.attack_animation_frames
-        elif self.current_animation_type == 'hurt': current_frames = self.hurt_animation_frames
-        elif self.current_animation_type == 'death': current_frames = self.death_animation_frames
-
-        # Get the specific frame, ensuring index is valid
-        if current_frames:
-            # Ensure index is within bounds, especially if animation finished mid-frame
-            safe_frame_index = min(self.current_frame_index, len(current_frames) - 1)
-            if safe_frame_index >= 0:
-                 current_frame_image = current_frames[safe_frame_index]
+        # Pick the prebuilt variant (facing, invulnerability flash) for the current frame
+        flash = self.is_invulnerable and flash_phase(ANIMATION_CLOCK.now_ms)
+        image_to_draw = self.archetype.animation_bank().frame(self.current_animation_type, self.current_frame_index,
+                                                              self.facing_right, flash)
 
         # Draw the frame if available
-        if current_frame_image:
-            image_to_draw = current_frame_image
-            # Flip image based on facing direction
-            if not self.facing_right:
-                image_to_draw = pygame.transform.flip(current_frame_image, True, False)
-
+        if image_to_draw:
             # Calculate top-left position for blitting (center sprite on player pos)
             draw_x = player_screen_pos[0] - self.frame_width // 2
             draw_y = player_screen_pos[1] - self.frame_height // 2
-
-            # --- Invulnerability Flash ---
-            if self.is_invulnerable:
-                # Simple flash: alternate drawing based on timer
-                if int(self.invulnerability_timer * 10) % 2 == 0: # Flash roughly 5 times/sec
-                    surface.blit(image_to_draw, (draw_x, draw_y))
-            else:
-                surface.blit(image_to_draw, (draw_x, draw_y))
+            surface.blit(image_to_draw, (draw_x, draw_y))
             
              # Draw Player Name/ID above head
             if ui_font:
@@ -269,22 +238,17 @@ class Player:
             actual_damage = 1
 
         self.health -= actual_damage
-        print(f"Player took {actual_damage} damage ({amount} base, {effective_defense*100:.0f}% DEF)! HP: {self.health}/{self.max_health}")
         self.in_fight = True # Reset regen timer
 
         if self.health <= 0:
             self.health = 0
             if not self.is_dead: # Trigger death sequence only once
-                print("Player Defeated!")
+                print(f"Player {self.player_id} defeated!")
                 self.is_dead = True
-                self.current_animation_type = 'death'
-                self.current_frame_index = 0
-                self.animation_finished = False # Start the death animation
+                self.start_animation('death')
         else:
             # Took damage but not dead, trigger hurt animation
-            self.current_animation_type = 'hurt'
-            self.current_frame_index = 0
-            self.animation_finished = False # Start the hurt animation
+            self.start_animation('hurt')
             self.is_invulnerable = True # Grant invulnerability
             self.invulnerability_timer = self.invulnerability_duration
         
@@ -295,9 +259,7 @@ class Player:
         # Also check not already attacking or dead
         if (self.current_animation_type in ['idle', 'walk'] and self.animation_finished and
                 not self.is_attacking and not self.is_dead):
-            self.current_animation_type = 'attack'
-            self.current_frame_index = 0
-            self.animation_finished = False
+            self.start_animation('attack')
             self.is_attacking = True # Set attack flag immediately
             print(f"Player {self.player_id} attack started") # Debug
             return True # Attack animation successfully started
@@ -315,8 +277,7 @@ class Player:
             'max_health': self.max_health, # Good to send for UI
             'facing_right': self.facing_right,
             'anim_type': self.current_animation_type,
-            'anim_frame': self.current_frame_index,
-            'anim_finished': self.animation_finished, # Important for one-shot anims
+            'anim_start': self.anim_start_ms, # Clients derive frame/finished from this and their synced clock
             'is_dead': self.is_dead,
             'is_invulnerable': self.is_invulnerable, # For client-side effects
             # Add other relevant states like defense, agility if they can change dynamically
@@ -340,22 +301,9 @@ class Player:
         self.agility = state_data.get('agility', self.agility)
         self.is_attacking = state_data.get('is_attacking', self.is_attacking)
 
-        # Update animation state carefully
-        new_anim_type = state_data.get('anim_type', self.current_animation_type)
-        new_anim_frame = state_data.get('anim_frame', self.current_frame_index)
-        new_anim_finished = state_data.get('anim_finished', self.animation_finished)
-
-        # Only reset frame index if the animation *type* changes
-        if new_anim_type != self.current_animation_type:
-            self.current_animation_type = new_anim_type
-            self.current_frame_index = new_anim_frame # Use server's frame index on change
-        elif self.current_animation_type == new_anim_type:
-             # If type is same, only update frame if server frame is different (avoids jitter)
-             # Maybe add a small tolerance or only update if server frame is ahead?
-             # Simple approach: always sync frame if type is same.
-             self.current_frame_index = new_anim_frame
-
-        self.animation_finished = new_anim_finished
+        # Animation is (type, start time); the frame is derived locally from ANIMATION_CLOCK
+        self.current_animation_type = state_data.get('anim_type', self.current_animation_type)
+        self.anim_start_ms = state_data.get('anim_start', self.anim_start_ms)
 
         # Update the rect based on new position
         self.rect.center = (int(self.x), int(self.y))
\ No newline at end of file
@@ -0,0 +1,186 @@
+import math
+import random
+import pygame
+
+from .stat_constants import *
+from world_structures.world_constants import TILE_FLOOR, DUNGEON_TILE_SIZE
+
+# Spawn cell zone codes (index into SPAWN_ZONES; 0 = no spawning here)
+SPAWN_ZONES = (None, 'plains', 'forest', 'dungeon')
+ZONE_CODES = {name: code for code, name in enumerate(SPAWN_ZONES) if name}
+
+
+# --- Precomputed Spawn Cells ---
+class SpawnCells:
+    """
+    The world split into `cell_size` cells, each tagged with the spawn zone it belongs to
+    (0 where enemies must not spawn: inside the kingdom, blocked by a collider, dungeon
+    walls). Built once per instance; spawning then just picks cells.
+    """
+    def __init__(self, width, height, cell_size):
+        self.cell_size = cell_size
+        self.cols = max(1, int(math.ceil(width / cell_size)))
+        self.rows = max(1, int(math.ceil(height / cell_size)))
+        self.zones = bytearray(self.cols * self.rows)
+        self.valid_cells = [] # Flat indices of every spawnable cell (uniform sampling)
+
+    @classmethod
+    def from_overworld(cls, world_data, collision_index, width, height, cell_size=ENEMY_SPAWN_CELL_SIZE):
+        """Plains and forest cells; the kingdom and cells whose center is blocked are excluded."""
+        cells = cls(width, height, cell_size)
+        centers = [((i % cells.cols) * cell_size + cell_size // 2, (i // cells.cols) * cell_size + cell_size // 2)
+                   for i in range(cells.cols * cells.rows)]
+        xs = [c[0] for c in centers]; ys = [c[1] for c in centers]
+        kingdom_zone = world_data.get("kingdom_zone"); forest_zone = world_data.get("forest_zone")
+        in_kingdom = kingdom_zone.points_inside(xs, ys) if kingdom_zone else [False] * len(centers)
+        in_forest = forest_zone.points_inside(xs, ys) if forest_zone else [False] * len(centers)
+
+        open_cells = [i for i in range(len(centers)) if not in_kingdom[i]]
+        if collision_index is not None:
+            clearance = ENEMY_SPAWN_CLEARANCE
+            probes = [pygame.Rect(centers[i][0] - clearance // 2, centers[i][1] - clearance // 2, clearance, clearance)
+                      for i in open_cells]
+            if hasattr(collision_index, 'query_batch'): hits = collision_index.query_batch(probes)
+            else: hits = [collision_index.query(probe) for probe in probes]
+            open_cells = [i for i, blocked in zip(open_cells, hits) if not blocked]
+        for i in open_cells:
+            cells.zones[i] = ZONE_CODES['forest'] if in_forest[i] else ZONE_CODES['plains']
+        cells.valid_cells = open_cells
+        return cells
+
+    @classmethod
+    def from_dungeon(cls, world_data, tile_size=DUNGEON_TILE_SIZE):
+        """One cell per dungeon tile: floor tiles inside rooms."""
+        grid = world_data.get("dungeon_grid") or []
+        rows = len(grid); cols = len(grid[0]) if rows else 0
+        cells = cls(cols * tile_size, rows * tile_size, tile_size)
+        dungeon_code = ZONE_CODES['dungeon']
+        for room in world_data.get("dungeon_rooms_grid", []):
+            for ty in range(max(0, room.top), min(rows, room.bottom)):
+                row = grid[ty]
+                for tx in range(max(0, room.left), min(cols, room.right)):
+                    if row[tx] == TILE_FLOOR: cells.zones[ty * cells.cols + tx] = dungeon_code
+        cells.valid_cells = [i for i, code in enumerate(cells.zones) if code]
+        return cells
+
+    # --- Queries ---
+    def zone_at(self, x, y):
+        """Spawn zone name at (x, y), or None where spawning is not allowed."""
+        cx = int(x // self.cell_size); cy = int(y // self.cell_size)
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return SPAWN_ZONES[self.zones[cy * self.cols + cx]]
+        return None
+
+    def cell_point(self, index):
+        """A spawn point near the center of cell `index` (jittered a little so spawns do not stack)."""
+        jitter = max(0, (ENEMY_SPAWN_CLEARANCE - 24) // 2) if self.cell_size > ENEMY_SPAWN_CLEARANCE else 0
+        x = (index % self.cols) * self.cell_size + self.cell_size // 2 + random.randint(-jitter, jitter)
+        y = (index // self.cols) * self.cell_size + self.cell_size // 2 + random.randint(-jitter, jitter)
+        return x, y
+
+    def sample(self, count):
+        """`count` spawn points (x, y, zone) spread uniformly over the valid cells."""
+        if not self.valid_cells: return []
+        points = []
+        for index in random.choices(self.valid_cells, k=count):
+            x, y = self.cell_point(index)
+            points.append((x, y, SPAWN_ZONES[self.zones[index]]))
+        return points
+
+    def sample_ring(self, cx, cy, inner, outer, attempts=8):
+        """A spawn point (x, y, zone) between `inner` and `outer` from (cx, cy), or None."""
+        inner_sq = inner * inner
+        for _ in range(attempts):
+            angle = random.uniform(0, 2 * math.pi)
+            dist = math.sqrt(random.uniform(inner_sq, outer * outer)) # Uniform over the ring's area
+            x = cx + dist * math.cos(angle); y = cy + dist * math.sin(angle)
+            gx = int(x // self.cell_size); gy = int(y // self.cell_size)
+            if 0 <= gx < self.cols and 0 <= gy < self.rows:
+                index = gy * self.cols + gx
+                code = self.zones[index]
+                if code:
+                    px, py = self.cell_point(index)
+                    return px, py, SPAWN_ZONES[code]
+        return None
+
+
+def choose_enemy_type(zone, available_types):
+    """Weighted pick from the zone's spawn table (types the manager cannot build are skipped)."""
+    table = [(name, weight) for name, weight in ENEMY_SPAWN_TABLES.get(zone, ()) if name in available_types]
+    if not table: return None
+    return random.choices([name for name, _ in table], weights=[weight for _, weight in table])[0]
+
+
+# --- Population Director ---
+class PopulationDirector:
+    """
+    Keeps a target density of live enemies in a ring around every player (out of view,
+    ENEMY_RING_INNER..ENEMY_RING_OUTER) by spawning from the zone's spawn table at
+    precomputed spawn cells, and removes the enemies it spawned once they are idle and
+    far from everyone. Runs every ENEMY_DIRECTOR_INTERVAL seconds with a spawn budget,
+    and never pushes the live count past ENEMY_MAX_LIVE.
+    """
+    def __init__(self, spawn_cells, interval=ENEMY_DIRECTOR_INTERVAL, spawn_budget=ENEMY_DIRECTOR_SPAWN_BUDGET,
+                 ring_inner=ENEMY_RING_INNER, ring_outer=ENEMY_RING_OUTER, density=ENEMY_RING_DENSITY,
+                 despawn_distance=ENEMY_DESPAWN_DISTANCE, max_live=ENEMY_MAX_LIVE):
+        self.spawn_cells = spawn_cells
+        self.interval = interval
+        self.spawn_budget = spawn_budget
+        self.ring_inner = ring_inner
+        self.ring_outer = ring_outer
+        self.max_live = max_live
+        self.despawn_distance = despawn_distance
+        ring_area = math.pi * (ring_outer * ring_outer - ring_inner * ring_inner)
+        self.ring_target = int(round(density * ring_area / 1e6))
+        self.timer = 0.0
+        self.spawned = set() # Live enemies this director created (the only ones it despawns)
+
+        self.counts = {} # Spawned/despawned in the last pass (read by CombatManager for the tick profiler)
+
+    def forget(self, enemy):
+        self.spawned.discard(enemy)
+
+    def update(self, manager, players, dt):
+        """Runs a director pass every `interval` seconds. Returns {'director_spawned', 'director_despawned'}."""
+        self.timer -= dt
+        if self.timer > 0: return {}
+        self.timer = self.interval
+        players = [p for p in players if p is not None]
+        if not players: return {}
+
+        # --- Despawn: idle director enemies far from every player ---
+        despawn_sq = self.despawn_distance * self.despawn_distance
+        far_idle = [enemy for enemy in self.spawned
+                    if enemy.state in ('idle', 'wander') and
+                    all((enemy.x - p.x) ** 2 + (enemy.y - p.y) ** 2 > despawn_sq for p in players)]
+        manager.remove_enemies(far_idle)
+
+        # --- Spawn: top up each player's ring ---
+        spawned = 0
+        inner_sq = self.ring_inner * self.ring_inner; outer_sq = self.ring_outer * self.ring_outer
+        for player in players:
+            if spawned >= self.spawn_budget or len(manager.enemies) >= self.max_live: break
+            px, py = player.x, player.y
+            in_ring = 0
+            for enemy in manager.enemy_grid.query_cells(px - self.ring_outer, py - self.ring_outer,
+                                                        px + self.ring_outer, py + self.ring_outer):
+                dist_sq = (enemy.x - px) ** 2 + (enemy.y - py) ** 2
+                if inner_sq <= dist_sq <= outer_sq and not enemy.is_dead: in_ring += 1
+            for _ in range(self.ring_target - in_ring):
+                if spawned >= self.spawn_budget or len(manager.enemies) >= self.max_live: break
+                point = self.spawn_cells.sample_ring(px, py, self.ring_inner, self.ring_outer)
+                if point is None: continue
+                x, y, zone = point
+                if random.random() >= ENEMY_ZONE_SPAWN_WEIGHT.get(zone, 1.0): continue # Sparser zones
+                # Never pop into view of another player
+                if any((x - p.x) ** 2 + (y - p.y) ** 2 < inner_sq for p in players): continue
+                enemy_type_name = choose_enemy_type(zone, manager.enemy_classes)
+                enemy = manager.create_enemy(enemy_type_name, x, y) if enemy_type_name else None
+                if enemy is None: continue
+                enemy.spawned_by_director = True
+                manager.add_enemy(enemy)
+                self.spawned.add(enemy)
+                spawned += 1
+
+        self.counts = {'director_spawned': spawned, 'director_despawned': len(far_idle)}
+        return self.counts
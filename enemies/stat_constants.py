@@ -38,6 +38,7 @@ PLAYER_HEALTH_REGEN = 0.05 # Health per frame (adjust for balance)
 PLAYER_ATTACK_RANGE = 45 # Close to enemy range
 PLAYER_ATTACK_POWER = 15
 PLAYER_ATTACK_COOLDOWN = 0.8 # Player can attack faster
+MELEE_VECTORIZE_MIN = 128 # Candidates a swing needs before its hit/dodge test runs as one NumPy pass (smaller crowds loop faster)
 
 # --- Sword Orc Specific Constants ---
 SWORD_ORC_COUNT = 600 # Keep this here if it's a default spawn count maybe? Or move to spawner logic.
@@ -60,9 +61,38 @@ SWORD_ORC_BASE_AGILITY = 0.05     # 5% dodge chance
 ENEMY_MAX_DEFENSE = 0.90 # Cap
 ENEMY_MAX_AGILITY = 0.90 # Cap # Adjusted to match the later definition in original
 ENEMY_INVULNERABILITY_DURATION = 0.3 # Seconds of invulnerability after getting hit
+ENEMY_WALL_STEER_DISTANCE = 80 # Enemies closer than this to the kingdom wall slide along it instead of into it
+# AI level of detail (per-object backend): full updates near players, staggered ones further out, timers only beyond
+ENEMY_LOD_ENABLED = True
+ENEMY_LOD_NEAR_DISTANCE = 900 # Roughly the view distance (half the screen diagonal) plus margin: updated every tick
+ENEMY_LOD_MID_DISTANCE = 2200 # Updated every ENEMY_LOD_MID_INTERVAL ticks with the accumulated dt
+ENEMY_LOD_MID_INTERVAL = 4
+ENEMY_LOD_FAR_INTERVAL = 30 # Beyond mid distance only timers advance, in buckets of this many ticks
+# Dormant activation chunks: enemies are only instantiated while a player is within the activation radius
+ENEMY_DORMANT_CHUNKS_ENABLED = True
+ENEMY_CHUNK_SIZE = 1024 # Side of an activation chunk (px); live enemies are filed by their current chunk, dormant records by spawn point
+ENEMY_ACTIVATION_RADIUS = 2600 # Beyond ENEMY_LOD_MID_DISTANCE so enemies exist before they need regular updates
+ENEMY_SLEEP_GRACE = 10.0 # Seconds a chunk stays awake after the last player left its range
+ENEMY_SIM_BACKEND = 'objects' # 'objects' (Enemy.update per enemy) or 'soa' (EnemySoA NumPy arrays, needs numpy)
 
-# Placeholder Dungeon Tile Constants (used in CombatManager spawn) - Should come from dungeon/world module
-TILE_FLOOR = 1
+# --- Population Director (spawning/despawning around players) ---
+ENEMY_DIRECTOR_ENABLED = True
+ENEMY_SPAWN_CELL_SIZE = 128 # Valid spawn points are precomputed per cell of this size
+ENEMY_SPAWN_CLEARANCE = 48 # A cell is valid if a box this size around its center touches no collider
+# Zone -> ((enemy type, weight), ...); zones: 'plains', 'forest' (overworld, never inside the kingdom), 'dungeon'
+ENEMY_SPAWN_TABLES = {
+    'plains': (("Sword_Orc", 1.0),),
+    'forest': (("Sword_Orc", 1.0),),
+    'dungeon': (("Sword_Orc", 1.0),),
+}
+ENEMY_ZONE_SPAWN_WEIGHT = {'plains': 0.5, 'forest': 1.0, 'dungeon': 1.0} # Chance a ring spawn landing in the zone is kept
+ENEMY_RING_INNER = 1000 # Ring spawns happen out of view...
+ENEMY_RING_OUTER = 2200 # ...but close enough to be met soon
+ENEMY_RING_DENSITY = 1.5 # Live enemies wanted per million px^2 of ring (600 orcs over the 20000^2 world is ~1.5)
+ENEMY_DIRECTOR_INTERVAL = 1.0 # Seconds between director passes
+ENEMY_DIRECTOR_SPAWN_BUDGET = 8 # Most enemies spawned per pass (all players together)
+ENEMY_DESPAWN_DISTANCE = 3000 # Director-spawned enemies this far from every player are removed once idle
+ENEMY_MAX_LIVE = 1500 # The director never spawns past this many live enemies
 # --- Add constants for other enemy types below as needed ---
 # Example:
 # GOBLIN_BASE_HEALTH = 30
@@ -5,6 +5,8 @@ import enemies.stat_constants as const
 
 # --- Sword Orc Specific Class ---
 class Sword_Orc(Enemy):
+    __slots__ = () # Per-instance state is declared on Enemy; per-type data lives on the archetype
+
     def __init__(self, x, y, idle_frames, walk_frames, attack_frames, hurt_frames, death_frames, frame_dims):
         # Define specific properties for Sword_Orc here
         sword_orc_attack_hit_frame = 3 # Example: Hit frame index specific to Sword Orc attack animation
@@ -31,10 +33,8 @@ class Sword_Orc(Enemy):
             name="Sword_Orc",
             attack_hit_frame_index=sword_orc_attack_hit_frame
         )
-        # Sword_Orc specific attributes or overrides can go here
-        # Example: maybe different wander radius or chase timeout overrides
-        # self.wander_radius = const.SWORD_ORC_WANDER_RADIUS # Already set via constant lookup in base, but could override
-        # self.chase_timeout = const.SWORD_ORC_CHASE_TIMEOUT # Same
+        # Sword_Orc specific per-instance state would need its own __slots__ entries;
+        # per-type overrides (e.g. wander radius, chase timeout) belong on the archetype
 
 
 # --- Add other enemy types here ---
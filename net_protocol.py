@@ -0,0 +1,96 @@
+import socket
+import pickle
+
+from NETconfig import HEADER_SIZE
+
+# --- Network Helper Functions ---
+# Every message is a pickled object prefixed with a fixed-size ASCII length header.
+# Shared by the game (open_world.py) and the snapshot relay (relay.py).
+
+def pack_message(data):
+    """Pickles data and prefixes it with the fixed-size length header."""
+    # Serialize the data object into bytes
+    pickled_data = pickle.dumps(data)
+    # Create a fixed-size header containing the length of the data
+    header = f"{len(pickled_data):<{HEADER_SIZE}}".encode('utf-8')
+    return header + pickled_data
+
+def send_data(sock, data):
+    """Sends pickled data prefixed with its size."""
+    try:
+        # Send the header followed by the pickled data
+        sock.sendall(pack_message(data))
+        return True
+    except (socket.error, pickle.PicklingError, BrokenPipeError, ConnectionResetError) as e:
+        # Handle common network sending errors
+        print(f"NETWORK SEND ERROR: {e}")
+        return False # Indicate failure
+
+def _recv_exact(sock, length):
+    """Reads exactly `length` bytes, or returns None if the connection closes first."""
+    buffer = b''
+    while len(buffer) < length:
+        # Receive in chunks to handle large data packets
+        chunk = sock.recv(min(4096, length - len(buffer)))
+        if not chunk:
+            return None # Connection closed
+        buffer += chunk
+    return buffer
+
+def receive_frame(sock):
+    """
+    Receives one complete framed message WITHOUT unpickling it.
+    Returns the full frame (header + payload bytes) so it can be forwarded as-is,
+    or None on disconnect/error.
+    """
+    try:
+        # 1. Receive the header (fixed size)
+        header = _recv_exact(sock, HEADER_SIZE)
+        if not header:
+            print("NETWORK RECV ERROR: Connection closed (header).")
+            return None # Connection closed
+        try:
+            # Decode the header to determine the expected message length
+            expected_msg_len = int(header.decode('utf-8').strip())
+        except ValueError:
+            print(f"NETWORK RECV ERROR: Invalid header received: {header}")
+            return None
+
+        # 2. Receive the main message chunk by chunk
+        payload = _recv_exact(sock, expected_msg_len)
+        if payload is None:
+            print("NETWORK RECV ERROR: Connection closed (data).")
+            return None # Connection closed
+        return header + payload
+
+    except socket.timeout:
+        print("NETWORK RECV ERROR: Socket timeout.")
+        return None # Indicate timeout
+    except ConnectionResetError:
+        print("NETWORK RECV ERROR: Connection reset by peer.")
+        return None
+    except socket.error as e:
+        print(f"NETWORK RECV ERROR: Socket error: {e}")
+        return None
+    except Exception as e:
+         print(f"NETWORK RECV ERROR: Unexpected error in receive_frame: {e}")
+         return None
+
+def unpack_frame(frame):
+    """Unpickles a frame returned by receive_frame (None on failure)."""
+    try:
+        # Deserialize the bytes back into a Python object
+        return pickle.loads(frame[HEADER_SIZE:])
+    except pickle.UnpicklingError as e:
+        print(f"NETWORK RECV ERROR: Failed to unpickle data: {e}")
+        return None
+    except Exception as e:
+        print(f"NETWORK RECV ERROR: Unexpected error during unpickle: {e}")
+        return None
+
+def receive_data(sock):
+    """Receives data prefixed with its size."""
+    frame = receive_frame(sock)
+    if frame is None:
+        return None
+    return unpack_frame(frame)
@@ -1,6 +1,13 @@
 import pygame
 import random
 import math
+from operator import attrgetter
+
+from world_structures.spatial_hash import SpatialHash
+from world_structures.collider_cache import ColliderCache
+from world_structures.kinematics import move_body
+from world_structures.entity_registry import EntityRegistry
+from world_structures.world_constants import WORLD_WIDTH, WORLD_HEIGHT
 
 # Fallback values if modules not found directly (e.g., running standalone)
 SCREEN_WIDTH = 800
@@ -13,6 +20,8 @@ NPC_SPEED = 1.5
 NPC_WANDER_RADIUS = 150
 NPC_WANDER_TIME_MIN = 3.0
 NPC_WANDER_TIME_MAX = 7.0
+NPC_TRAVEL_CHANCE = 0.1 # Chance an idle NPC takes a long HPA* trip instead of wandering (needs a path planner)
+NPC_TRAVEL_DISTANCE = 1500 # How far from home (px) a trip goes before the NPC heads back
 NPC_INTERACTION_RANGE = 50 # How close player needs to be to interact
 NPC_INTERACTION_RANGE_SQ = NPC_INTERACTION_RANGE * NPC_INTERACTION_RANGE # Squared for efficiency
 NPC_DIALOGUE_DURATION = 4.0 # Seconds each line stays up
@@ -35,26 +44,53 @@ DIALOGUE_BOX_WIDTH_RATIO = 0.7 # Percentage of screen width
 DIALOGUE_BOX_HEIGHT = 100 # Fixed height for simplicity
 DIALOGUE_BOX_Y_POS = SCREEN_HEIGHT - DIALOGUE_BOX_HEIGHT - 20 # Position near bottom
 
+# --- Per-Type Data ---
+class NPCArchetype:
+    """Size, speed and color shared by every NPC of one type (one instance per type, see shared())."""
+    __slots__ = ('npc_type', 'radius', 'speed', 'color')
+    _shared = {} # {npc_type: NPCArchetype}
+
+    def __init__(self, npc_type, radius=NPC_RADIUS, speed=NPC_SPEED, color=NPC_COLOR):
+        self.npc_type = npc_type # e.g., "Villager", "Merchant"
+        self.radius = radius; self.speed = speed; self.color = color
+
+    @classmethod
+    def shared(cls, npc_type):
+        archetype = cls._shared.get(npc_type)
+        if archetype is None: archetype = cls._shared[npc_type] = cls(npc_type)
+        return archetype
+
+
+def default_dialogue(name):
+    """Greeting used when an NPC is created without dialogue lines."""
+    return [f"Hello there, traveler! I'm {name}."]
+
+
 # --- NPC Class ---
 class NPC:
-    # <<< NETWORK: Add class counter for unique IDs >>>
-    _npc_id_counter = 0
+    # Only per-NPC state lives on the instance; per-type data is on self.archetype
+    __slots__ = ('id', 'archetype', 'x', 'y', 'spawn_x', 'spawn_y', 'rect', 'collider_cache', 'name', 'dialogue',
+                 'state', 'target_position', 'travel_destination', 'travel_request', 'wander_timer',
+                 'facing_direction', 'dialogue_active', 'current_dialogue_index', 'dialogue_timer',
+                 'talking_to_player_id')
 
     def __init__(self, x, y, name="Villager", npc_type="Villager", dialogue=None):
-        # <<< NETWORK: Assign unique ID >>>
-        self.id = NPC._npc_id_counter
-        NPC._npc_id_counter += 1
-        self.npc_type = npc_type # Store type (e.g., "Villager", "Merchant")
+        # <<< NETWORK: Unique ID >>> Assigned by the server's EntityRegistry (NPCManager.add_npc); clients copy the server's
+        self.id = None
+        self.archetype = NPCArchetype.shared(npc_type)
 
         self.x = x; self.y = y; self.spawn_x = x; self.spawn_y = y
-        self.radius = NPC_RADIUS; self.speed = NPC_SPEED; self.color = NPC_COLOR
-        self.rect = pygame.Rect(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
-        self.name = f"{name} #{self.id}" # Add ID to name for uniqueness
-        self.dialogue = dialogue if dialogue else [f"Hello there, traveler! I'm {self.name}."]
+        radius = self.archetype.radius
+        self.rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
+        self.collider_cache = ColliderCache() # (Server) Static colliders around the NPC
+        self.name = name # NPCManager.add_npc appends the ID for uniqueness
+        self.dialogue = dialogue if dialogue else default_dialogue(name) # Rebuilt by add_npc once the name is final
 
         # State and Movement
-        self.state = 'idle' # idle, wander, talking
+        self.state = 'idle' # idle, wander, travel, talking
         self.target_position = None
+        self.travel_destination = None # (Server) Where a 'travel' trip ends
+        self.travel_request = None # (Server) PathRequest for the trip, if a planner was available
         self.wander_timer = random.uniform(NPC_WANDER_TIME_MIN, NPC_WANDER_TIME_MAX)
         self.facing_direction = pygame.math.Vector2(0, 1) # Start facing down
 
@@ -65,7 +101,13 @@ class NPC:
         # <<< NETWORK: Store ID of interacting player (server-side use primarily) >>>
         self.talking_to_player_id = None
 
-    def update_behavior(self, dt, colliders_nearby):
+    # Per-type data reads through to the archetype (read-only)
+    npc_type = property(attrgetter('archetype.npc_type'))
+    radius = property(attrgetter('archetype.radius'))
+    speed = property(attrgetter('archetype.speed'))
+    color = property(attrgetter('archetype.color'))
+
+    def update_behavior(self, dt, colliders_nearby, wall_segments=(), path_planner=None):
         """ (Server Only) Updates NPC state machine and movement based on behavior. """
         if self.state == 'talking':
             # Don't wander or move while talking
@@ -76,7 +118,13 @@ class NPC:
 
         # --- State Transitions ---
         if self.state == 'idle':
-            if self.wander_timer <= 0:
+            if self.wander_timer <= 0 and path_planner is not None and random.random() < NPC_TRAVEL_CHANCE:
+                # Time for a trip: a distant point, out and back along HPA* paths
+                angle = random.uniform(0, 2 * math.pi)
+                dest_x = max(self.radius, min(self.spawn_x + math.cos(angle) * NPC_TRAVEL_DISTANCE, WORLD_WIDTH - self.radius))
+                dest_y = max(self.radius, min(self.spawn_y + math.sin(angle) * NPC_TRAVEL_DISTANCE, WORLD_HEIGHT - self.radius))
+                self.travel_to(dest_x, dest_y, path_planner)
+            elif self.wander_timer <= 0:
                 # Time to wander
                 angle = random.uniform(0, 2 * math.pi)
                 dist = random.uniform(0, NPC_WANDER_RADIUS)
@@ -92,8 +140,8 @@ class NPC:
 
         elif self.state == 'wander':
             if self.target_position:
-                direction = self.target_position - pygame.math.Vector2(self.x, self.y)
-                dist_to_target = direction.length()
+                to_x = self.target_position[0] - self.x; to_y = self.target_position[1] - self.y
+                dist_to_target = math.hypot(to_x, to_y)
 
                 if dist_to_target < self.speed * dt * 60 * 0.5 : # Close enough to target
                     # print(f"NPC {self.id} reached wander target.") # Debug
@@ -101,43 +149,53 @@ class NPC:
                     self.target_position = None
                     self.wander_timer = random.uniform(NPC_WANDER_TIME_MIN, NPC_WANDER_TIME_MAX)
                 else:
-                    # Move towards target
-                    move_vector = direction.normalize() * self.speed * dt * 60 # Use FPS scaling
-                    self.facing_direction = direction.normalize() # Update facing direction
-
-                    # --- Basic Collision Avoidance (Server Only) ---
-                    potential_move_x = self.x + move_vector.x
-                    potential_move_y = self.y + move_vector.y
-                    temp_rect_x = self.rect.copy()
-                    temp_rect_x.centerx = int(potential_move_x)
-                    collided_x = False
-                    for obs in colliders_nearby:
-                         if temp_rect_x.colliderect(obs):
-                              collided_x = True; break
-
-                    temp_rect_y = self.rect.copy()
-                    temp_rect_y.centery = int(potential_move_y)
-                    collided_y = False
-                    for obs in colliders_nearby:
-                         if temp_rect_y.colliderect(obs):
-                              collided_y = True; break
-
-                    # Apply movement only if no collision on that axis
-                    if not collided_x: self.x = potential_move_x
-                    if not collided_y: self.y = potential_move_y
-
-                    self.rect.center = (int(self.x), int(self.y))
+                    self._move_towards(to_x, to_y, dt, colliders_nearby, wall_segments)
 
             else: # No target position while wandering? Go idle.
                 self.state = 'idle'
                 self.wander_timer = random.uniform(NPC_WANDER_TIME_MIN, NPC_WANDER_TIME_MAX)
 
+        elif self.state == 'travel':
+            # Long trip (see travel_to): follow the HPA* path once the planner has answered
+            dest_x, dest_y = self.travel_destination
+            heading_home = (dest_x, dest_y) == (self.spawn_x, self.spawn_y)
+            failed = self.travel_request is not None and self.travel_request.status == 'failed'
+            if heading_home and (failed or math.hypot(dest_x - self.x, dest_y - self.y) < self.speed * dt * 60 * 0.5):
+                # Back home (or no way back): resume wandering around spawn
+                self.state = 'idle'; self.travel_request = None; self.travel_destination = None
+                self.wander_timer = random.uniform(NPC_WANDER_TIME_MIN, NPC_WANDER_TIME_MAX)
+            elif failed or math.hypot(dest_x - self.x, dest_y - self.y) < self.speed * dt * 60 * 0.5:
+                # Arrived (or no way there): head back home
+                self.travel_to(self.spawn_x, self.spawn_y, path_planner)
+            else:
+                step_x, step_y = dest_x, dest_y
+                if self.travel_request is not None and self.travel_request.status == 'done':
+                    step_x, step_y = self.travel_request.path.next_point(self.x, self.y)
+                to_x = step_x - self.x; to_y = step_y - self.y
+                if to_x * to_x + to_y * to_y > 1e-6:
+                    self._move_towards(to_x, to_y, dt, colliders_nearby, wall_segments)
+
         # World boundary clamp (use effective world dimensions from main game)
         # self.x = max(self.radius, min(self.x, world_width - self.radius))
         # self.y = max(self.radius, min(self.y, world_height - self.radius))
         # self.rect.center = (int(self.x), int(self.y))
 
 
+    def _move_towards(self, to_x, to_y, dt, colliders_nearby, wall_segments=()):
+        """Steps along (to_x, to_y) (any non-zero offset) with the shared kinematic mover."""
+        dist = math.hypot(to_x, to_y)
+        if dist == 0: return
+        self.facing_direction.update(to_x / dist, to_y / dist) # Update facing direction (in place)
+        step = self.speed * dt * 60 / dist # Use FPS scaling
+        move_body(self, to_x * step, to_y * step, colliders_nearby, wall_segments)
+
+    def travel_to(self, x, y, path_planner=None):
+        """(Server Only) Walks to a distant point, along an HPA* path when a planner is available."""
+        if path_planner is not None and self.travel_request is not None: path_planner.cancel(self.travel_request)
+        self.travel_destination = (x, y)
+        self.travel_request = path_planner.request(self.x, self.y, x, y) if path_planner is not None else None
+        self.state = 'travel'
+
     def update_dialogue(self, dt):
         """(Server Only) Manages the progression and timeout of dialogue."""
         if self.dialogue_active:
@@ -149,7 +207,7 @@ class NPC:
                     # End of dialogue
                     self.dialogue_active = False
                     self.current_dialogue_index = 0
-                    self.state = 'idle' # Revert state after talking
+                    self.state = 'travel' if self.travel_destination is not None else 'idle' # Resume a trip, if one was under way
                     self.talking_to_player_id = None # Clear interacting player
                     # print(f"NPC {self.id} finished dialogue.") # Debug
                 else:
@@ -233,7 +291,7 @@ class NPC:
 # --- NPC Manager Class (Modified for Networking) ---
 class NPCManager:
     # <<< NETWORK: Added network_players and is_host >>>
-    def __init__(self, world_data, screen_height, screen_width, network_players, is_host):
+    def __init__(self, world_data, screen_height, screen_width, network_players, is_host, registry=None):
         self.world_data = world_data # Might contain spawn locations, etc.
         self.screen_height = screen_height
         self.screen_width = screen_width
@@ -242,12 +300,34 @@ class NPCManager:
 
         # <<< NETWORK: Use different collections for host/client >>>
         if self.is_host:
-            self.npcs = [] # Server: Authoritative list of NPC objects
-            NPC._npc_id_counter = 0 # Reset counter on server start
+            # Server: Authoritative NPCs live in the registry's dense 'npc' list (shared id space with players/enemies)
+            self.registry = registry if registry is not None else EntityRegistry()
+            self.npc_grid = SpatialHash() # Server: NPCs by cell, for interaction lookups
         else:
             self.client_npcs = {} # Client: Dictionary {id: npc_obj} synchronized from server
 
         self.active_dialogue_npc_id = None # Track which NPC's dialogue is showing (globally for now)
+        self.last_update_counts = {} # Per-tick counters from the last update() call (read by the server tick profiler)
+        self.path_planner = None # (Server) HPA* PathPlanner for long NPC trips, set by the overworld instance
+
+    @property
+    def npcs(self):
+        """(Server) Packed list of live NPCs (owned by the registry)."""
+        return self.registry.entities('npc')
+
+    def add_npc(self, npc):
+        """(Server Only) Registers an NPC (assigning its id) and adds it to the spatial hash."""
+        npc.id = self.registry.add(npc, 'npc')
+        uses_default_dialogue = npc.dialogue == default_dialogue(npc.name)
+        npc.name = f"{npc.name} #{npc.id}" # Add ID to name for uniqueness
+        if uses_default_dialogue: npc.dialogue = default_dialogue(npc.name) # Greet with the final name
+        self.npc_grid.insert(npc, npc.x, npc.y)
+
+    def remove_npc(self, npc):
+        """(Server Only) Unregisters an NPC and removes it from the spatial hash (O(1))."""
+        if self.registry.remove(npc.id) is None: return
+        self.npc_grid.remove(npc)
+        if self.active_dialogue_npc_id == npc.id: self.active_dialogue_npc_id = None
 
 
     def spawn_npcs_in_overworld(self, kingdom_center_x, kingdom_center_y, is_point_in_polygon_func):
@@ -283,7 +363,7 @@ class NPCManager:
 
             npc_dialogue = random.choice(dialogue_options)
             new_npc = NPC(spawn_x, spawn_y, dialogue=npc_dialogue)
-            self.npcs.append(new_npc)
+            self.add_npc(new_npc)
             spawned_count += 1
             print(f"[SERVER] Spawned NPC {new_npc.id} at ({int(spawn_x)}, {int(spawn_y)})")
 
@@ -302,14 +382,17 @@ class NPCManager:
         """(Server Only) Updates behavior and dialogue for all managed NPCs."""
         if not self.is_host: return # Only server updates logic
 
+        self.last_update_counts = {'npcs_updated': len(self.npcs), 'collider_queries': 0}
         for npc in self.npcs:
             # Get colliders near the NPC for its behavior update
-            colliders_nearby = []
+            colliders_nearby = []; wall_segments = ()
             if collision_quadtree:
                  query_range = npc.rect.inflate(npc.speed * 2 + 32, npc.speed * 2 + 32)
-                 colliders_nearby = collision_quadtree.query(query_range)
+                 colliders_nearby, wall_segments, refreshed = npc.collider_cache.query(collision_quadtree, query_range)
+                 if refreshed: self.last_update_counts['collider_queries'] += 1
 
-            npc.update_behavior(dt, colliders_nearby)
+            npc.update_behavior(dt, colliders_nearby, wall_segments, self.path_planner)
+            self.npc_grid.move(npc, npc.x, npc.y)
             npc.update_dialogue(dt)
 
             # Check if this NPC's dialogue should be the active one shown
@@ -327,7 +410,7 @@ class NPCManager:
         closest_npc = None
         min_dist_sq = NPC_INTERACTION_RANGE_SQ # Use squared distance
 
-        for npc in self.npcs:
+        for npc in self.npc_grid.query_radius(player.x, player.y, NPC_INTERACTION_RANGE):
             dist_sq = (npc.x - player.x)**2 + (npc.y - player.y)**2
             if dist_sq < min_dist_sq:
                 min_dist_sq = dist_sq
@@ -10,6 +10,7 @@ import select
 
 from world_structures import drawing
 from NETconfig import *
+from net_protocol import pack_message, send_data, receive_data
 
 # Import other game modules
 import world_struct as world_struct_stable
@@ -21,6 +22,9 @@ import open_world_dir.loading as loading
 import enemies.player as player_module # Used alias to avoid conflict with player instance variable
 import open_world_dir.camera_map as camera_map
 import open_world_dir.ui as ui
+from open_world_dir.profiler import TickProfiler
+from open_world_dir.instances import InstanceManager
+from world_structures.animation import ANIMATION_CLOCK
 
 # --- Core Constants ---
 SCREEN_WIDTH = world_struct_stable.SCREEN_WIDTH
@@ -29,96 +33,19 @@ PLAYER_RADIUS = world_struct_stable.PLAYER_RADIUS # Keep radius for collision/in
 PLAYER_SPEED = world_struct_stable.PLAYER_SPEED # Keep speed for player creation
 PLAYER_COLOR = (220, 0, 0) # Fallback color
 FPS = 60
+PROFILE_SERVER_TICKS = False # Opt-in: time each server tick phase and log rolling p50/p95/p99
 
 # --- Game State ---
 game_state = "overworld" # Start in the overworld
 # game_state = "dungeon"
 
 show_map = False
-
-# --- Network Helper Functions ---
-def send_data(sock, data):
-    """Sends pickled data prefixed with its size."""
-    try:
-        # Serialize the data object into bytes
-        pickled_data = pickle.dumps(data)
-        # Create a fixed-size header containing the length of the data
-        header = f"{len(pickled_data):<{HEADER_SIZE}}".encode('utf-8')
-        # Send the header followed by the pickled data
-        sock.sendall(header + pickled_data)
-        return True
-    except (socket.error, pickle.PicklingError, BrokenPipeError, ConnectionResetError) as e:
-        # Handle common network sending errors
-        print(f"NETWORK SEND ERROR: {e}")
-        return False # Indicate failure
-
-def receive_data(sock):
-    """Receives data prefixed with its size."""
-    full_msg = b''
-    new_msg = True
-    expected_msg_len = 0
-    while True:
-        try:
-            # 1. Receive the header (fixed size)
-            if new_msg:
-                header = sock.recv(HEADER_SIZE)
-                if not header:
-                    print("NETWORK RECV ERROR: Connection closed (header).")
-                    return None # Connection closed
-                try:
-                    # Decode the header to determine the expected message length
-                    expected_msg_len = int(header.decode('utf-8').strip())
-                    new_msg = False
-                    full_msg = b'' # Reset message buffer
-                except ValueError:
-                    print(f"NETWORK RECV ERROR: Invalid header received: {header}")
-                    return None
-
-            # 2. Receive the main message chunk by chunk
-            # Receive in chunks to handle large data packets
-            chunk = sock.recv(min(4096, expected_msg_len - len(full_msg)))
-            if not chunk:
-                print("NETWORK RECV ERROR: Connection closed (data).")
-                return None # Connection closed
-
-            full_msg += chunk
-
-            # 3. Check if the full message is received
-            if len(full_msg) == expected_msg_len:
-                # 4. Unpickle the complete message
-                try:
-                    # Deserialize the bytes back into a Python object
-                    data = pickle.loads(full_msg)
-                    return data # Success
-                except pickle.UnpicklingError as e:
-                    print(f"NETWORK RECV ERROR: Failed to unpickle data: {e}")
-                    return None
-                except Exception as e:
-                    print(f"NETWORK RECV ERROR: Unexpected error during unpickle: {e}")
-                    return None
-
-            elif len(full_msg) > expected_msg_len:
-                # This indicates a data stream corruption or logic error
-                print(f"NETWORK RECV ERROR: Received more data than expected header size indicated. Header: {expected_msg_len}, Received: {len(full_msg)}")
-                return None
-
-
-        except socket.timeout:
-            print("NETWORK RECV ERROR: Socket timeout.")
-            return None # Indicate timeout
-        except ConnectionResetError:
-            print("NETWORK RECV ERROR: Connection reset by peer.")
-            return None
-        except socket.error as e:
-            print(f"NETWORK RECV ERROR: Socket error: {e}")
-            return None
-        except Exception as e:
-             print(f"NETWORK RECV ERROR: Unexpected error in receive_data: {e}")
-             return None
+instance_manager = None # Server: hosts one WorldInstance per active mode (overworld, dungeon, ...)
+current_portals = [] # Portals of the instance currently being viewed (for drawing)
 
 def client_handler(conn, addr):
     """Handles communication with a single client in a separate thread."""
-    global player_id_counter, combat_manager, npc_manager # Access shared data
+    global player_id_counter # Access shared data
 
     print(f"[SERVER] Connection established with {addr}")
     # 1. Assign a unique ID to the new player
@@ -127,34 +54,32 @@ def client_handler(conn, addr):
         player_id = player_id_counter
         player_id_counter += 1
         # Create a player object on the server for this client
-        # Determine spawn point based on the current game state
-        if game_state == "overworld":
-             start_x = world_struct_stable.KINGDOM_CENTER_X + world_struct_stable.KINGDOM_RADIUS + 200 + (player_id * 50) # Simple offset spawn
-             start_y = world_struct_stable.KINGDOM_CENTER_Y
-        else: # Dungeon fallback
-             start_x, start_y = 100 + (player_id * 50), 100
+        # New players always join the default world instance at its spawn point
+        start_instance = instance_manager.default_instance
+        start_x, start_y = start_instance.get_spawn_point(player_id)
         # Ensure player assets are loaded before creating a Player instance
         if player_animations['idle'] and player_animations['dims']:
              new_player = player_module.Player(player_id, start_x, start_y, PLAYER_RADIUS, PLAYER_SPEED, PLAYER_COLOR, player_animations)
+             start_instance.add_player(new_player, start_x, start_y)
              network_players[player_id] = new_player # Add to the server's authoritative player list
-             print(f"[SERVER] Assigned Player ID {player_id} to {addr}. Spawning at ({start_x},{start_y})")
+             client_player_ids[conn] = player_id
+             print(f"[SERVER] Assigned Player ID {player_id} to {addr}. Spawning at ({start_x},{start_y}) in '{start_instance.instance_id}'")
         else:
              print(f"[SERVER] ERROR: Player assets not loaded when trying to create player {player_id}. Disconnecting.")
              conn.close()
              return # Exit thread
 
 
-    # 2. Send the initial state to the new client
-    initial_state = {
-        'type': 'initial_state',
-        'your_id': player_id,
-        'players': {pid: p.get_network_state() for pid, p in network_players.items()},
-        'enemies': combat_manager.get_all_enemies_network_state() if combat_manager else {},
-    }
+    # 2. Send the initial state (of the player's instance) to the new client
+    initial_state = start_instance.get_network_state()
+    initial_state['type'] = 'initial_state'
+    initial_state['your_id'] = player_id
     if not send_data(conn, initial_state):
         print(f"[SERVER] Failed to send initial state to {addr}. Closing connection.")
         with threading.Lock():
              if player_id in network_players: del network_players[player_id]
+             instance_manager.remove_player(player_id)
+             client_player_ids.pop(conn, None)
         conn.close()
         return
 
@@ -191,8 +116,10 @@ def client_handler(conn, addr):
     with threading.Lock(): # Protect shared resources during removal
         if conn in clients:
             del clients[conn]
+        client_player_ids.pop(conn, None)
         if player_id in network_players:
             del network_players[player_id]
+            instance_manager.remove_player(player_id)
             # Broadcast a message to other clients that this player disconnected
             disconnect_msg = {'type': 'player_disconnect', 'id': player_id}
             broadcast_data(disconnect_msg, sender_socket=None)
@@ -204,22 +131,25 @@ def client_handler(conn, addr):
 
 def start_server():
     """Initializes and starts the game server."""
-    global server_socket, is_host, player_id_counter, my_player_id, network_players
+    global server_socket, subscriber_socket, is_host, player_id_counter, my_player_id, network_players, instance_manager
     player_id_counter = 0 # Reset counter for a new server instance
 
+    # The startup mode's instance reuses the collision index built during loading;
+    # other instances (e.g. the dungeon) are created on demand when a player enters them.
+    instance_manager = InstanceManager(world_data, all_enemy_animations, default_mode=game_state)
+    instance_manager.get_or_create(game_state, collision_index=collision_quadtree,
+                                   world_width=effective_world_width, world_height=effective_world_height)
+
     # Create the host's player object only if not a dedicated server
     if not is_dedicated_host:
         my_player_id = player_id_counter
         player_id_counter += 1
         # Determine spawn point for the host player
-        if game_state == "overworld":
-            start_x = world_struct_stable.KINGDOM_CENTER_X + world_struct_stable.KINGDOM_RADIUS + 200
-            start_y = world_struct_stable.KINGDOM_CENTER_Y
-        else: # Dungeon fallback
-            start_x, start_y = 100, 100
+        start_x, start_y = instance_manager.default_instance.get_spawn_point(my_player_id)
 
         if player_animations['idle'] and player_animations['dims']:
             host_player = player_module.Player(my_player_id, start_x, start_y, PLAYER_RADIUS, PLAYER_SPEED, PLAYER_COLOR, player_animations)
+            instance_manager.default_instance.add_player(host_player, start_x, start_y)
             network_players[my_player_id] = host_player
             print(f"[SERVER] Host player created with Player ID {my_player_id} at ({start_x},{start_y}).")
         else:
@@ -247,13 +177,56 @@ def start_server():
         pygame.quit()
         sys.exit() # Exit if the server cannot start
 
+    # Setup subscriber socket (relays). Subscribers get the default instance's snapshots
+    # but have no player, so they do not count against MAX_CLIENTS.
+    subscriber_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    subscriber_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        subscriber_socket.bind(('0.0.0.0', SUBSCRIBER_PORT))
+        subscriber_socket.listen(MAX_SUBSCRIBERS)
+        subscriber_socket.setblocking(False)
+        print(f"[SERVER] Listening for snapshot subscribers on port {SUBSCRIBER_PORT}...")
+    except socket.error as e:
+        # Spectating is optional; the game itself can still be hosted
+        print(f"[SERVER] WARNING: Could not bind subscriber port {SUBSCRIBER_PORT}: {e}")
+        subscriber_socket.close()
+        subscriber_socket = None
+
+def accept_subscriber():
+    """Accepts a relay on the subscriber socket and sends it the current world state."""
+    global subscriber_socket, subscribers
+    try:
+        conn, addr = subscriber_socket.accept()
+    except socket.error as e:
+        print(f"[SERVER] Error accepting subscriber: {e}")
+        return
+    if len(subscribers) >= MAX_SUBSCRIBERS:
+        print(f"[SERVER] Subscriber rejected from {addr}: Too many subscribers.")
+        send_data(conn, {'type':'error', 'message':'Too many subscribers.'})
+        conn.close()
+        return
+    conn.setblocking(True)
+    # Same payload a joining player gets, minus a player id of its own
+    initial_state = instance_manager.default_instance.get_network_state()
+    initial_state['type'] = 'initial_state'
+    initial_state['your_id'] = None
+    if send_data(conn, initial_state):
+        subscribers[conn] = addr
+        print(f"[SERVER] Snapshot subscriber connected from {addr}")
+    else:
+        conn.close()
+
 def accept_connections():
     """Accepts new incoming connections without blocking."""
     global server_socket, clients, client_threads
     if not server_socket: return
 
     # Use select to check for readable sockets (new connections) without blocking
-    readable, _, _ = select.select([server_socket], [], [], 0.01) # Small timeout
+    listening = [server_socket] + ([subscriber_socket] if subscriber_socket else [])
+    readable, _, _ = select.select(listening, [], [], 0.01) # Small timeout
+
+    if subscriber_socket and subscriber_socket in readable:
+        accept_subscriber()
 
     if server_socket in readable:
         try:
@@ -275,13 +248,13 @@ def accept_connections():
         except Exception as e:
             print(f"[SERVER] Unexpected error during accept: {e}")
 
-def connect_to_server(server_ip):
-    """Connects the client to the specified server IP."""
+def connect_to_server(server_ip, port=PORT):
+    """Connects the client to the specified server IP (or a snapshot relay's port when spectating)."""
     global client_socket, my_player_id, network_players, combat_manager, npc_manager
     client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     try:
-        client_socket.connect((server_ip, PORT))
-        print(f"[CLIENT] Connected to server {server_ip}:{PORT}")
+        client_socket.connect((server_ip, port))
+        print(f"[CLIENT] Connected to server {server_ip}:{port}")
 
         # 1. Receive initial state from the server
         initial_data = receive_data(client_socket)
@@ -301,6 +274,9 @@ def connect_to_server(server_ip):
                 else:
                     print(f"[CLIENT] ERROR: Player assets not loaded when creating player {p_id}")
 
+            # Switch to the world instance the server placed us in
+            apply_instance_info(initial_data.get('instance'))
+
             # Update enemies based on the initial state
             server_enemies = initial_data.get('enemies', {})
             if combat_manager:
@@ -324,7 +300,7 @@ def connect_to_server(server_ip):
             return False
 
     except socket.error as e:
-        print(f"[CLIENT] Could not connect to server {server_ip}:{PORT} - {e}")
+        print(f"[CLIENT] Could not connect to server {server_ip}:{port} - {e}")
         client_socket = None
         return False
     except Exception as e:
@@ -348,6 +324,10 @@ def client_receive_loop():
             if isinstance(data, dict):
                 msg_type = data.get('type')
                 if msg_type == 'game_state_update':
+                    if 'server_time_ms' in data: ANIMATION_CLOCK.sync(data['server_time_ms'])
+                    # Follow the server if our player moved to another world instance
+                    apply_instance_info(data.get('instance'))
+
                     # Update players
                     player_states = data.get('players', {})
                     with threading.Lock(): # Protect access to network_players
@@ -404,16 +384,27 @@ def client_receive_loop():
         except:
             pass
 
-def broadcast_data(data, sender_socket=None):
-    """Sends data to all connected clients, optionally excluding the original sender."""
-    if not is_host: return # Only the host can broadcast
+def broadcast_data(data, sender_socket=None, recipients=None):
+    """Sends data to all connected clients (or only `recipients`), optionally excluding the original sender.
+       Returns the number of bytes written across all clients."""
+    if not is_host: return 0 # Only the host can broadcast
     disconnected_clients = []
+    bytes_sent = 0
+    try:
+        message = pack_message(data) # Serialize once, send the same bytes to every client
+    except pickle.PicklingError as e:
+        print(f"NETWORK SEND ERROR: {e}")
+        return 0
     with threading.Lock(): # Protect access to the clients dictionary
         # Create a copy of keys to iterate over, allowing modification of the original dict
-        client_sockets = list(clients.keys())
+        client_sockets = list(clients.keys()) if recipients is None else [c for c in recipients if c in clients or c in subscribers]
         for client_conn in client_sockets:
             if client_conn != sender_socket:
-                if not send_data(client_conn, data):
+                try:
+                    client_conn.sendall(message)
+                    bytes_sent += len(message)
+                except (socket.error, BrokenPipeError, ConnectionResetError) as e:
+                    print(f"NETWORK SEND ERROR: {e}")
                     # Mark client for removal if sending data fails
                     disconnected_clients.append(client_conn)
 
@@ -425,16 +416,24 @@ def broadcast_data(data, sender_socket=None):
                     print(f"[SERVER] Removing disconnected client {clients[conn]} due to send error.")
                     addr = clients.pop(conn) # Remove and get address
                     # Find corresponding player ID to remove from network_players
-                    player_id_to_remove = None
-                    # This requires a better mapping of connection to player ID for robust removal
+                    player_id_to_remove = client_player_ids.pop(conn, None)
                     if player_id_to_remove is not None and player_id_to_remove in network_players:
                          del network_players[player_id_to_remove]
+                         if instance_manager: instance_manager.remove_player(player_id_to_remove)
                          print(f"[SERVER] Removed player object {player_id_to_remove}")
 
                     try:
                          conn.close()
                     except socket.error:
                          pass
+                elif conn in subscribers:
+                    print(f"[SERVER] Removing snapshot subscriber {subscribers.pop(conn)} due to send error.")
+                    try:
+                         conn.close()
+                    except socket.error:
+                         pass
+
+    return bytes_sent
 
 
 # --- Initialization ---
@@ -494,12 +493,115 @@ last_time = pygame.time.get_ticks()
 fight_check_timer = 0.0
 FIGHT_COOLDOWN = 5.0 # Seconds before health regen restarts
 last_input_state = {}
+tick_profiler = TickProfiler(enabled=PROFILE_SERVER_TICKS, budget_ms=1000.0 / FPS)
+
+# --- Server Tick ---
+def run_server_tick(dt):
+    """(Server Only) Runs one authoritative simulation step for every active world instance,
+       then sends each client the snapshot of the instance its player is in.
+       Suspended instances (no players) are skipped entirely.
+       Phases are timed by tick_profiler when enabled."""
+    ANIMATION_CLOCK.tick() # One animation timestamp for the whole tick
+    for instance in instance_manager.active_instances():
+        instance_players = instance.players
+        instance_index = instance.collision_index
+        instance_combat = instance.combat_manager
+        instance_npcs = instance.npc_manager
+
+        # Update the instance's players based on their last known input (the host's local input is stored the same way)
+        with tick_profiler.phase('players'):
+            for p_id in list(instance_players.keys()):
+                player_obj = instance_players.get(p_id)
+                if not player_obj: continue
+
+                # Get nearby colliders for physics calculations
+                potential_colliders = []; wall_segments = ()
+                if instance_index and player_obj.rect:
+                    query_range = player_obj.rect.inflate(player_obj.speed * 2 + 32, player_obj.speed * 2 + 32)
+                    potential_colliders, wall_segments, refreshed = player_obj.collider_cache.query(instance_index, query_range)
+                    if refreshed: tick_profiler.count('collider_queries')
+
+                player_obj.update(player_obj.last_known_move_vector, potential_colliders, dt, instance.world_width, instance.world_height, wall_segments)
+
+                # Process action requests (consume them so they fire once)
+                if player_obj.attack_requested:
+                    if player_obj.start_attack_animation():
+                        hit_events = instance_combat.handle_player_attack(player_obj) # One list per swing
+                        tick_profiler.count('melee_events', len(hit_events))
+                    player_obj.attack_requested = False
+
+                if player_obj.interact_requested:
+                    instance_npcs.handle_interaction(player_obj)
+                    player_obj.interact_requested = False
+
+                # Walking into a portal moves the player to another instance (created on demand)
+                portal = instance.find_triggered_portal(player_obj)
+                if portal:
+                    instance_manager.transfer_player(player_obj, portal['target_mode'])
+
+        # Update enemies and NPCs authoritatively on the server
+        if instance.is_suspended: continue # Last player just left through a portal
+        if instance.path_planner: # Queued long-distance path searches, within the per-tick budget
+            with tick_profiler.phase('paths'):
+                instance.path_planner.process()
+            tick_profiler.count('path_searches', instance.path_planner.searches_run)
+        with tick_profiler.phase('combat'):
+            instance_combat.update(instance_players, dt, instance_index, instance.game_mode)
+        for counter_name, value in instance_combat.last_update_counts.items():
+            tick_profiler.count(counter_name, value)
+        with tick_profiler.phase('npcs'):
+            instance_npcs.update(dt, instance_index)
+        for counter_name, value in instance_npcs.last_update_counts.items():
+            tick_profiler.count(counter_name, value)
+
+    # --- Prepare and Send Each Instance's Game State to the Clients Inside It ---
+    recipients_by_instance = {}
+    for conn, p_id in list(client_player_ids.items()):
+        player_obj = network_players.get(p_id)
+        if player_obj:
+            recipients_by_instance.setdefault(player_obj.instance_id, []).append(conn)
+    if subscribers:
+        # Relays mirror the default instance; they fan the same bytes out to spectators
+        recipients_by_instance.setdefault(instance_manager.default_mode, []).extend(list(subscribers.keys()))
+
+    for instance in instance_manager.active_instances():
+        recipients = recipients_by_instance.get(instance.instance_id)
+        if not recipients: continue # e.g. only the host plays in this instance
+        with tick_profiler.phase('snapshot'):
+            current_game_state_payload = instance.get_network_state()
+        with tick_profiler.phase('broadcast'):
+            bytes_sent = broadcast_data(current_game_state_payload, recipients=recipients)
+        tick_profiler.count('bytes_broadcast', bytes_sent)
+    tick_profiler.count('active_instances', len(instance_manager.active_instances()))
+
+def view_instance(instance):
+    """(Host) Points the drawing/UI globals at the world instance the local player is in."""
+    global game_state, collision_quadtree, combat_manager, npc_manager
+    global effective_world_width, effective_world_height, current_portals
+    if instance is None: return
+    game_state = instance.game_mode
+    collision_quadtree = instance.collision_index
+    combat_manager = instance.combat_manager
+    npc_manager = instance.npc_manager
+    effective_world_width, effective_world_height = instance.world_width, instance.world_height
+    current_portals = instance.portals
+
+def apply_instance_info(instance_info):
+    """(Client) Switches the local view to the instance described by the server snapshot."""
+    global game_state, effective_world_width, effective_world_height, current_portals
+    if not instance_info: return
+    new_mode = instance_info.get('mode', game_state)
+    if new_mode != game_state:
+        print(f"[CLIENT] Entering world instance '{instance_info.get('id')}' ({new_mode}).")
+        game_state = new_mode
+        effective_world_width, effective_world_height = world_struct_stable.get_world_dimensions(new_mode)
+    current_portals = instance_info.get('portals', [])
 
 # --- Ask User: Host or Join ---
 user_choice = ""
 host_mode = None # Will be 'play' or 'dedicated' if hosting
-while user_choice not in ['host', 'join']:
-    user_choice = input("Do you want to (host) or (join) a game? ").lower().strip()
+while user_choice not in ['host', 'join', 'spectate']:
+    user_choice = input("Do you want to (host), (join) or (spectate) a game? ").lower().strip()
 
 if user_choice == 'host':
     host_type_choice = ""
@@ -530,7 +632,9 @@ if user_choice == 'host':
             print("[DEDICATED SERVER] Running server loop...")
             last_time = pygame.time.get_ticks()
             while server_socket: # Loop as long as the server is running
-                accept_connections()
+                tick_profiler.begin_tick()
+                with tick_profiler.phase('accept'):
+                    accept_connections()
 
                 # Calculate delta time for consistent game speed
                 current_time = pygame.time.get_ticks()
@@ -542,41 +646,8 @@ if user_choice == 'host':
 
                 # --- SERVER SIDE UPDATES ---
                 if is_host:
-                    # Update all players based on their last received input
-                    player_ids = list(network_players.keys())
-                    for p_id in player_ids:
-                        player_obj = network_players.get(p_id)
-                        if player_obj:
-                            # Get nearby colliders for physics calculations
-                            potential_colliders = []
-                            if collision_quadtree and player_obj.rect:
-                                query_range = player_obj.rect.inflate(player_obj.speed * 2 + 32, player_obj.speed * 2 + 32)
-                                potential_colliders = collision_quadtree.query(query_range)
-
-                            # Update player using their last known network input vector
-                            player_obj.update(player_obj.last_known_move_vector, potential_colliders, dt, effective_world_width, effective_world_height)
-
-                            # Process action requests received from clients
-                            if player_obj.attack_requested:
-                                if player_obj.start_attack_animation():
-                                    combat_manager.handle_player_attack(player_obj)
-                                player_obj.attack_requested = False # Consume the request
-
-                            if player_obj.interact_requested:
-                                npc_manager.handle_interaction(player_obj)
-                                player_obj.interact_requested = False # Consume the request
-
-                    # Update enemies and NPCs authoritatively on the server
-                    if combat_manager: combat_manager.update(network_players, dt, collision_quadtree, game_state)
-                    if npc_manager: npc_manager.update(dt, collision_quadtree)
-
-                    # --- Prepare and Broadcast Game State ---
-                    current_game_state_payload = {
-                        'type': 'game_state_update',
-                        'players': {pid: p.get_network_state() for pid, p in network_players.items() if p},
-                        'enemies': combat_manager.get_all_enemies_network_state() if combat_manager else {},
-                    }
-                    broadcast_data(current_game_state_payload)
+                    run_server_tick(dt)
+                tick_profiler.end_tick()
 
                 clock.tick(FPS) # Maintain a consistent server tick rate
 
@@ -584,6 +655,15 @@ if user_choice == 'host':
             print("[DEDICATED SERVER] Server loop finished. Exiting.")
             pygame.quit(); sys.exit()
 
+elif user_choice == 'spectate': # Watch a game through a snapshot relay (relay.py)
+    is_host = False
+    is_dedicated_host = False
+    is_spectator = True
+    relay_ip_address = input("Enter the relay's IP address: ")
+    if not connect_to_server(relay_ip_address, RELAY_PORT):
+        print("Failed to connect to relay. Exiting.")
+        pygame.quit(); sys.exit()
+
 else: # Join a game
     is_host = False
     is_dedicated_host = False
@@ -599,15 +679,9 @@ if host_mode == 'play' and my_player_id not in network_players:
 
 
 # --- Spawn dynamic entities (AUTHORITATIVE on SERVER) ---
-if is_host:
-    print("[SERVER] Spawning initial entities...")
-    if combat_manager: # Ensure manager exists
-        if game_state == "dungeon":
-            combat_manager.spawn_enemies_in_dungeon(combat_mech_stable.SWORD_ORC_COUNT // 2)
-            npc_manager.spawn_npcs_in_dungeon()
-        elif game_state == "overworld":
-            combat_manager.spawn_enemies_in_overworld(combat_mech_stable.SWORD_ORC_COUNT)
-            npc_manager.spawn_npcs_in_overworld(world_struct_stable.KINGDOM_CENTER_X, world_struct_stable.KINGDOM_CENTER_Y, world_struct_stable.is_point_in_polygon)
+# Each world instance spawns its own enemies and NPCs when it is created (see open_world_dir/instances.py).
+if is_host and not is_dedicated_host:
+    view_instance(instance_manager.instance_of(network_players.get(my_player_id)))
 
 
 # --- Play Background Music ---
@@ -624,10 +698,13 @@ while running:
     current_time = pygame.time.get_ticks()
     dt = min((current_time - last_time) / 1000.0, 0.1)
     last_time = current_time
+    ANIMATION_CLOCK.tick() # Frames drawn this loop are derived from this timestamp
 
     # --- Server: Accept new connections ---
     if is_host:
-        accept_connections()
+        tick_profiler.begin_tick()
+        with tick_profiler.phase('accept'):
+            accept_connections()
 
     # --- Get Local Player Reference (for drawing, camera, UI, input) ---
     local_player = None
@@ -635,8 +712,16 @@ while running:
          with threading.Lock():
              local_player = network_players.get(my_player_id)
 
+    # Spectators have no player of their own; the camera follows the lowest player ID
+    spectated_player = None
+    if is_spectator:
+        with threading.Lock():
+            watched_ids = sorted(p_id for p_id, p in network_players.items() if p)
+            spectated_player = network_players.get(watched_ids[0]) if watched_ids else None
+    focus_player = local_player or spectated_player
+
     # If the local player is gone (e.g., disconnected), stop the loop
-    if not is_dedicated_host and local_player is None:
+    if not is_dedicated_host and not is_spectator and local_player is None:
          print("Local player not found, stopping game loop.")
          running = False
          continue # Skip the rest of the loop
@@ -658,6 +743,12 @@ while running:
                         local_player.interact_requested = True # Flag the intent to interact
                     if event.key == pygame.K_SPACE:
                         local_player.attack_requested = True # Flag the intent to attack
+    elif is_spectator: # Spectators only watch; no input is sent anywhere
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_m: show_map = not show_map
+                if event.key == pygame.K_ESCAPE: running = False
 
     # --- Player Input (Get movement vector for local player) ---
     intended_move_vector = pygame.math.Vector2(0,0)
@@ -685,75 +776,18 @@ while running:
 
     # --- SERVER SIDE UPDATES ---
     if is_host:
-        # --- Update Host Player (if not dedicated) ---
+        # Host player input was stored in last_known_move_vector by handle_input above,
+        # so the host is simulated exactly like every connected client.
+        run_server_tick(dt)
+        tick_profiler.end_tick()
+        # The local player may have walked through a portal into another instance
         if not is_dedicated_host and local_player:
-            # Get nearby colliders for physics
-            potential_colliders = []
-            if collision_quadtree:
-                query_range = local_player.rect.inflate(local_player.speed * 2 + 32, local_player.speed * 2 + 32)
-                potential_colliders = collision_quadtree.query(query_range)
-
-            # Update host player based on direct local input
-            local_player.update(intended_move_vector, potential_colliders, dt, effective_world_width, effective_world_height)
-
-            # Process the host's own action requests
-            if local_player.attack_requested:
-                if local_player.start_attack_animation():
-                    combat_manager.handle_player_attack(local_player)
-                local_player.attack_requested = False
-
-            if local_player.interact_requested:
-                npc_manager.handle_interaction(local_player)
-                local_player.interact_requested = False
-
-        # --- Update Client Players (Based on received input) ---
-        player_ids = list(network_players.keys())
-        for p_id in player_ids:
-            # Skip host player (already updated)
-            if p_id == my_player_id or p_id not in network_players:
-                continue
-
-            player_obj = network_players[p_id]
-            if player_obj:
-                # Get nearby colliders
-                potential_colliders = []
-                if collision_quadtree:
-                    query_range = player_obj.rect.inflate(player_obj.speed * 2 + 32, player_obj.speed * 2 + 32)
-                    potential_colliders = collision_quadtree.query(query_range)
-
-                # Update client's player based on their last received move vector
-                player_obj.update(player_obj.last_known_move_vector, potential_colliders, dt, effective_world_width, effective_world_height)
-
-                # Process client's action requests
-                if player_obj.attack_requested:
-                    if player_obj.start_attack_animation():
-                        combat_manager.handle_player_attack(player_obj)
-                    player_obj.attack_requested = False # Reset flag on server
-
-                if player_obj.interact_requested:
-                    npc_manager.handle_interaction(player_obj)
-                    player_obj.interact_requested = False # Reset flag on server
-
-
-        # --- Update Enemies & NPCs (Server Authority) ---
-        if combat_manager:
-            combat_manager.update(network_players, dt, collision_quadtree, game_state)
-        if npc_manager:
-            npc_manager.update(dt, collision_quadtree)
+            view_instance(instance_manager.instance_of(local_player))
 
 
-        # --- Prepare and Broadcast Game State ---
-        current_game_state_payload = {
-            'type': 'game_state_update',
-            'players': {pid: p.get_network_state() for pid, p in network_players.items() if p},
-            'enemies': combat_manager.get_all_enemies_network_state() if combat_manager else {},
-        }
-        broadcast_data(current_game_state_payload)
-
-
-    # --- Camera Update (Based on LOCAL player) ---
-    if not is_dedicated_host and local_player:
-        camera_map.update_camera(local_player.x, local_player.y, effective_world_width, effective_world_height)
+    # --- Camera Update (Based on LOCAL player, or the watched player when spectating) ---
+    if not is_dedicated_host and focus_player:
+        camera_map.update_camera(focus_player.x, focus_player.y, effective_world_width, effective_world_height)
         camera_x = camera_map.camera_x
         camera_y = camera_map.camera_y
     else:
@@ -771,12 +805,15 @@ while running:
 
         if game_state == "overworld":
             drawing.draw_kingdom_structures(screen, camera_x, camera_y, world_data)
+        drawing.draw_portals(screen, camera_x, camera_y, current_portals)
 
         # --- Draw Dynamic Entities ---
         draw_list = []
         with threading.Lock(): # Protect access while iterating network dictionaries
             # Add players to the draw list
             for p_id, p_obj in network_players.items():
+                # The host knows every instance's players; only draw those sharing the local player's instance
+                if is_host and local_player and p_obj and p_obj.instance_id != local_player.instance_id: continue
                 if p_obj: draw_list.append({'type': 'player', 'object': p_obj, 'y': p_obj.y})
             # Add enemies to the draw list
             enemies_to_draw = combat_manager.client_enemies if not is_host else combat_manager.enemies
@@ -799,8 +836,9 @@ while running:
                  pass # NPC drawing is handled by the manager
 
         # Draw map overlay if toggled
-        if show_map and local_player:
-            camera_map.draw_map_overlay(screen, local_player, world_data, effective_world_width, effective_world_height, game_state, list(network_players.values()))
+        if show_map and focus_player:
+            visible_players = [p for p in network_players.values() if p and (not is_host or p.instance_id == focus_player.instance_id)]
+            camera_map.draw_map_overlay(screen, focus_player, world_data, effective_world_width, effective_world_height, game_state, visible_players)
 
 
         # Draw UI Elements
@@ -0,0 +1,202 @@
+import pygame
+
+# Import other game modules
+import world_struct as world_struct_stable
+import combat_mech as combat_mech_stable
+import npc_system as npc_system_stable
+from world_structures.navigation import NavGrid
+from world_structures.hpa import HPAGraph, PathPlanner
+from world_structures.entity_registry import EntityRegistry
+from world_structures.animation import ANIMATION_CLOCK
+
+
+# --- World Instance ---
+class WorldInstance:
+    """
+    (Server Only) One independently simulated world: its own collision index,
+    CombatManager, NPCManager and the subset of players currently inside it.
+    An instance with no players is suspended and costs no CPU per tick.
+    """
+    def __init__(self, instance_id, game_mode, world_data, all_enemy_animations,
+                 collision_index=None, world_width=None, world_height=None):
+        self.instance_id = instance_id
+        self.game_mode = game_mode # "overworld" or "dungeon"
+        self.world_data = world_data
+        self.players = {} # {player_id: Player} for players inside this instance (network id lookup)
+        # One id space for this instance's players, enemies and NPCs; each kind is iterated from its dense list
+        self.registry = EntityRegistry()
+
+        # Collision index (built fresh unless the caller already has one for this mode)
+        if collision_index is None:
+            collision_index, world_width, world_height = world_struct_stable.build_collision_index(world_data, game_mode)
+        self.collision_index = collision_index
+        self.world_width = world_width
+        self.world_height = world_height
+
+        # Managers see only this instance's players (PvP, targeting, interaction)
+        self.combat_manager = combat_mech_stable.CombatManager(world_data, collision_index, world_struct_stable.is_point_in_polygon,
+                                                               all_enemy_animations, self.players, registry=self.registry)
+        if game_mode == "overworld": # The kingdom wall only exists in the overworld
+            self.combat_manager.wall_field = world_data.get("kingdom_wall_field")
+
+        # (Overworld) Navigation shared by enemies and NPCs: the nav grid (flow fields) and
+        # an HPA* planner for long trips, whose graph is cached on disk next to the world
+        self.nav_grid = None; self.path_planner = None
+        if game_mode == "overworld" and collision_index is not None:
+            self.nav_grid = NavGrid.from_index(collision_index, world_width, world_height)
+            self.path_planner = PathPlanner(HPAGraph.load_or_build(self.nav_grid))
+        self.combat_manager.nav_grid = self.nav_grid
+        self.combat_manager.path_planner = self.path_planner
+        self.npc_manager = npc_system_stable.NPCManager(world_data, world_struct_stable.SCREEN_HEIGHT, world_struct_stable.SCREEN_WIDTH,
+                                                        self.players, True, registry=self.registry)
+        self.npc_manager.path_planner = self.path_planner
+        self.portals = self._build_portals()
+        self.spawn_initial_entities()
+
+    @property
+    def is_suspended(self):
+        """Instances without players are not simulated."""
+        return not self.players
+
+    def _build_portals(self):
+        """Returns the list of portal dicts {'rect', 'target_mode'} for this instance."""
+        size = world_struct_stable.PORTAL_SIZE
+        if self.game_mode == "overworld":
+            entrance_rect = pygame.Rect(0, 0, size, size)
+            entrance_rect.center = (world_struct_stable.DUNGEON_ENTRANCE_X, world_struct_stable.DUNGEON_ENTRANCE_Y)
+            return [{'rect': entrance_rect, 'target_mode': "dungeon"}]
+        # Dungeon exit sits in the arrival room so players can always leave the way they came
+        exit_rect = pygame.Rect(0, 0, size, size)
+        exit_rect.center = self.get_spawn_point(0)
+        return [{'rect': exit_rect, 'target_mode': "overworld"}]
+
+    def spawn_initial_entities(self):
+        """Spawns the starting enemy and NPC population for this instance's mode."""
+        print(f"[SERVER] Spawning initial entities for instance '{self.instance_id}'...")
+        if self.game_mode == "dungeon":
+            self.combat_manager.spawn_enemies_in_dungeon(combat_mech_stable.SWORD_ORC_COUNT // 2)
+            self.npc_manager.spawn_npcs_in_dungeon()
+        else:
+            self.combat_manager.spawn_enemies_in_overworld(combat_mech_stable.SWORD_ORC_COUNT)
+            self.npc_manager.spawn_npcs_in_overworld(world_struct_stable.KINGDOM_CENTER_X, world_struct_stable.KINGDOM_CENTER_Y,
+                                                     world_struct_stable.is_point_in_polygon)
+
+    def get_spawn_point(self, player_id):
+        """Returns the arrival position for a player joining this instance."""
+        if self.game_mode == "dungeon":
+            dungeon_rooms_grid = self.world_data.get("dungeon_rooms_grid")
+            if dungeon_rooms_grid:
+                # Always arrive in the first room so the exit portal is where players land
+                start_grid_x, start_grid_y = dungeon_rooms_grid[0].center
+                tile = world_struct_stable.DUNGEON_TILE_SIZE
+                return (start_grid_x * tile + tile // 2, start_grid_y * tile + tile // 2)
+            return (100 + (player_id * 50), 100)
+        # A starting point just outside the kingdom to the east, offset per player
+        return (world_struct_stable.KINGDOM_CENTER_X + world_struct_stable.KINGDOM_RADIUS + 200 + (player_id * 50),
+                world_struct_stable.KINGDOM_CENTER_Y)
+
+    def add_player(self, player, x=None, y=None):
+        """Places a player in this instance at (x, y) or the instance spawn point."""
+        if x is None or y is None:
+            x, y = self.get_spawn_point(player.player_id)
+        player.x = float(x); player.y = float(y)
+        player.rect.center = (int(x), int(y))
+        player.instance_id = self.instance_id
+        # Standing on a portal on arrival must not bounce the player straight back
+        player.portal_armed = False
+        previous = self.players.get(player.player_id)
+        if previous is not player: # Re-adding a player already here keeps its entity id
+            if previous is not None: self.registry.remove(previous.entity_id)
+            player.entity_id = self.registry.add(player, 'player')
+        self.players[player.player_id] = player
+
+    def remove_player(self, player_id):
+        player = self.players.pop(player_id, None)
+        if player is not None: self.registry.remove(player.entity_id)
+        return player
+
+    def find_triggered_portal(self, player):
+        """Returns the portal the player just walked into, re-arming once they step off all portals."""
+        touching = None
+        for portal in self.portals:
+            if player.rect.colliderect(portal['rect']):
+                touching = portal; break
+        if touching is None:
+            player.portal_armed = True
+            return None
+        return touching if player.portal_armed else None
+
+    def get_network_state(self):
+        """Snapshot payload for clients whose player is inside this instance."""
+        return {
+            'type': 'game_state_update',
+            'server_time_ms': ANIMATION_CLOCK.now_ms, # Clients sync their animation clock to this
+            'instance': {'id': self.instance_id, 'mode': self.game_mode,
+                         'portals': [{'rect': tuple(p['rect']), 'target_mode': p['target_mode']} for p in self.portals]},
+            'players': {p.player_id: p.get_network_state() for p in self.registry.entities('player')},
+            'enemies': self.combat_manager.get_all_enemies_network_state(),
+        }
+
+
+# --- Instance Manager ---
+class InstanceManager:
+    """
+    (Server Only) Hosts several WorldInstances concurrently and moves players between them.
+    The default instance exists from startup; other modes are created on demand.
+    """
+    def __init__(self, world_data, all_enemy_animations, default_mode="overworld"):
+        self.world_data = world_data
+        self.all_enemy_animations = all_enemy_animations
+        self.instances = {} # {instance_id: WorldInstance}
+        self.default_mode = default_mode
+
+    def get_or_create(self, game_mode, **prebuilt):
+        """Returns the instance for a mode, creating (and populating) it on first use."""
+        instance = self.instances.get(game_mode)
+        if instance is None:
+            print(f"[SERVER] Creating world instance '{game_mode}'...")
+            instance = WorldInstance(game_mode, game_mode, self.world_data, self.all_enemy_animations, **prebuilt)
+            self.instances[game_mode] = instance
+        return instance
+
+    @property
+    def default_instance(self):
+        return self.get_or_create(self.default_mode)
+
+    def instance_of(self, player):
+        """Returns the instance a player is in (or None)."""
+        return self.instances.get(getattr(player, 'instance_id', None))
+
+    def add_player(self, player):
+        """Puts a newly connected player into the default instance."""
+        self.default_instance.add_player(player)
+
+    def remove_player(self, player_id):
+        for instance in self.instances.values():
+            if instance.remove_player(player_id) is not None:
+                return instance
+        return None
+
+    def transfer_player(self, player, target_mode):
+        """Moves a player into the instance for target_mode (created on demand)."""
+        source = self.instance_of(player)
+        target = self.get_or_create(target_mode)
+        if source is target: return target
+        if source: source.remove_player(player.player_id)
+
+        arrival = None
+        if target.game_mode == "overworld":
+            # Return next to the entrance the player originally used
+            for portal in target.portals:
+                if portal['target_mode'] == (source.game_mode if source else None):
+                    arrival = portal['rect'].center; break
+        if arrival:
+            target.add_player(player, arrival[0], arrival[1])
+        else:
+            target.add_player(player)
+        print(f"[SERVER] Player {player.player_id} moved from '{source.instance_id if source else None}' to '{target.instance_id}'.")
+        return target
+
+    def active_instances(self):
+        """Instances that currently have players (suspended instances are skipped entirely)."""
+        return [instance for instance in self.instances.values() if not instance.is_suspended]
@@ -15,6 +15,7 @@ from world_structures.world_constants import (MAP_SCALE_FACTOR, GRASS_COLOR_BASE
                                               MAP_OUTPUT_FILENAME, MAP_GATEHOUSE_COLOR, FOREST_GROUND_COLOR,
                                               KINGDOM_GROUND_COLOR, MAP_TOWER_COLOR)
 from paths import * # Imports specific asset paths like SPRITE_SHEET_PLAYER_IDLE_FILENAME
+from world_structures.sprite_bank import AnimationBank
 
 def generate_and_save_world_map_image(world_elements, world_width, world_height):
     """
@@ -326,6 +327,13 @@ def run_loading_screen(surface, game_state, mixer_initialized):
     else:
         print("WARNING: Failed to load one or more Orc animations.")
 
+    # --- Sprite Variants: convert + flipped + flash frames per type, built once ---
+    print("Loading Step: Sprite Variants...")
+    draw_loading_progress(surface, current_step, TOTAL_LOADING_STEPS, "Preparing Sprites...")
+    AnimationBank.of(player_animations)
+    for enemy_animations in all_enemy_animations.values():
+        AnimationBank.of(enemy_animations)
+
     # --- Step 13: Load Music ---
     print("Loading Step: Music...")
     if mixer_initialized:
@@ -339,30 +347,9 @@ def run_loading_screen(surface, game_state, mixer_initialized):
 
     # --- Step 14: Determine World Size & Populate Quadtree ---
     print("Loading Step: Quadtree Population...")
-    if game_state == "dungeon":
-        dungeon_world_width = world_struct_stable.DUNGEON_GRID_WIDTH * world_struct_stable.DUNGEON_TILE_SIZE
-        dungeon_world_height = world_struct_stable.DUNGEON_GRID_HEIGHT * world_struct_stable.DUNGEON_TILE_SIZE
-        dungeon_boundary_rect = pygame.Rect(0, 0, dungeon_world_width, dungeon_world_height)
-        collision_quadtree.boundary = dungeon_boundary_rect # Update quadtree boundary
-        world_struct_stable.populate_quadtree_with_dungeon(collision_quadtree, world_data["dungeon_grid"])
-        effective_world_width = dungeon_world_width
-        effective_world_height = dungeon_world_height
-    elif game_state == "overworld":
-        overworld_boundary_rect = pygame.Rect(0, 0, world_struct_stable.WORLD_WIDTH, world_struct_stable.WORLD_HEIGHT)
-        collision_quadtree.boundary = overworld_boundary_rect # Update quadtree boundary
-        world_struct_stable.populate_quadtree_with_overworld(collision_quadtree, world_data["colliders"])
-        effective_world_width = world_struct_stable.WORLD_WIDTH
-        effective_world_height = world_struct_stable.WORLD_HEIGHT
-    else: 
-        print(f"ERROR: Unknown game_state '{game_state}'. Defaulting to overworld bounds for quadtree.")
-        overworld_boundary_rect = pygame.Rect(0, 0, world_struct_stable.WORLD_WIDTH, world_struct_stable.WORLD_HEIGHT)
-        collision_quadtree.boundary = overworld_boundary_rect
-        if "colliders" in world_data: # Ensure colliders exist before populating
-             world_struct_stable.populate_quadtree_with_overworld(collision_quadtree, world_data["colliders"])
-        else:
-             print("Warning: No 'colliders' found in world_data for default quadtree population.")
-        effective_world_width = world_struct_stable.WORLD_WIDTH
-        effective_world_height = world_struct_stable.WORLD_HEIGHT
+    # A fresh index is built for the mode; the server builds one per world instance the same way
+    collision_quadtree, effective_world_width, effective_world_height = \
+        world_struct_stable.build_collision_index(world_data, game_state)
     current_step += 1; draw_loading_progress(surface, current_step, TOTAL_LOADING_STEPS, "Optimizing World...")
     pygame.time.wait(50)
 
@@ -0,0 +1,168 @@
+import time
+from collections import deque
+
+# --- Profiler Constants ---
+PROFILER_WINDOW_TICKS = 600 # Ring buffer size (~10 seconds at 60 FPS)
+PROFILER_LOG_INTERVAL = 5.0 # Seconds between periodic log lines
+TICK_BUDGET_MS = 1000.0 / 60 # 16.6 ms per tick at 60 FPS
+
+
+class _NullPhase:
+    """Context manager used when profiling is disabled (does nothing)."""
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc, tb): return False
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Times a single named phase and records it on the owning profiler."""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler; self.name = name; self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self.start) * 1000.0
+        # Phases may run more than once per tick (e.g. per player); accumulate them
+        current = self.profiler._tick_phases
+        current[self.name] = current.get(self.name, 0.0) + elapsed_ms
+        return False
+
+
+class TickProfiler:
+    """
+    Opt-in per-phase profiler for the authoritative server tick.
+
+    Usage:
+        profiler.begin_tick()
+        with profiler.phase('combat'): combat_manager.update(...)
+        profiler.count('enemies_updated', len(enemies))
+        profiler.end_tick()
+
+    Every tick's phase timings (ms) and counters are kept in ring buffers of
+    `window` ticks. `get_stats()` returns p50/p95/p99/max per phase and
+    mean/max per counter; a summary line is printed every `log_interval` seconds.
+    """
+    def __init__(self, enabled=False, window=PROFILER_WINDOW_TICKS, log_interval=PROFILER_LOG_INTERVAL,
+                 budget_ms=TICK_BUDGET_MS):
+        self.enabled = enabled
+        self.window = window
+        self.log_interval = log_interval
+        self.budget_ms = budget_ms
+
+        self.phase_samples = {} # {phase_name: deque of ms per tick}
+        self.counter_samples = {} # {counter_name: deque of values per tick}
+        self.tick_samples = deque(maxlen=window) # Total tick wall time (ms)
+        self.ticks_over_budget = 0
+        self.total_ticks = 0
+
+        self._tick_phases = {}
+        self._tick_counters = {}
+        self._tick_start = 0.0
+        self._last_log_time = time.perf_counter()
+
+    # --- Recording ---
+    def begin_tick(self):
+        if not self.enabled: return
+        self._tick_phases = {}
+        self._tick_counters = {}
+        self._tick_start = time.perf_counter()
+
+    def phase(self, name):
+        """Returns a context manager that times the enclosed block as `name`."""
+        if not self.enabled: return _NULL_PHASE
+        return _Phase(self, name)
+
+    def count(self, name, amount=1):
+        """Adds `amount` to the per-tick counter `name`."""
+        if not self.enabled: return
+        self._tick_counters[name] = self._tick_counters.get(name, 0) + amount
+
+    def end_tick(self):
+        """Commits the current tick's samples and prints the periodic log line if due."""
+        if not self.enabled: return
+        now = time.perf_counter()
+        tick_ms = (now - self._tick_start) * 1000.0
+        self.tick_samples.append(tick_ms)
+        self.total_ticks += 1
+        if tick_ms > self.budget_ms:
+            self.ticks_over_budget += 1
+
+        for name, ms in self._tick_phases.items():
+            samples = self.phase_samples.get(name)
+            if samples is None:
+                samples = self.phase_samples[name] = deque(maxlen=self.window)
+            samples.append(ms)
+        for name, value in self._tick_counters.items():
+            samples = self.counter_samples.get(name)
+            if samples is None:
+                samples = self.counter_samples[name] = deque(maxlen=self.window)
+            samples.append(value)
+
+        if now - self._last_log_time >= self.log_interval:
+            self._last_log_time = now
+            print(self.format_stats())
+
+    # --- Querying ---
+    @staticmethod
+    def _percentile(sorted_values, pct):
+        """Nearest-rank percentile of an already sorted list."""
+        if not sorted_values: return 0.0
+        rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+        return sorted_values[rank]
+
+    def _summarize(self, samples):
+        ordered = sorted(samples)
+        return {
+            'p50': self._percentile(ordered, 50),
+            'p95': self._percentile(ordered, 95),
+            'p99': self._percentile(ordered, 99),
+            'max': ordered[-1] if ordered else 0.0,
+            'mean': (sum(ordered) / len(ordered)) if ordered else 0.0,
+        }
+
+    def get_stats(self):
+        """
+        Returns a dictionary snapshot of the rolling statistics:
+            {'tick': {...}, 'phases': {name: {'p50','p95','p99','max','mean'}},
+             'counters': {name: {'mean','max','last'}}, 'ticks_over_budget': int, 'total_ticks': int}
+        All timings are in milliseconds.
+        """
+        counters = {}
+        for name, samples in self.counter_samples.items():
+            counters[name] = {
+                'mean': (sum(samples) / len(samples)) if samples else 0,
+                'max': max(samples) if samples else 0,
+                'last': samples[-1] if samples else 0,
+            }
+        return {
+            'tick': self._summarize(self.tick_samples),
+            'phases': {name: self._summarize(samples) for name, samples in self.phase_samples.items()},
+            'counters': counters,
+            'ticks_over_budget': self.ticks_over_budget,
+            'total_ticks': self.total_ticks,
+            'budget_ms': self.budget_ms,
+        }
+
+    def format_stats(self):
+        """Formats the rolling statistics as a single log line."""
+        stats = self.get_stats()
+        tick = stats['tick']
+        parts = [f"[PROFILER] tick p50={tick['p50']:.2f} p95={tick['p95']:.2f} p99={tick['p99']:.2f} max={tick['max']:.2f}ms "
+                 f"(over {self.budget_ms:.1f}ms budget: {self.ticks_over_budget}/{self.total_ticks})"]
+        # Slowest phases first so the budget offender is easy to spot
+        for name, s in sorted(stats['phases'].items(), key=lambda kv: kv[1]['p95'], reverse=True):
+            parts.append(f"{name} p50={s['p50']:.2f} p95={s['p95']:.2f} p99={s['p99']:.2f} max={s['max']:.2f}")
+        for name, c in sorted(stats['counters'].items()):
+            parts.append(f"{name} avg={c['mean']:.0f} max={c['max']}")
+        return " | ".join(parts)
+
+    def reset(self):
+        """Clears all collected samples."""
+        self.phase_samples.clear(); self.counter_samples.clear(); self.tick_samples.clear()
+        self.ticks_over_budget = 0; self.total_ticks = 0
@@ -0,0 +1,214 @@
+import socket
+import select
+import sys
+import threading
+import time
+
+from NETconfig import SUBSCRIBER_PORT, RELAY_PORT, RELAY_MAX_SPECTATORS, RELAY_SEND_TIMEOUT
+from net_protocol import pack_message, send_data, receive_frame, unpack_frame
+
+# --- Snapshot Relay ---
+# Connects to the game server's subscriber port as a single privileged subscriber and
+# fans every snapshot frame out to any number of spectators. Frames are forwarded as
+# the exact bytes the server sent (never re-pickled), so the server pays for one
+# connection no matter how many people are watching.
+#
+# Usage:  python relay.py <server_ip> [listen_port]
+# Spectators connect with open_world.py -> "spectate" -> the relay's IP.
+# Loopback test: host a game, run `python relay.py 127.0.0.1`, then spectate 127.0.0.1.
+#
+# Spectators are read-only: the relay never forwards anything back to the server.
+
+
+class SnapshotRelay:
+    """Receives snapshot frames from the server and forwards them to spectator sockets."""
+    def __init__(self, server_ip, server_port=SUBSCRIBER_PORT, listen_port=RELAY_PORT,
+                 max_spectators=RELAY_MAX_SPECTATORS, send_timeout=RELAY_SEND_TIMEOUT):
+        self.server_ip = server_ip
+        self.server_port = server_port
+        self.listen_port = listen_port
+        self.max_spectators = max_spectators
+        self.send_timeout = send_timeout
+
+        self.upstream_socket = None # Connection to the game server
+        self.listen_socket = None # Spectators connect here
+        self.spectators = {} # {spectator_socket: address}
+        self.spectators_lock = threading.Lock()
+        self.latest_state = None # Last unpickled snapshot, used to greet new spectators
+        self.latest_frame = None # Raw bytes of the last snapshot frame
+        self.running = False
+
+        # Simple counters for the periodic status line
+        self.frames_relayed = 0
+        self.bytes_relayed = 0
+
+    # --- Upstream (server) ---
+    def connect_upstream(self):
+        """Subscribes to the server. Returns True on success."""
+        self.upstream_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self.upstream_socket.connect((self.server_ip, self.server_port))
+        except socket.error as e:
+            print(f"[RELAY] Could not connect to server {self.server_ip}:{self.server_port} - {e}")
+            self.upstream_socket = None
+            return False
+
+        initial_data = unpack_frame(receive_frame(self.upstream_socket) or b'')
+        if not initial_data or initial_data.get('type') != 'initial_state':
+            message = initial_data.get('message', 'no initial state') if initial_data else 'no initial state'
+            print(f"[RELAY] Server refused subscription: {message}")
+            self.upstream_socket.close(); self.upstream_socket = None
+            return False
+        self.latest_state = initial_data
+        print(f"[RELAY] Subscribed to server {self.server_ip}:{self.server_port}")
+        return True
+
+    def upstream_loop(self):
+        """Forwards every frame from the server to all spectators until the server goes away."""
+        while self.running:
+            frame = receive_frame(self.upstream_socket)
+            if frame is None:
+                print("[RELAY] Lost connection to server.")
+                self.running = False
+                break
+            self.latest_frame = frame
+            self.latest_state = None # Decoded lazily, only when someone joins
+            self.fan_out(frame)
+
+    def fan_out(self, frame):
+        """Sends the same frame bytes to every spectator, dropping any that stall or disconnect."""
+        with self.spectators_lock:
+            targets = list(self.spectators.keys())
+        dropped = []
+        for spectator in targets:
+            try:
+                spectator.sendall(frame)
+                self.bytes_relayed += len(frame)
+            except (socket.timeout, socket.error, BrokenPipeError, ConnectionResetError) as e:
+                print(f"[RELAY] Dropping spectator {self.spectators.get(spectator)}: {e}")
+                dropped.append(spectator)
+        self.frames_relayed += 1
+        if dropped:
+            with self.spectators_lock:
+                for spectator in dropped:
+                    self.spectators.pop(spectator, None)
+                    try:
+                        spectator.close()
+                    except socket.error:
+                        pass
+
+    # --- Downstream (spectators) ---
+    def _current_initial_state(self):
+        """Builds the 'initial_state' greeting from the newest snapshot."""
+        if self.latest_state is None and self.latest_frame is not None:
+            self.latest_state = unpack_frame(self.latest_frame)
+        state = dict(self.latest_state or {})
+        state['type'] = 'initial_state'
+        state['your_id'] = None # Spectators have no player
+        return state
+
+    def accept_spectator(self):
+        try:
+            conn, addr = self.listen_socket.accept()
+        except socket.error as e:
+            print(f"[RELAY] Error accepting spectator: {e}")
+            return
+        conn.setblocking(True)
+        if len(self.spectators) >= self.max_spectators:
+            print(f"[RELAY] Spectator rejected from {addr}: Relay full.")
+            send_data(conn, {'type': 'error', 'message': 'Relay is full.'})
+            conn.close()
+            return
+        # Slow spectators must never hold up the others
+        conn.settimeout(self.send_timeout)
+        with self.spectators_lock:
+            # Greet inside the lock so the spectator cannot receive a newer frame before its initial state
+            try:
+                conn.sendall(pack_message(self._current_initial_state()))
+            except (socket.timeout, socket.error) as e:
+                print(f"[RELAY] Failed to greet spectator {addr}: {e}")
+                conn.close()
+                return
+            self.spectators[conn] = addr
+        print(f"[RELAY] Spectator connected from {addr} ({len(self.spectators)} watching)")
+
+    def _discard_spectator_input(self, readable):
+        """Spectators are read-only; drain anything they send and notice disconnects."""
+        for spectator in readable:
+            try:
+                data = spectator.recv(4096)
+            except (socket.timeout, socket.error):
+                data = b''
+            if not data:
+                with self.spectators_lock:
+                    addr = self.spectators.pop(spectator, None)
+                try:
+                    spectator.close()
+                except socket.error:
+                    pass
+                print(f"[RELAY] Spectator {addr} disconnected.")
+
+    # --- Main ---
+    def run(self):
+        if not self.connect_upstream():
+            return False
+
+        self.listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self.listen_socket.bind(('0.0.0.0', self.listen_port))
+            self.listen_socket.listen(self.max_spectators)
+        except socket.error as e:
+            print(f"[RELAY] FATAL: Could not bind to port {self.listen_port}: {e}")
+            self.upstream_socket.close()
+            return False
+        print(f"[RELAY] Listening for spectators on port {self.listen_port}...")
+
+        self.running = True
+        threading.Thread(target=self.upstream_loop, daemon=True).start()
+
+        last_status_time = time.time()
+        try:
+            while self.running:
+                with self.spectators_lock:
+                    watched = list(self.spectators.keys())
+                readable, _, _ = select.select([self.listen_socket] + watched, [], [], 0.5)
+                if self.listen_socket in readable:
+                    self.accept_spectator()
+                self._discard_spectator_input([s for s in readable if s is not self.listen_socket])
+
+                if time.time() - last_status_time >= 10.0:
+                    last_status_time = time.time()
+                    print(f"[RELAY] {len(self.spectators)} spectators, {self.frames_relayed} frames, "
+                          f"{self.bytes_relayed / 1024:.0f} KiB relayed")
+        except KeyboardInterrupt:
+            print("[RELAY] Shutting down.")
+        finally:
+            self.close()
+        return True
+
+    def close(self):
+        self.running = False
+        with self.spectators_lock:
+            for spectator in self.spectators:
+                try:
+                    spectator.close()
+                except socket.error:
+                    pass
+            self.spectators.clear()
+        for sock in (self.listen_socket, self.upstream_socket):
+            if sock:
+                try:
+                    sock.close()
+                except socket.error:
+                    pass
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python relay.py <server_ip> [listen_port]")
+        sys.exit(1)
+    relay_listen_port = int(sys.argv[2]) if len(sys.argv) > 2 else RELAY_PORT
+    relay = SnapshotRelay(sys.argv[1], listen_port=relay_listen_port)
+    if not relay.run():
+        sys.exit(1)
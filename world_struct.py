@@ -11,6 +11,8 @@ from world_structures.river_generation import generate_rivers
 
 # --- Import from custom modules ---
 from world_structures.quadtree import QuadtreeNode
+from world_structures.static_index import StaticGridIndex
+from world_structures.tile_grid import TileGridCollider
 from world_structures.utils import is_point_in_polygon, point_segment_distance_sq
 from asset.assets import load_all_sprites
 from world_structures.generation import (
@@ -19,6 +21,8 @@ from world_structures.generation import (
     generate_wall_rects, generate_wall_tile_data_rotated
 )
 from world_structures.world_features import Zone
+from world_structures.wall_segments import WallSegment, build_wall_segments
+from world_structures.distance_field import WallDistanceField
 
 
 # --- Import external dependencies (like dungeon generator) ---
@@ -58,6 +62,7 @@ def generate_world_elements(loaded_sprites):
         vx = FOREST_CENTER_X + current_radius_x * math.cos(current_angle); vy = FOREST_CENTER_Y + current_radius_y * math.sin(current_angle)
         forest_poly_points.append((int(vx), int(vy)))
     forest_zone = Zone("forest", forest_poly_points, FOREST_GROUND_COLOR)
+    forest_zone.build_mask() # O(1) membership tests for grass, trees, buildings and spawns
 
 
     # --- Kingdom Generation (Circular) ---
@@ -71,6 +76,8 @@ def generate_world_elements(loaded_sprites):
         kingdom_wall_vertices.append((int(vx), int(vy)))
     # kingdom_poly_points = kingdom_wall_vertices # Old way
     kingdom_zone = Zone("kingdom", kingdom_wall_vertices, KINGDOM_GROUND_COLOR)
+    kingdom_zone.build_mask() # O(1) membership tests for grass, trees, buildings and spawns
+    kingdom_wall_field = WallDistanceField(kingdom_wall_vertices) # O(1) distance-to-wall for placement and steering
     wall_verts_count = len(kingdom_wall_vertices)
 
 
@@ -143,20 +150,20 @@ def generate_world_elements(loaded_sprites):
          print("Wall sprites not loaded, skipping wall tile generation.")
 
 
-    # --- Generate wall COLLISION rects using imported function ---
+    # --- Generate wall COLLISION segments (one thick segment per wall edge) ---
     if gate_segment_index != -1 and gate_p1_world and gate_p2_world:
-        print(f"Generating wall collision rects with opening at segment {gate_segment_index}")
-        kingdom_wall_rects = generate_wall_rects( 
+        print(f"Generating wall collision segments with opening at segment {gate_segment_index}")
+        kingdom_wall_rects = build_wall_segments(
             kingdom_wall_vertices, KINGDOM_WALL_THICKNESS, gate_segment_index, gate_p1_world, gate_p2_world
         )
     else: # No gate opening (either segment_index is -1, or p1/p2 are None)
-        print("Generating solid wall collision rects (no gate opening).")
+        print("Generating solid wall collision segments (no gate opening).")
         # Ensure gate_p1/p2 are None if there's no opening, even if segment_index was valid but opening calc failed
         actual_gate_p1 = gate_p1_world if gate_segment_index != -1 else None
         actual_gate_p2 = gate_p2_world if gate_segment_index != -1 else None
         actual_gate_segment_index = gate_segment_index if actual_gate_p1 and actual_gate_p2 else -1
 
-        kingdom_wall_rects = generate_wall_rects( 
+        kingdom_wall_rects = build_wall_segments(
             kingdom_wall_vertices, KINGDOM_WALL_THICKNESS, actual_gate_segment_index, actual_gate_p1, actual_gate_p2
         )
 
@@ -219,7 +226,7 @@ def generate_world_elements(loaded_sprites):
 
 
             # Check distance to wall segments (using imported is_too_close_to_wall logic)
-            if is_too_close_to_wall(building_center, kingdom_wall_vertices, WALL_AVOIDANCE_BUILDING):
+            if is_too_close_to_wall(building_center, kingdom_wall_vertices, WALL_AVOIDANCE_BUILDING, kingdom_wall_field):
                  continue # Too close to wall
 
             # Check overlap with existing buildings, towers, gatehouses (using inflated rect for spacing)
@@ -250,7 +257,8 @@ def generate_world_elements(loaded_sprites):
     if tree_sprite_info and forest_zone and kingdom_zone: # Check if sprites and zones loaded
          forest_trees, tree_colliders = generate_trees_poisson_disk( 
              forest_zone=forest_zone, kingdom_zone=kingdom_zone, kingdom_wall_vertices=kingdom_wall_vertices, # Pass Zone objects
-             min_spacing=MIN_TREE_SPACING, candidates_k=PDS_CANDIDATES, wall_avoid_dist=WALL_AVOIDANCE_TREE, world_rect=world_boundary_rect
+             min_spacing=MIN_TREE_SPACING, candidates_k=PDS_CANDIDATES, wall_avoid_dist=WALL_AVOIDANCE_TREE, world_rect=world_boundary_rect,
+             wall_field=kingdom_wall_field
          )
     else:
          if not tree_sprite_info: print("Tree sprite not loaded, skipping tree generation.")
@@ -266,6 +274,7 @@ def generate_world_elements(loaded_sprites):
     return {
         "forest_zone": forest_zone, "forest_trees": forest_trees, # Store Zone object
         "kingdom_zone": kingdom_zone, "kingdom_wall_vertices": kingdom_wall_vertices, # Store Zone object, keep vertices for now for wall gen
+        "kingdom_wall_field": kingdom_wall_field, # WallDistanceField around the kingdom ring
         "kingdom_structures": kingdom_structures, # Buildings
         "gate_info": {"segment_index": gate_segment_index, "p1": gate_p1_world, "p2": gate_p2_world, "mid": gate_midpoint_world},
         "colliders": all_colliders, # Combined collision shapes
@@ -276,7 +285,7 @@ def generate_world_elements(loaded_sprites):
         # Keep separate lists for potential specific uses
         "tree_colliders_only": tree_colliders,
         "building_colliders_only": building_colliders,
-        "wall_colliders_only": kingdom_wall_rects, # Collision rects
+        "wall_colliders_only": kingdom_wall_rects, # Collision WallSegments
         "tower_colliders_only": tower_colliders,
         "gatehouse_colliders_only": gatehouse_colliders,
         "loaded_sprites": loaded_sprites # Pass loaded sprites through
@@ -375,6 +384,12 @@ def populate_quadtree_with_overworld(quadtree, overworld_colliders):
         print("Warning: No colliders provided for overworld quadtree population.")
         return
     for original_collider_rect in overworld_colliders:
+        if isinstance(original_collider_rect, WallSegment):
+            # The quadtree only stores Rects; fall back to square stamps along the segment
+            for stamp_rect in original_collider_rect.to_stamp_rects():
+                if quadtree.insert(stamp_rect.clamp(quadtree.boundary)): insert_count += 1
+                else: fail_count += 1
+            continue
         if not isinstance(original_collider_rect, pygame.Rect):
              print(f"Warning: Skipping invalid collider item: {original_collider_rect}")
              fail_count += 1; continue
@@ -387,3 +402,58 @@ def populate_quadtree_with_overworld(quadtree, overworld_colliders):
             else: print(f"ERROR: Failed Quadtree insert even after clamping: {clamped_rect} (Original: {original_collider_rect})"); fail_count += 1
         else: fail_count += 1 # Clamped rect became invalid
     print(f"Overworld Quadtree population complete. Inserted: {insert_count}, Failed/Skipped: {fail_count}")
+
+def build_overworld_static_index(boundary, overworld_colliders):
+    """Bulk-builds the packed StaticGridIndex from overworld colliders (same filtering as the quadtree).
+       WallSegments are stored as-is and returned by queries alongside the Rects."""
+    boundary = pygame.Rect(boundary)
+    valid_rects = []; fail_count = 0
+    print("Building static collision index for Overworld colliders...")
+    for original_collider_rect in overworld_colliders or []:
+        if isinstance(original_collider_rect, WallSegment):
+            valid_rects.append(original_collider_rect); continue # Indexed by its bounding rect
+        if not isinstance(original_collider_rect, pygame.Rect):
+             print(f"Warning: Skipping invalid collider item: {original_collider_rect}")
+             fail_count += 1; continue
+        if original_collider_rect.width <= 0 or original_collider_rect.height <= 0: # Check for invalid rects
+            fail_count += 1; continue
+        # Clamp collider rects to the world boundary, as populate_quadtree_with_overworld does
+        clamped_rect = original_collider_rect.clamp(boundary)
+        if clamped_rect.width > 0 and clamped_rect.height > 0: valid_rects.append(clamped_rect)
+        else: fail_count += 1
+    static_index = StaticGridIndex(boundary, valid_rects)
+    print(f"Overworld static index complete. Inserted: {len(static_index)}, Failed/Skipped: {fail_count}")
+    return static_index
+
+
+# --- Per-Mode Collision Index ---
+def get_world_dimensions(game_mode):
+    """Returns the effective (width, height) in world pixels for 'overworld' or 'dungeon'."""
+    if game_mode == "dungeon":
+        return DUNGEON_GRID_WIDTH * DUNGEON_TILE_SIZE, DUNGEON_GRID_HEIGHT * DUNGEON_TILE_SIZE
+    return WORLD_WIDTH, WORLD_HEIGHT
+
+def build_collision_index(world_data, game_mode):
+    """
+    Creates a fresh collision index sized and populated for one game mode, so
+    several modes (world instances) can each own an independent index.
+    The overworld's colliders never move, so it gets the packed StaticGridIndex;
+    the dungeon is already a tile grid, so it is queried directly (TileGridCollider).
+    Both expose query(rect) -> list of Rects.
+
+    Returns:
+        tuple: (collision_quadtree, effective_world_width, effective_world_height)
+    """
+    if game_mode not in ("overworld", "dungeon"):
+        print(f"ERROR: Unknown game_state '{game_mode}'. Defaulting to overworld bounds for quadtree.")
+        game_mode = "overworld"
+    world_w, world_h = get_world_dimensions(game_mode)
+    world_boundary_rect = pygame.Rect(0, 0, world_w, world_h)
+    if game_mode == "dungeon":
+        dungeon_grid = world_data.get("dungeon_grid")
+        if not dungeon_grid:
+            print("Warning: No dungeon grid provided for dungeon collision.")
+        return TileGridCollider(dungeon_grid, DUNGEON_TILE_SIZE, TILE_WALL), world_w, world_h
+    if "colliders" not in world_data: # Ensure colliders exist before populating
+        print("Warning: No 'colliders' found in world_data for collision index population.")
+    return build_overworld_static_index(world_boundary_rect, world_data.get("colliders")), world_w, world_h
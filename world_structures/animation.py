@@ -0,0 +1,87 @@
+import pygame
+
+from world_structures.world_constants import ANIMATION_SPEED_MS, ANIMATION_CLOCK_RESYNC_MS
+
+ANIMATION_NAMES = ('idle', 'walk', 'attack', 'hurt', 'death')
+LOOPING_ANIMATIONS = ('idle', 'walk') # Loop forever and can always be interrupted (count as finished)
+HOLD_LAST_FRAME = ('death',) # One-shots that stay on their last frame (the others show frame 0 once done)
+
+
+# --- Shared Animation Clock ---
+class AnimationClock:
+    """
+    The millisecond clock every animation is timed against. Advanced once per server
+    tick / client frame with tick(), instead of each entity polling pygame.time.get_ticks().
+    Clients sync() it to the server's snapshot time so replicated start times can be
+    used as they are and frames are derived locally.
+    """
+    def __init__(self):
+        self.offset_ms = 0 # (Client) Server time minus local time
+        self.synced = False
+        self.now_ms = pygame.time.get_ticks()
+
+    def tick(self):
+        self.now_ms = pygame.time.get_ticks() + self.offset_ms
+        return self.now_ms
+
+    def sync(self, server_ms):
+        """(Client) Lines the clock up with a snapshot's server time (the least-delayed snapshot wins)."""
+        offset = server_ms - pygame.time.get_ticks()
+        if not self.synced or offset > self.offset_ms or offset < self.offset_ms - ANIMATION_CLOCK_RESYNC_MS:
+            self.offset_ms = offset; self.synced = True
+            self.tick()
+
+ANIMATION_CLOCK = AnimationClock()
+
+
+# --- Frame Tables ---
+def frame_counts(frames_by_name):
+    """{anim_type: number of frames} for an archetype's frame lists."""
+    return {name: len(frames) if frames else 0 for name, frames in frames_by_name.items()}
+
+
+def animation_frame(anim_type, frame_count, elapsed_ms):
+    """Frame index `elapsed_ms` into an animation."""
+    if frame_count <= 0: return 0
+    step = max(0, int(elapsed_ms // ANIMATION_SPEED_MS))
+    if anim_type in LOOPING_ANIMATIONS: return step % frame_count
+    if step < frame_count: return step
+    return frame_count - 1 if anim_type in HOLD_LAST_FRAME else 0
+
+
+def animation_finished(anim_type, frame_count, elapsed_ms):
+    """One-shots finish after their last frame; looping (and frameless) animations always count as finished."""
+    if anim_type in LOOPING_ANIMATIONS or frame_count <= 0: return True
+    return elapsed_ms >= frame_count * ANIMATION_SPEED_MS
+
+
+def frame_reached(frame_index, elapsed_ms):
+    """Whether an animation `elapsed_ms` in has reached frame `frame_index` (-1 = never)."""
+    return frame_index >= 0 and elapsed_ms >= frame_index * ANIMATION_SPEED_MS
+
+
+class Animated:
+    """
+    Mixin for entities animated from (current_animation_type, anim_start_ms) on the shared
+    clock. The entity provides archetype.frame_counts; the current frame and whether the
+    animation finished are computed on demand, so nothing is stepped per tick.
+    """
+    __slots__ = ()
+
+    def start_animation(self, anim_type):
+        """Switches to (or restarts) an animation now."""
+        self.current_animation_type = anim_type
+        self.anim_start_ms = ANIMATION_CLOCK.now_ms
+
+    def animation_elapsed_ms(self):
+        return ANIMATION_CLOCK.now_ms - self.anim_start_ms
+
+    @property
+    def current_frame_index(self):
+        anim_type = self.current_animation_type
+        return animation_frame(anim_type, self.archetype.frame_counts.get(anim_type, 0), ANIMATION_CLOCK.now_ms - self.anim_start_ms)
+
+    @property
+    def animation_finished(self):
+        anim_type = self.current_animation_type
+        return animation_finished(anim_type, self.archetype.frame_counts.get(anim_type, 0), ANIMATION_CLOCK.now_ms - self.anim_start_ms)
@@ -0,0 +1,74 @@
+from world_structures.world_constants import COLLIDER_CACHE_MARGIN
+from world_structures.wall_segments import split_segments
+
+# --- Temporal-Coherence Collider Cache ---
+class ColliderCache:
+    """
+    Per-mover cache of static colliders around a "fat" region.
+
+    Movers query with a rect inflated by their per-tick reach. The cache queries the
+    index once with that rect inflated by a further `margin` and keeps the result.
+    While later query rects stay inside the fat region, the cached list is returned
+    unchanged. It is a superset of the exact result, and any collider the mover can
+    touch this tick is in it. The cache refreshes when the mover leaves the region,
+    the index is a different object (e.g. after an instance transfer), or the index's
+    `version` changes.
+
+    Results are split once per refresh into Rect colliders and WallSegments,
+    which movers resolve differently.
+    """
+    __slots__ = ('margin', 'region', 'colliders', 'segments', 'index', 'index_version')
+
+    def __init__(self, margin=COLLIDER_CACHE_MARGIN):
+        self.margin = margin
+        self.invalidate()
+
+    def invalidate(self):
+        self.region = None; self.colliders = (); self.segments = (); self.index = None; self.index_version = None
+
+    def covers(self, index, query_rect):
+        """True if the cached colliders are valid for query_rect against index."""
+        return (self.region is not None and index is self.index
+                and getattr(index, 'version', 0) == self.index_version
+                and self.region.contains(query_rect))
+
+    def fat_region(self, query_rect):
+        return query_rect.inflate(self.margin * 2, self.margin * 2)
+
+    def store(self, index, region, colliders):
+        self.region = region
+        self.colliders, self.segments = split_segments(colliders)
+        self.index = index; self.index_version = getattr(index, 'version', 0)
+
+    def query(self, index, query_rect):
+        """
+        Returns (colliders, segments, refreshed): the cached lists if still valid,
+        otherwise the result of a fresh index query over the fat region (refreshed=True).
+        """
+        if self.covers(index, query_rect):
+            return self.colliders, self.segments, False
+        region = self.fat_region(query_rect)
+        self.store(index, region, index.query(region))
+        return self.colliders, self.segments, True
+
+
+def refresh_collider_caches(movers, index):
+    """
+    Collider broadphase for a batch of movers: each keeps a cached "fat" region of colliders
+    and only movers that left theirs are re-queried, all in one batched pass when supported.
+    Returns the number of index queries made.
+    """
+    stale_movers = []; stale_regions = []
+    for mover in movers:
+        query_range = mover.rect.inflate(mover.speed * 2 + 32, mover.speed * 2 + 32)
+        if not mover.collider_cache.covers(index, query_range):
+            stale_movers.append(mover)
+            stale_regions.append(mover.collider_cache.fat_region(query_range))
+    if stale_regions:
+        if hasattr(index, 'query_batch'):
+            refreshed = index.query_batch(stale_regions)
+        else:
+            refreshed = [index.query(region) for region in stale_regions]
+        for mover, region, colliders in zip(stale_movers, stale_regions, refreshed):
+            mover.collider_cache.store(index, region, colliders)
+    return len(stale_regions)
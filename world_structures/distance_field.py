@@ -0,0 +1,105 @@
+import math
+from array import array
+from world_structures.world_constants import WALL_FIELD_CELL_SIZE, WALL_FIELD_MARGIN
+from world_structures.utils import point_segment_distance_sq, points_segments_min_distance_sq, polygon_edges, np
+
+# --- Wall Distance Field ---
+class WallDistanceField:
+    """
+    Distance to the nearest edge of a closed wall polygon, sampled once on a coarse
+    grid of nodes. distance() is a bilinear lookup, so "how far is the wall" costs
+    O(1) instead of O(segments). Because distance is 1-Lipschitz, the bilinear value
+    is within cell_size / sqrt(2) of the truth; is_closer_than() only runs the exact
+    segment test when the lookup lands inside that band around the threshold, so it
+    answers exactly like generation.is_too_close_to_wall().
+    """
+    def __init__(self, wall_vertices, cell_size=WALL_FIELD_CELL_SIZE, margin=WALL_FIELD_MARGIN):
+        self.edges = polygon_edges(wall_vertices) if wall_vertices and len(wall_vertices) >= 2 else []
+        self.cell_size = cell_size
+        self.margin = margin
+        self.error_bound = cell_size / math.sqrt(2) + 1e-6 # Max bilinear error (+ float slack)
+        if not self.edges:
+            self.origin_x = self.origin_y = 0; self.cols = self.rows = 0
+            self.values = array('d'); return
+
+        min_x = min(v[0] for v in wall_vertices); max_x = max(v[0] for v in wall_vertices)
+        min_y = min(v[1] for v in wall_vertices); max_y = max(v[1] for v in wall_vertices)
+        self.origin_x = min_x - margin; self.origin_y = min_y - margin
+        self.cols = int(math.ceil((max_x - min_x + 2 * margin) / cell_size)) + 1 # Nodes, not cells
+        self.rows = int(math.ceil((max_y - min_y + 2 * margin) / cell_size)) + 1
+
+        # Sample every node (rows of nodes, x fastest)
+        node_xs = [self.origin_x + cx * cell_size for cx in range(self.cols)] * self.rows
+        node_ys = [self.origin_y + cy * cell_size for cy in range(self.rows) for _ in range(self.cols)]
+        dist_sq = points_segments_min_distance_sq(node_xs, node_ys, self.edges)
+        if np is not None:
+            self.values = array('d', np.sqrt(dist_sq).tobytes())
+        else:
+            self.values = array('d', (math.sqrt(d) for d in dist_sq))
+
+    def _cell(self, x, y):
+        """(index of the top-left node, fx, fy) for a point inside the grid, else None."""
+        gx = (x - self.origin_x) / self.cell_size; gy = (y - self.origin_y) / self.cell_size
+        cx = int(gx); cy = int(gy)
+        if gx < 0 or gy < 0 or cx >= self.cols - 1 or cy >= self.rows - 1: return None
+        return cy * self.cols + cx, gx - cx, gy - cy
+
+    def distance(self, x, y):
+        """Approximate distance to the wall (within error_bound). Points beyond the grid use the exact distance."""
+        cell = self._cell(x, y)
+        if cell is None: return self.exact_distance(x, y) if self.edges else float('inf')
+        idx, fx, fy = cell; values = self.values; cols = self.cols
+        top = values[idx] + (values[idx + 1] - values[idx]) * fx
+        bottom = values[idx + cols] + (values[idx + cols + 1] - values[idx + cols]) * fx
+        return top + (bottom - top) * fy
+
+    def exact_distance(self, x, y):
+        if not self.edges: return float('inf')
+        return math.sqrt(min(point_segment_distance_sq(x, y, *edge) for edge in self.edges))
+
+    def is_closer_than(self, x, y, min_dist):
+        """Exactly `distance to the nearest edge < min_dist`, usually without touching the edges."""
+        if not self.edges: return False
+        cell = self._cell(x, y)
+        if cell is None:
+            # Beyond the grid the wall is at least `margin` away
+            if min_dist <= self.margin: return False
+        else:
+            approx = self.distance(x, y)
+            if approx >= min_dist + self.error_bound: return False
+            if approx < min_dist - self.error_bound: return True
+        # Near the threshold: same test as is_too_close_to_wall
+        min_dist_sq = min_dist * min_dist
+        for edge in self.edges:
+            if point_segment_distance_sq(x, y, *edge) < min_dist_sq: return True
+        return False
+
+    def gradient(self, x, y):
+        """Unit direction of increasing wall distance (away from the wall), or (0, 0) beyond the grid / on a ridge."""
+        cell = self._cell(x, y)
+        if cell is None: return 0.0, 0.0
+        idx, fx, fy = cell; values = self.values; cols = self.cols
+        v00 = values[idx]; v10 = values[idx + 1]; v01 = values[idx + cols]; v11 = values[idx + cols + 1]
+        gx = (v10 - v00) * (1 - fy) + (v11 - v01) * fy
+        gy = (v01 - v00) * (1 - fx) + (v11 - v10) * fx
+        length = math.hypot(gx, gy)
+        if length < 1e-9: return 0.0, 0.0
+        return gx / length, gy / length
+
+    def steer(self, x, y, dir_x, dir_y, influence_dist):
+        """
+        Bends a unit movement direction so it slides along the wall instead of into it.
+        Within influence_dist the into-wall component is removed, fully at the wall and
+        fading out with distance. Returns the adjusted (dir_x, dir_y), still unit length.
+        """
+        if not self.edges: return dir_x, dir_y
+        dist = self.distance(x, y)
+        if dist >= influence_dist: return dir_x, dir_y
+        away_x, away_y = self.gradient(x, y)
+        into_wall = dir_x * away_x + dir_y * away_y
+        if into_wall >= 0: return dir_x, dir_y # Already moving away from (or along) the wall
+        weight = 1.0 - max(0.0, dist) / influence_dist
+        new_x = dir_x - away_x * into_wall * weight; new_y = dir_y - away_y * into_wall * weight
+        length = math.hypot(new_x, new_y)
+        if length < 1e-9: return dir_x, dir_y
+        return new_x / length, new_y / length
@@ -271,4 +271,14 @@ def draw_kingdom_structures(screen, camera_x, camera_y, world_elements):
             draw_screen_x, draw_screen_y = apply_camera_to_point(draw_world_x, draw_world_y, camera_x, camera_y)
             blit_rect_screen = surface_to_blit.get_rect(topleft=(draw_screen_x, draw_screen_y))
             if screen_rect_for_culling.colliderect(blit_rect_screen):
-                screen.blit(surface_to_blit, blit_rect_screen.topleft)
\ No newline at end of file
+                screen.blit(surface_to_blit, blit_rect_screen.topleft)
+
+def draw_portals(screen, camera_x, camera_y, portals):
+    """Draws instance portals (e.g. the dungeon entrance) as simple outlined squares."""
+    camera_world_rect = pygame.Rect(camera_x, camera_y, SCREEN_WIDTH, SCREEN_HEIGHT)
+    for portal in portals:
+        portal_rect = pygame.Rect(portal['rect'])
+        if camera_world_rect.colliderect(portal_rect):
+            screen_rect = apply_camera_to_rect(portal_rect, camera_x, camera_y)
+            pygame.draw.rect(screen, PORTAL_COLOR, screen_rect)
+            pygame.draw.rect(screen, (0, 0, 0), screen_rect, 2)
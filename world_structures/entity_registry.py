@@ -0,0 +1,95 @@
+from world_structures.world_constants import ENTITY_SLOT_BITS
+
+ENTITY_SLOT_MASK = (1 << ENTITY_SLOT_BITS) - 1
+
+# --- Entity Registry ---
+class EntityRegistry:
+    """
+    One id space for every simulated entity in an instance (players, enemies, NPCs).
+
+    An id packs (generation << ENTITY_SLOT_BITS) | slot. Removing an entity puts its
+    slot on the free list and bumps the slot's generation, so a stale id (an old
+    network key, a cache entry) never resolves to whoever reuses the slot.
+    Each kind keeps its live entities packed in a dense list (removal swaps the last
+    one into the hole), so add/remove/lookup are O(1) and iteration only ever walks
+    live entities.
+    """
+    def __init__(self):
+        self.generations = [] # Per slot: current generation
+        self.slot_kinds = [] # Per slot: kind of the entity in it (None while free)
+        self.slot_dense = [] # Per slot: index of its entity in the kind's dense list
+        self.free_slots = [] # Reused last-in first-out
+        self.dense = {} # {kind: [entity, ...]} packed live entities
+        self.dense_slots = {} # {kind: [slot, ...]} parallel to dense
+
+    def __len__(self):
+        return len(self.generations) - len(self.free_slots)
+
+    def __contains__(self, entity_id):
+        return self._slot(entity_id) >= 0
+
+    def _slot(self, entity_id):
+        """Slot of a live id, or -1 for stale/unknown ids."""
+        if entity_id is None: return -1
+        slot = entity_id & ENTITY_SLOT_MASK
+        if slot >= len(self.generations) or self.slot_kinds[slot] is None: return -1
+        if self.generations[slot] != entity_id >> ENTITY_SLOT_BITS: return -1
+        return slot
+
+    def add(self, entity, kind):
+        """Registers an entity under `kind` ('player', 'enemy', 'npc') and returns its new id."""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.generations)
+            if slot > ENTITY_SLOT_MASK:
+                raise OverflowError(f"EntityRegistry is full ({slot} slots)")
+            self.generations.append(0); self.slot_kinds.append(None); self.slot_dense.append(0)
+        entities = self.entities(kind)
+        self.slot_kinds[slot] = kind
+        self.slot_dense[slot] = len(entities)
+        entities.append(entity)
+        self.dense_slots[kind].append(slot)
+        return (self.generations[slot] << ENTITY_SLOT_BITS) | slot
+
+    def remove(self, entity_id):
+        """Unregisters the entity with this id and returns it (None if the id is stale/unknown)."""
+        slot = self._slot(entity_id)
+        if slot < 0: return None
+        kind = self.slot_kinds[slot]
+        entities = self.dense[kind]; slots = self.dense_slots[kind]
+        index = self.slot_dense[slot]
+        entity = entities[index]
+        # Swap-remove: the last entity of this kind fills the hole
+        last_entity = entities.pop(); last_slot = slots.pop()
+        if index < len(entities):
+            entities[index] = last_entity; slots[index] = last_slot
+            self.slot_dense[last_slot] = index
+        self.slot_kinds[slot] = None
+        self.generations[slot] += 1
+        self.free_slots.append(slot)
+        return entity
+
+    def get(self, entity_id, default=None):
+        slot = self._slot(entity_id)
+        if slot < 0: return default
+        return self.dense[self.slot_kinds[slot]][self.slot_dense[slot]]
+
+    def entities(self, kind):
+        """
+        The dense list of live entities of a kind. Owned by the registry: do not modify it,
+        and iterate over a copy if entities are added/removed during the loop.
+        """
+        entities = self.dense.get(kind)
+        if entities is None:
+            entities = self.dense[kind] = []
+            self.dense_slots[kind] = []
+        return entities
+
+    def ids(self, kind):
+        """Ids of the live entities of a kind, in the same order as entities(kind)."""
+        generations = self.generations
+        return [(generations[slot] << ENTITY_SLOT_BITS) | slot for slot in self.dense_slots.get(kind, ())]
+
+    def count(self, kind):
+        return len(self.dense.get(kind, ()))
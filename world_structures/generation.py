@@ -2,14 +2,37 @@ import pygame
 import random
 import math
 from .world_constants import * # Import all constants needed for generation
-from .utils import is_point_in_polygon, point_segment_distance_sq # Import required utils
+from .utils import is_point_in_polygon, point_segment_distance_sq, np # Import required utils (np is None without NumPy)
 from .quadtree import QuadtreeNode # Needed for PDS tree generation
 # No direct import of Zone needed here if generate_world_elements creates them
 # and these functions just consume their polygon_points or use their methods.
 
 # --- Grass Generation ---
+GRASS_COLORS = [(50, 180, 50), (60, 200, 60), (40, 160, 40)]
+GRASS_BATCH_MIN = 4096 # Smallest candidate batch sampled at once by the bulk path
+
+def _zone_points_inside(zone, xs, ys):
+    """Bulk membership for an optional zone (all False if the zone is missing)."""
+    if not zone: return np.zeros(len(xs), dtype=bool)
+    return np.asarray(zone.points_inside(xs, ys), dtype=bool)
+
 def generate_grass_details(count, kingdom_zone, forest_zone):
      details = []; print(f"Generating {count} grass details (avoiding kingdom and forest)..."); placed_count = 0; attempts = 0; max_attempts = count * 20
+     if np is not None:
+         # Bulk path: sample a batch of candidates, test them all against both zones, keep the first valid ones
+         while placed_count < count and attempts < max_attempts:
+             batch = min(max_attempts - attempts, max(GRASS_BATCH_MIN, (count - placed_count) * 2))
+             xs = np.random.randint(0, WORLD_WIDTH - 5 + 1, batch); ys = np.random.randint(0, WORLD_HEIGHT - 10 + 1, batch)
+             valid = ~((xs == 0) & (ys == 0)) # Ensure point is not exactly at origin if that's invalid
+             valid &= ~_zone_points_inside(kingdom_zone, xs, ys)
+             valid &= ~_zone_points_inside(forest_zone, xs, ys)
+             chosen = np.nonzero(valid)[0][:count - placed_count]
+             # Attempts only count candidates up to the last one used, like the one-at-a-time loop
+             attempts += int(chosen[-1]) + 1 if placed_count + len(chosen) >= count else batch
+             heights = np.random.randint(5, 11, len(chosen)); colors = np.random.randint(0, len(GRASS_COLORS), len(chosen))
+             for world_x, world_y, height, color_idx in zip(xs[chosen].tolist(), ys[chosen].tolist(), heights.tolist(), colors.tolist()):
+                 details.append({'rect': pygame.Rect(world_x, world_y, 2, height), 'color': GRASS_COLORS[color_idx]})
+             placed_count += len(chosen)
      while placed_count < count and attempts < max_attempts:
          attempts += 1; world_x = random.randint(0, WORLD_WIDTH - 5); world_y = random.randint(0, WORLD_HEIGHT - 10)
          potential_pos = (world_x, world_y)
@@ -17,7 +40,7 @@ def generate_grass_details(count, kingdom_zone, forest_zone):
          if potential_pos != (0,0) and \
             (not kingdom_zone or not kingdom_zone.is_point_inside(potential_pos)) and \
             (not forest_zone or not forest_zone.is_point_inside(potential_pos)):
-             height = random.randint(5, 10); color = random.choice([(50, 180, 50), (60, 200, 60), (40, 160, 40)])
+             height = random.randint(5, 10); color = random.choice(GRASS_COLORS)
              details.append({'rect': pygame.Rect(world_x, world_y, 2, height), 'color': color}); placed_count += 1
      if attempts >= max_attempts: print(f"Warning: Reached max attempts ({max_attempts}) placing grass. Only placed {placed_count}/{count}.")
      elif placed_count < count: print(f"Warning: Could only place {placed_count}/{count} grass details satisfying constraints.")
@@ -29,23 +52,36 @@ def filter_grass_details(details, kingdom_zone, forest_zone):
     initial_count = len(details); print(f"Filtering {initial_count} loaded grass details against kingdom and forest boundaries...")
     filtered_details = []
     removed_kingdom = 0; removed_forest = 0
+    valid_details = []
     for detail in details:
         # Ensure detail has a 'rect' key before accessing center
-        if 'rect' in detail:
+        if 'rect' in detail: valid_details.append(detail)
+        else: print(f"Warning: Skipping grass detail missing 'rect': {detail}")
+    if np is not None:
+        # Bulk path: test every center against both zones at once
+        centers = [detail['rect'].center for detail in valid_details]
+        xs = np.fromiter((c[0] for c in centers), dtype=np.float64, count=len(centers))
+        ys = np.fromiter((c[1] for c in centers), dtype=np.float64, count=len(centers))
+        in_kingdom_all = _zone_points_inside(kingdom_zone, xs, ys)
+        in_forest_all = _zone_points_inside(forest_zone, xs, ys) & ~in_kingdom_all
+        removed_kingdom = int(in_kingdom_all.sum()); removed_forest = int(in_forest_all.sum())
+        keep = ~(in_kingdom_all | in_forest_all)
+        filtered_details = [detail for detail, kept in zip(valid_details, keep.tolist()) if kept]
+    else:
+        for detail in valid_details:
              in_kingdom = kingdom_zone and kingdom_zone.is_point_inside(detail['rect'].center)
              in_forest = forest_zone and forest_zone.is_point_inside(detail['rect'].center)
              if not in_kingdom and not in_forest: filtered_details.append(detail)
              elif in_kingdom: removed_kingdom += 1
              elif in_forest: removed_forest += 1
-        else:
-             print(f"Warning: Skipping grass detail missing 'rect': {detail}")
     final_count = len(filtered_details)
     print(f"Filtered out {removed_kingdom} grass details inside kingdom and {removed_forest} inside forest. {final_count} remaining.")
     return filtered_details
 
 # --- Tree Generation ---
-def is_too_close_to_wall(point, wall_vertices, min_dist):
-    """Checks if a point is closer than min_dist to any segment of the wall polygon."""
+def is_too_close_to_wall(point, wall_vertices, min_dist, wall_field=None):
+    """Checks if a point is closer than min_dist to any segment of the wall polygon (O(1) with a WallDistanceField)."""
+    if wall_field is not None: return wall_field.is_closer_than(point[0], point[1], min_dist)
     if not wall_vertices or len(wall_vertices) < 2: return False
     min_dist_sq = min_dist * min_dist; px, py = point
     for i in range(len(wall_vertices)):
@@ -55,7 +91,7 @@ def is_too_close_to_wall(point, wall_vertices, min_dist):
     return False
 
 def generate_trees_poisson_disk(forest_zone, kingdom_zone, kingdom_wall_vertices,
-                                min_spacing, candidates_k, wall_avoid_dist, world_rect):
+                                min_spacing, candidates_k, wall_avoid_dist, world_rect, wall_field=None):
     """Generates tree positions using Poisson Disk Sampling within forest, avoiding kingdom/walls."""
     print(f"Generating forest trees using Poisson Disk Sampling (min spacing: {min_spacing})...")
     forest_trees = []
@@ -83,7 +119,7 @@ def generate_trees_poisson_disk(forest_zone, kingdom_zone, kingdom_wall_vertices
         pt = (int(px), int(py))
         if forest_zone.is_point_inside(pt) and \
            (not kingdom_zone or not kingdom_zone.is_point_inside(pt)) and \
-           (not is_too_close_to_wall(pt, kingdom_wall_vertices, wall_avoid_dist)):
+           (not is_too_close_to_wall(pt, kingdom_wall_vertices, wall_avoid_dist, wall_field)):
              start_point = pt
              placed_points.append(start_point)
              active_list.append(start_point)
@@ -111,7 +147,7 @@ def generate_trees_poisson_disk(forest_zone, kingdom_zone, kingdom_wall_vertices
             if not world_rect.collidepoint(candidate_point): continue # Outside world bounds
             if not forest_zone.is_point_inside(candidate_point): continue # Outside forest
             if kingdom_zone and kingdom_zone.is_point_inside(candidate_point): continue # Inside kingdom
-            if is_too_close_to_wall(candidate_point, kingdom_wall_vertices, wall_avoid_dist): continue # Too close to wall
+            if is_too_close_to_wall(candidate_point, kingdom_wall_vertices, wall_avoid_dist, wall_field): continue # Too close to wall
 
             # Check proximity to existing points using quadtree
             search_radius = min_spacing * 1.01 # Check slightly larger than min_spacing
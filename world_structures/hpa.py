@@ -0,0 +1,369 @@
+import hashlib
+import heapq
+import math
+import os
+import pickle
+import time
+from collections import deque
+from world_structures.world_constants import (HPA_CLUSTER_CELLS, HPA_ENTRANCE_SPLIT, HPA_SEARCH_BUDGET_MS,
+                                              SAVE_FILE_HPA)
+from world_structures.navigation import _UNREACHED
+
+# --- Hierarchical Pathfinding (HPA*) ---
+# The NavGrid is cut into square clusters. Walkable openings on cluster borders become
+# transition nodes; nodes in the same cluster are linked by their in-cluster path cost.
+# Long paths are searched on that small abstract graph and only turned back into grid
+# cells one leg at a time as the mover reaches it.
+
+_CACHE_FORMAT = 1 # Bump when the cached graph layout changes
+_STEPS = ((1, 0, 10), (-1, 0, 10), (0, 1, 10), (0, -1, 10),
+          (1, 1, 14), (1, -1, 14), (-1, 1, 14), (-1, -1, 14))
+
+
+def _octile(ax, ay, bx, by):
+    """Exact 10/14 path cost between two cells on an open grid (admissible heuristic)."""
+    dx = abs(ax - bx); dy = abs(ay - by)
+    return 10 * max(dx, dy) + 4 * min(dx, dy)
+
+
+class HPAGraph:
+    """Abstract graph over a NavGrid: nodes are border cells, edges carry grid path costs."""
+    def __init__(self, nav, cluster_cells=HPA_CLUSTER_CELLS):
+        self.nav = nav
+        self.cluster_cells = cluster_cells
+        self.cluster_cols = -(-nav.cols // cluster_cells); self.cluster_rows = -(-nav.rows // cluster_cells)
+        self.nodes = [] # node id -> (cell_x, cell_y)
+        self.edges = [] # node id -> {neighbour id: cost}
+        self.cluster_nodes = {} # cluster id -> [node ids]
+        self._node_at = {} # (cell_x, cell_y) -> node id
+
+    # --- Construction ---
+    @classmethod
+    def load_or_build(cls, nav, cache_path=SAVE_FILE_HPA, cluster_cells=HPA_CLUSTER_CELLS):
+        """Loads the graph cached for exactly this nav grid, or builds and caches it."""
+        graph = cls(nav, cluster_cells)
+        signature = graph.signature()
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f: cached = pickle.load(f)
+                if cached.get('signature') == signature:
+                    graph.nodes = cached['nodes']; graph.edges = cached['edges']
+                    graph._index_nodes()
+                    print(f"Loaded HPA* graph from {cache_path} ({len(graph.nodes)} nodes).")
+                    return graph
+                print(f"HPA* cache {cache_path} is for a different world, rebuilding...")
+            except Exception as e: print(f"Error loading HPA* cache: {e}. Rebuilding...")
+        start_time = time.perf_counter()
+        graph.build()
+        print(f"Built HPA* graph: {len(graph.nodes)} nodes in {time.perf_counter() - start_time:.2f}s.")
+        if cache_path:
+            try:
+                with open(cache_path, 'wb') as f:
+                    pickle.dump({'signature': signature, 'nodes': graph.nodes, 'edges': graph.edges}, f)
+            except Exception as e: print(f"Error saving HPA* cache: {e}")
+        return graph
+
+    def signature(self):
+        """Identifies the nav grid + settings the graph was built for."""
+        nav = self.nav
+        digest = hashlib.sha1(bytes(nav.blocked))
+        digest.update(f"{_CACHE_FORMAT}:{nav.cols}x{nav.rows}:{nav.cell_size}:{self.cluster_cells}:{HPA_ENTRANCE_SPLIT}".encode())
+        return digest.hexdigest()
+
+    def build(self):
+        self.nodes = []; self.edges = []; self._node_at = {}
+        self._build_entrances()
+        self._index_nodes()
+        for cluster_id, node_ids in self.cluster_nodes.items():
+            self._link_cluster(cluster_id, node_ids)
+
+    def _add_node(self, cx, cy):
+        node_id = self._node_at.get((cx, cy))
+        if node_id is None:
+            node_id = self._node_at[(cx, cy)] = len(self.nodes)
+            self.nodes.append((cx, cy)); self.edges.append({})
+        return node_id
+
+    def _link(self, a, b, cost):
+        if cost < self.edges[a].get(b, math.inf):
+            self.edges[a][b] = cost; self.edges[b][a] = cost
+
+    def _build_entrances(self):
+        """Transition node pairs for every run of open cells along each cluster border."""
+        for ky in range(self.cluster_rows):
+            for kx in range(self.cluster_cols):
+                x0, y0, x1, y1 = self.cluster_bounds(kx, ky)
+                if kx + 1 < self.cluster_cols: # Border with the cluster to the east
+                    self._border_runs([(x1, y, x1 + 1, y) for y in range(y0, y1 + 1)])
+                if ky + 1 < self.cluster_rows: # Border with the cluster to the south
+                    self._border_runs([(x, y1, x, y1 + 1) for x in range(x0, x1 + 1)])
+
+    def _border_runs(self, pairs):
+        nav = self.nav
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and not nav.is_blocked(pair[0], pair[1]) and not nav.is_blocked(pair[2], pair[3]):
+                run.append(pair); continue
+            if run:
+                picks = [run[len(run) // 2]] if len(run) < HPA_ENTRANCE_SPLIT else [run[0], run[-1]]
+                for ax, ay, bx, by in picks:
+                    self._link(self._add_node(ax, ay), self._add_node(bx, by), 10)
+                run = []
+
+    def _index_nodes(self):
+        self._node_at = {cell: i for i, cell in enumerate(self.nodes)}
+        self.cluster_nodes = {}
+        for node_id, (cx, cy) in enumerate(self.nodes):
+            self.cluster_nodes.setdefault(self.cluster_id(cx, cy), []).append(node_id)
+
+    def _link_cluster(self, cluster_id, node_ids):
+        """In-cluster costs between every pair of the cluster's nodes."""
+        if len(node_ids) < 2: return
+        kx, ky = cluster_id % self.cluster_cols, cluster_id // self.cluster_cols
+        bounds = self.cluster_bounds(kx, ky)
+        if self._is_open(bounds):
+            # No obstacles: the octile distance is the exact grid cost
+            for i, a in enumerate(node_ids):
+                ax, ay = self.nodes[a]
+                for b in node_ids[i + 1:]:
+                    bx, by = self.nodes[b]
+                    self._link(a, b, _octile(ax, ay, bx, by))
+            return
+        window = _Window(self.nav, bounds) # One padded copy of the cluster for all its searches
+        for i, a in enumerate(node_ids[:-1]):
+            dist = window.search(self.nodes[a])
+            for b in node_ids[i + 1:]:
+                cost = dist[window.index(*self.nodes[b])]
+                if cost != _UNREACHED: self._link(a, b, cost)
+
+    # --- Grid helpers ---
+    def cluster_id(self, cx, cy):
+        return (cy // self.cluster_cells) * self.cluster_cols + (cx // self.cluster_cells)
+
+    def cluster_bounds(self, kx, ky):
+        """Inclusive cell bounds (x0, y0, x1, y1) of cluster (kx, ky), clipped to the grid."""
+        size = self.cluster_cells
+        return (kx * size, ky * size, min(self.nav.cols, (kx + 1) * size) - 1, min(self.nav.rows, (ky + 1) * size) - 1)
+
+    def bounds_of_cell(self, cx, cy):
+        return self.cluster_bounds(cx // self.cluster_cells, cy // self.cluster_cells)
+
+    def _is_open(self, bounds):
+        x0, y0, x1, y1 = bounds; nav = self.nav
+        for cy in range(y0, y1 + 1):
+            row = cy * nav.cols
+            if any(nav.blocked[row + x0:row + x1 + 1]): return False
+        return True
+
+    def grid_costs(self, bounds, start, targets):
+        """Dijkstra inside `bounds` from `start`: {target cell: cost} for the reachable targets."""
+        window = _Window(self.nav, bounds)
+        dist = window.search(start)
+        costs = {}
+        for cell in targets:
+            d = dist[window.index(*cell)]
+            if d != _UNREACHED: costs[cell] = d
+        return costs
+
+    def grid_path(self, bounds, start, goal):
+        """A* inside `bounds`: list of cells from start (exclusive) to goal (inclusive), or None."""
+        if start == goal: return []
+        return _Window(self.nav, bounds).path(start, goal)
+
+    # --- Abstract search ---
+    def find_waypoints(self, start, goal):
+        """
+        Cells the path passes through on the abstract graph: [start, node, ..., goal],
+        each consecutive pair in one cluster (or adjacent across a border). None if unreachable.
+        """
+        nav = self.nav
+        if nav.is_blocked(*start) or nav.is_blocked(*goal): return None
+        start_bounds = self.bounds_of_cell(*start); goal_bounds = self.bounds_of_cell(*goal)
+        if start_bounds == goal_bounds and self.grid_path(start_bounds, start, goal) is not None:
+            return [start, goal]
+
+        # Temporary links: start -> its cluster's nodes, its cluster's nodes -> goal
+        start_ids = self.cluster_nodes.get(self.cluster_id(*start), ())
+        start_costs = self.grid_costs(start_bounds, start, [self.nodes[n] for n in start_ids])
+        start_links = {n: start_costs[self.nodes[n]] for n in start_ids if self.nodes[n] in start_costs}
+        goal_ids = self.cluster_nodes.get(self.cluster_id(*goal), ())
+        goal_costs = self.grid_costs(goal_bounds, goal, [self.nodes[n] for n in goal_ids])
+        goal_links = {n: goal_costs[self.nodes[n]] for n in goal_ids if self.nodes[n] in goal_costs}
+        if not start_links or not goal_links: return None
+
+        gx, gy = goal; nodes = self.nodes; edges = self.edges
+        START, GOAL = -1, -2
+        dist = {START: 0}; parent = {}; heap = [(_octile(start[0], start[1], gx, gy), 0, START)]
+        while heap:
+            _, d, node = heapq.heappop(heap)
+            if node == GOAL:
+                waypoints = [goal]; node = parent[GOAL]
+                while node != START:
+                    waypoints.append(nodes[node]); node = parent[node]
+                waypoints.append(start); waypoints.reverse()
+                return waypoints
+            if d > dist.get(node, math.inf): continue
+            links = start_links if node == START else edges[node]
+            for nbr, cost in links.items():
+                nd = d + cost
+                if nd < dist.get(nbr, math.inf):
+                    dist[nbr] = nd; parent[nbr] = node
+                    heapq.heappush(heap, (nd + _octile(nodes[nbr][0], nodes[nbr][1], gx, gy), nd, nbr))
+            if node in goal_links:
+                nd = d + goal_links[node]
+                if nd < dist.get(GOAL, math.inf):
+                    dist[GOAL] = nd; parent[GOAL] = node
+                    heapq.heappush(heap, (nd, nd, GOAL))
+        return None
+
+
+class _Window:
+    """
+    A rectangle of nav cells copied into a flat buffer with a blocked 1-cell border,
+    so local searches use index arithmetic instead of per-neighbour bounds checks.
+    """
+    def __init__(self, nav, bounds):
+        x0, y0, x1, y1 = bounds
+        self.x0 = x0; self.y0 = y0
+        self.pad = pad = x1 - x0 + 3
+        height = y1 - y0 + 3
+        self.walls = walls = bytearray(b'\x01') * (pad * height)
+        for cy in range(y0, y1 + 1):
+            src = cy * nav.cols + x0; dst = (cy - y0 + 1) * pad + 1
+            walls[dst:dst + (x1 - x0 + 1)] = nav.blocked[src:src + (x1 - x0 + 1)]
+        self.offsets = [dx + dy * pad for dx, dy, _ in _STEPS]
+        self.costs = [cost for _, _, cost in _STEPS]
+
+    def index(self, cx, cy):
+        return (cy - self.y0 + 1) * self.pad + (cx - self.x0 + 1)
+
+    def cell(self, i):
+        return (i % self.pad - 1 + self.x0, i // self.pad - 1 + self.y0)
+
+    def search(self, start, goal=None):
+        """Dijkstra (or A* towards `goal`) from `start`. Returns (dist list) or, with a goal, (dist, parent)."""
+        walls = self.walls; offsets = self.offsets; costs = self.costs; pad = self.pad
+        dist = [_UNREACHED] * len(walls)
+        parent = {} if goal is not None else None
+        s = self.index(*start)
+        dist[s] = 0
+        if goal is not None:
+            g = self.index(*goal); gx = g % pad; gy = g // pad
+        heap = [(0, 0, s)]
+        heappop = heapq.heappop; heappush = heapq.heappush
+        while heap:
+            _, d, c = heappop(heap)
+            if d > dist[c]: continue
+            if goal is not None and c == g: break
+            for k in range(8):
+                n = c + offsets[k]
+                if walls[n]: continue
+                nd = d + costs[k]
+                if nd < dist[n]:
+                    if k >= 4 and (walls[c + _STEPS[k][0]] or walls[c + _STEPS[k][1] * pad]): continue # No corner cutting
+                    dist[n] = nd
+                    if goal is None:
+                        heappush(heap, (nd, nd, n))
+                    else:
+                        parent[n] = c
+                        dx = abs(n % pad - gx); dy = abs(n // pad - gy)
+                        heappush(heap, (nd + 10 * max(dx, dy) + 4 * min(dx, dy), nd, n))
+        return dist if goal is None else (dist, parent)
+
+    def path(self, start, goal):
+        dist, parent = self.search(start, goal)
+        g = self.index(*goal)
+        if dist[g] == _UNREACHED: return None
+        cells = []; s = self.index(*start)
+        while g != s:
+            cells.append(self.cell(g)); g = parent[g]
+        cells.reverse()
+        return cells
+
+
+class HPAPath:
+    """
+    A found path, refined into grid cells one leg (waypoint to waypoint) at a time.
+    next_point() gives the world position to steer to next (the exact goal once in its cell).
+    """
+    def __init__(self, graph, waypoints, goal_x, goal_y):
+        self.graph = graph
+        self.waypoints = waypoints
+        self.goal = (goal_x, goal_y)
+        self.leg = 0 # Index of the waypoint the current leg starts from
+        self.cells = deque() # Refined cells of the current leg
+        self.legs_refined = 0
+
+    def _refine_next_leg(self):
+        while self.leg < len(self.waypoints) - 1 and not self.cells:
+            a = self.waypoints[self.leg]; b = self.waypoints[self.leg + 1]
+            ax0, ay0, ax1, ay1 = self.graph.bounds_of_cell(*a); bx0, by0, bx1, by1 = self.graph.bounds_of_cell(*b)
+            bounds = (min(ax0, bx0), min(ay0, by0), max(ax1, bx1), max(ay1, by1))
+            cells = self.graph.grid_path(bounds, a, b)
+            self.cells = deque(cells if cells else [b]) # Unrefinable leg: head straight for its end
+            self.leg += 1; self.legs_refined += 1
+
+    def next_point(self, x, y):
+        size = self.graph.nav.cell_size
+        cell = (int(x // size), int(y // size))
+        # Drop cells already reached (or skipped past by a few pixels)
+        while True:
+            if not self.cells: self._refine_next_leg()
+            if not self.cells: break
+            if self.cells[0] == cell: self.cells.popleft(); continue
+            break
+        if not self.cells:
+            return self.goal # In the goal cell: the caller decides when it is close enough
+        if len(self.cells) == 1 and self.leg >= len(self.waypoints) - 1:
+            return self.goal # Last cell: the exact destination
+        cx, cy = self.cells[0]
+        return ((cx + 0.5) * size, (cy + 0.5) * size)
+
+    @property
+    def finished(self):
+        return self.leg >= len(self.waypoints) - 1 and not self.cells
+
+
+class PathRequest:
+    """Handle returned by PathPlanner.request(); status is 'pending', 'done' or 'failed'."""
+    __slots__ = ('start', 'goal', 'status', 'path')
+    def __init__(self, start, goal):
+        self.start = start; self.goal = goal
+        self.status = 'pending'; self.path = None
+
+
+class PathPlanner:
+    """
+    (Server) Queues path requests and answers them within a per-tick time budget so a
+    burst of requests (e.g. a whole pack giving up a chase) never stalls a tick.
+    """
+    def __init__(self, graph, budget_ms=HPA_SEARCH_BUDGET_MS):
+        self.graph = graph
+        self.budget_ms = budget_ms
+        self.queue = deque()
+        self.searches_run = 0 # Searches run in the last process() call (for the profiler)
+
+    def request(self, start_x, start_y, goal_x, goal_y):
+        req = PathRequest((start_x, start_y), (goal_x, goal_y))
+        self.queue.append(req)
+        return req
+
+    def process(self):
+        """Runs queued searches until the budget is spent (always at least one)."""
+        self.searches_run = 0
+        if not self.queue: return
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        nav = self.graph.nav
+        while self.queue:
+            req = self.queue.popleft()
+            if req.status != 'pending': continue # Cancelled by its owner
+            waypoints = self.graph.find_waypoints(nav.cell_of(*req.start), nav.cell_of(*req.goal))
+            if waypoints is None: req.status = 'failed'
+            else:
+                req.path = HPAPath(self.graph, waypoints, req.goal[0], req.goal[1]); req.status = 'done'
+            self.searches_run += 1
+            if time.perf_counter() >= deadline: break
+
+    @staticmethod
+    def cancel(req):
+        if req is not None and req.status == 'pending': req.status = 'cancelled'
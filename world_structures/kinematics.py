@@ -0,0 +1,85 @@
+from world_structures.wall_segments import resolve_rect_against_segments
+
+# --- Kinematic Mover ---
+# Movement and collision for every mover (Player, Enemy, NPC, EnemySoA movers). A body is
+# anything with float x/y (its center) and its own preallocated pygame.Rect `rect`; positions
+# are plain floats and the body's rect is reused, so moving allocates no Vector2s or Rect copies.
+# Collision is axis-separated: move X, push out of every overlapping collider, then the same for Y.
+
+
+def _push_out_x(rect, dx, colliders):
+    """Pushes rect back against the direction of travel until no collider overlaps it."""
+    hit = rect.collidelist(colliders)
+    while hit != -1: # Each push strictly reduces the overlap direction's edge, so this ends
+        if dx > 0: rect.right = colliders[hit].left
+        else: rect.left = colliders[hit].right
+        hit = rect.collidelist(colliders)
+
+
+def _push_out_y(rect, dy, colliders):
+    hit = rect.collidelist(colliders)
+    while hit != -1:
+        if dy > 0: rect.bottom = colliders[hit].top
+        else: rect.top = colliders[hit].bottom
+        hit = rect.collidelist(colliders)
+
+
+def move_body(body, dx, dy, colliders=(), wall_segments=()):
+    """
+    Moves `body` by (dx, dy), resolving each axis against all overlapping Rect colliders
+    and then pushing out of thick wall segments. Positions stay fractional unless a
+    collision snapped them to the rect.
+    """
+    rect = body.rect
+    x = body.x; y = body.y
+    rect.centery = int(y)
+
+    # Move X
+    if dx:
+        x += dx
+        rect.centerx = int(x)
+        if colliders and rect.collidelist(colliders) != -1:
+            _push_out_x(rect, dx, colliders)
+            x = rect.centerx
+    else:
+        rect.centerx = int(x)
+
+    # Move Y
+    if dy:
+        y += dy
+        rect.centery = int(y)
+        if colliders and rect.collidelist(colliders) != -1:
+            _push_out_y(rect, dy, colliders)
+            y = rect.centery
+
+    # Thick wall segments push the body back out along the wall normal
+    if wall_segments and resolve_rect_against_segments(rect, wall_segments):
+        x = rect.centerx; y = rect.centery
+
+    body.x = x; body.y = y
+
+
+def clamp_body(body, radius, world_width, world_height):
+    """Keeps the body's center `radius` inside the world bounds (and its rect on it)."""
+    x = body.x; y = body.y
+    if x < radius: x = radius
+    elif x > world_width - radius: x = world_width - radius
+    if y < radius: y = radius
+    elif y > world_height - radius: y = world_height - radius
+    body.x = x; body.y = y
+    body.rect.centerx = int(x); body.rect.centery = int(y)
+
+
+def move_bodies(bodies, moves_x, moves_y, use_collider_cache=True, world_width=None, world_height=None):
+    """
+    Batch move_body: bodies[i] moves by (moves_x[i], moves_y[i]) against its own
+    collider_cache (colliders + wall segments), then is clamped to the world if a size is given.
+    """
+    clamp = world_width is not None
+    for body, dx, dy in zip(bodies, moves_x, moves_y):
+        if use_collider_cache:
+            cache = body.collider_cache
+            move_body(body, dx, dy, cache.colliders, cache.segments)
+        else:
+            move_body(body, dx, dy)
+        if clamp: clamp_body(body, body.radius, world_width, world_height)
@@ -0,0 +1,79 @@
+import math
+import pygame
+from world_structures.world_constants import LOS_CACHE_TICKS
+
+# --- Line of Sight ---
+# Segment-vs-collider visibility on top of the collision indexes. StaticGridIndex and
+# TileGridCollider walk only the grid cells the sight line crosses (grid DDA);
+# anything else (e.g. QuadtreeNode) falls back to querying the segment's bounding box.
+
+def iter_segment_cells(x0, y0, x1, y1, cell_size, origin_x=0, origin_y=0):
+    """Yields every (cell_x, cell_y) the segment passes through, in order (Amanatides-Woo DDA)."""
+    gx0 = (x0 - origin_x) / cell_size; gy0 = (y0 - origin_y) / cell_size
+    gx1 = (x1 - origin_x) / cell_size; gy1 = (y1 - origin_y) / cell_size
+    cx = int(math.floor(gx0)); cy = int(math.floor(gy0))
+    end_cx = int(math.floor(gx1)); end_cy = int(math.floor(gy1))
+    dx = gx1 - gx0; dy = gy1 - gy0
+    step_x = 1 if dx > 0 else -1; step_y = 1 if dy > 0 else -1
+    # Parametric distance (0..1 along the segment) to the next vertical / horizontal cell border
+    t_delta_x = abs(1.0 / dx) if dx else math.inf; t_delta_y = abs(1.0 / dy) if dy else math.inf
+    t_max_x = ((cx + 1 - gx0) if dx > 0 else (gx0 - cx)) * t_delta_x if dx else math.inf
+    t_max_y = ((cy + 1 - gy0) if dy > 0 else (gy0 - cy)) * t_delta_y if dy else math.inf
+    yield cx, cy
+    for _ in range(abs(end_cx - cx) + abs(end_cy - cy)):
+        if t_max_x < t_max_y:
+            cx += step_x; t_max_x += t_delta_x
+        else:
+            cy += step_y; t_max_y += t_delta_y
+        yield cx, cy
+
+def collider_blocks_segment(collider, x0, y0, x1, y1):
+    """True if a collider (pygame.Rect or a shape with blocks_segment, e.g. WallSegment) cuts the segment."""
+    blocks = getattr(collider, 'blocks_segment', None)
+    if blocks is not None:
+        return collider.rect.clipline(x0, y0, x1, y1) != () and blocks(x0, y0, x1, y1)
+    return collider.clipline(x0, y0, x1, y1) != ()
+
+def has_line_of_sight(index, x0, y0, x1, y1):
+    """True if no collider in `index` blocks the segment (x0, y0)-(x1, y1)."""
+    if index is None: return True
+    line_of_sight = getattr(index, 'line_of_sight', None)
+    if line_of_sight is not None: return line_of_sight(x0, y0, x1, y1)
+    # Generic fallback: everything overlapping the segment's bounding box
+    box = pygame.Rect(int(min(x0, x1)), int(min(y0, y1)), int(abs(x1 - x0)) + 2, int(abs(y1 - y0)) + 2)
+    for collider in index.query(box):
+        if collider_blocks_segment(collider, x0, y0, x1, y1): return False
+    return True
+
+
+class LineOfSightCache:
+    """
+    Per-pair visibility results, reused for `ttl_ticks` server ticks so hundreds of
+    viewers can re-check their targets every tick without re-tracing every line.
+    Keys are caller-chosen pair ids, e.g. (enemy.id, player.player_id).
+    """
+    def __init__(self, ttl_ticks=LOS_CACHE_TICKS):
+        self.ttl_ticks = ttl_ticks
+        self.tick = 0
+        self.results = {} # {pair_key: (expires_at_tick, visible)}
+        self.traces = 0 # Lines actually traced since the last advance() (for the profiler)
+
+    def advance(self):
+        """Call once per server tick; drops expired entries every ttl_ticks ticks."""
+        self.tick += 1
+        self.traces = 0
+        if self.tick % self.ttl_ticks == 0 and self.results:
+            tick = self.tick
+            self.results = {key: entry for key, entry in self.results.items() if entry[0] > tick}
+
+    def is_visible(self, index, pair_key, x0, y0, x1, y1):
+        entry = self.results.get(pair_key)
+        if entry is not None and entry[0] > self.tick:
+            return entry[1]
+        visible = has_line_of_sight(index, x0, y0, x1, y1)
+        self.results[pair_key] = (self.tick + self.ttl_ticks, visible)
+        self.traces += 1
+        return visible
+
+    def clear(self):
+        self.results.clear()
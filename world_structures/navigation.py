@@ -0,0 +1,193 @@
+import heapq
+import math
+from world_structures.world_constants import (NAV_CELL_SIZE, NAV_AGENT_CLEARANCE, FLOW_FIELD_MARGIN,
+                                              FLOW_FIELD_IDLE_TICKS)
+
+# 8-neighbour steps (dx, dy, cost): straight 10, diagonal 14 (~10 * sqrt(2))
+_NEIGHBOURS = ((1, 0, 10), (-1, 0, 10), (0, 1, 10), (0, -1, 10),
+               (1, 1, 14), (1, -1, 14), (-1, 1, 14), (-1, -1, 14))
+_UNREACHED = 0x7FFFFFFF
+
+# --- Navigation Grid ---
+class NavGrid:
+    """
+    Walkable/blocked bitmap over the world, derived once from the static colliders.
+    A cell is blocked if any collider (grown by NAV_AGENT_CLEARANCE) overlaps it;
+    cells outside the world are blocked.
+    """
+    def __init__(self, width, height, cell_size=NAV_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = max(1, -(-int(width) // cell_size)); self.rows = max(1, -(-int(height) // cell_size))
+        self.blocked = bytearray(self.cols * self.rows)
+        self.version = 0
+
+    @classmethod
+    def from_index(cls, index, width, height, cell_size=NAV_CELL_SIZE, clearance=NAV_AGENT_CLEARANCE):
+        """Builds the grid from a collision index (TileGridCollider, StaticGridIndex or anything with query())."""
+        nav = cls(width, height, cell_size)
+        grid = getattr(index, 'grid', None)
+        if grid is not None and getattr(index, 'tile_size', None) == cell_size:
+            # Tile maps line up with the nav grid: copy the solid tiles directly
+            solid = index.solid_value
+            for ty, row in enumerate(grid[:nav.rows]):
+                base = ty * nav.cols
+                for tx, tile in enumerate(row[:nav.cols]):
+                    if tile == solid: nav.blocked[base + tx] = 1
+            return nav
+        colliders = getattr(index, 'rects', None)
+        if colliders is None: colliders = index.query(index.boundary) if index is not None else []
+        for collider in colliders: nav.mark_collider(collider, clearance)
+        return nav
+
+    def mark_collider(self, collider, clearance=NAV_AGENT_CLEARANCE):
+        """Blocks the cells a Rect (or a WallSegment capsule) covers, grown by `clearance`."""
+        size = self.cell_size
+        bounds = getattr(collider, 'rect', collider).inflate(clearance * 2, clearance * 2)
+        cx0 = max(0, bounds.left // size); cy0 = max(0, bounds.top // size)
+        cx1 = min(self.cols - 1, (bounds.right - 1) // size); cy1 = min(self.rows - 1, (bounds.bottom - 1) // size)
+        closest_point = getattr(collider, 'closest_point', None)
+        if closest_point is not None:
+            # Capsule: only cells whose center is within radius + clearance + half a cell diagonal
+            reach = collider.radius + clearance + size * 0.7072; reach_sq = reach * reach
+        for cy in range(cy0, cy1 + 1):
+            base = cy * self.cols
+            for cx in range(cx0, cx1 + 1):
+                if closest_point is not None:
+                    center_x = (cx + 0.5) * size; center_y = (cy + 0.5) * size
+                    px, py = closest_point(center_x, center_y)
+                    if (px - center_x) ** 2 + (py - center_y) ** 2 > reach_sq: continue
+                self.blocked[base + cx] = 1
+        self.version += 1
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def is_blocked(self, cx, cy):
+        return not (0 <= cx < self.cols and 0 <= cy < self.rows) or self.blocked[cy * self.cols + cx] == 1
+
+
+# --- Flow Field ---
+class FlowField:
+    """
+    Shortest-path directions towards one goal cell, for every cell within `radius_cells`
+    of it (Dijkstra over 8-neighbours, no corner cutting). Each reached cell stores the
+    neighbour to step to next, so any number of chasers share one search.
+    """
+    def __init__(self, nav, goal_cx, goal_cy, radius_cells):
+        self.nav = nav
+        self.goal = (goal_cx, goal_cy)
+        self.nav_version = nav.version
+        self.radius = radius_cells
+        self.size = radius_cells * 2 + 1
+        self.origin_x = goal_cx - radius_cells; self.origin_y = goal_cy - radius_cells
+        self.next_step = bytearray(b'\xff') * (self.size * self.size) # Index into _NEIGHBOURS, 0xFF = unreached/goal
+        self._search()
+
+    def _search(self):
+        nav = self.nav; size = self.size; ox = self.origin_x; oy = self.origin_y
+        # Local copy of the window's blocked cells with a blocked 1-cell border, so neighbour
+        # checks are plain index arithmetic (no bounds tests in the inner loop)
+        pad = size + 2
+        walls = bytearray(b'\x01') * (pad * pad)
+        cols = nav.cols; rows = nav.rows; blocked = nav.blocked
+        for ly in range(size):
+            cy = oy + ly
+            if cy < 0 or cy >= rows: continue
+            x0 = max(0, ox); x1 = min(cols, ox + size)
+            if x0 >= x1: continue
+            dst = (ly + 1) * pad + (x0 - ox) + 1
+            walls[dst:dst + (x1 - x0)] = blocked[cy * cols + x0:cy * cols + x1]
+
+        # Expanding backwards from the goal: a cell reached from c steps towards c
+        offsets = [dx + dy * pad for dx, dy, _ in _NEIGHBOURS]
+        costs = [cost for _, _, cost in _NEIGHBOURS]
+        opposite = [1, 0, 3, 2, 7, 6, 5, 4]
+        dist = [_UNREACHED] * (pad * pad)
+        steps = bytearray(b'\xff') * (pad * pad)
+        goal_cx, goal_cy = self.goal
+        start = (goal_cy - oy + 1) * pad + (goal_cx - ox + 1)
+        dist[start] = 0
+        heap = [(0, start)]
+        heappop = heapq.heappop; heappush = heapq.heappush
+        while heap:
+            d, c = heappop(heap)
+            if d > dist[c]: continue
+            for k in range(8):
+                n = c + offsets[k]
+                if walls[n]: continue
+                nd = d + costs[k]
+                if nd < dist[n]:
+                    if k >= 4:
+                        # No corner cutting: both orthogonal neighbours must be open
+                        dx, dy, _ = _NEIGHBOURS[k]
+                        if walls[c + dx] or walls[c + dy * pad]: continue
+                    dist[n] = nd; steps[n] = opposite[k]
+                    heappush(heap, (nd, n))
+
+        # Drop the border again
+        next_step = self.next_step
+        for ly in range(size):
+            src = (ly + 1) * pad + 1
+            next_step[ly * size:(ly + 1) * size] = steps[src:src + size]
+
+    def direction(self, x, y):
+        """
+        Unit (dx, dy) towards the next cell on the shortest path from (x, y), or None
+        if (x, y) is in the goal cell or outside/unreached (callers go straight then).
+        """
+        size = self.nav.cell_size
+        cx = int(x // size); cy = int(y // size)
+        lx = cx - self.origin_x; ly = cy - self.origin_y
+        if lx < 0 or ly < 0 or lx >= self.size or ly >= self.size: return None
+        step = self.next_step[ly * self.size + lx]
+        if step == 0xFF: return None
+        dx, dy, _ = _NEIGHBOURS[step]
+        # Aim at the next cell's center so movement stays smooth between cells
+        target_x = (cx + dx + 0.5) * size; target_y = (cy + dy + 0.5) * size
+        vx = target_x - x; vy = target_y - y
+        length = math.hypot(vx, vy)
+        if length < 1e-6: return None
+        return vx / length, vy / length
+
+
+class FlowFieldManager:
+    """
+    (Server) One FlowField per chased player, shared by every enemy chasing them. A
+    field is rebuilt only when its player moves into a different nav cell; fields no
+    one has asked for in FLOW_FIELD_IDLE_TICKS ticks are dropped. The nav grid is
+    built from the collision index on first use.
+    """
+    def __init__(self, index, world_width, world_height, reach=0, margin=FLOW_FIELD_MARGIN, nav=None):
+        self.index = index
+        self.world_width = world_width; self.world_height = world_height
+        self.reach = reach # Farthest a chaser can be from its target (e.g. max enemy detection radius)
+        self.margin = margin
+        self.nav = nav # Built from the index on first use unless one is shared in
+        self.fields = {} # {player_id: FlowField}
+        self.last_used = {} # {player_id: tick}
+        self.tick = 0
+        self.fields_built = 0 # Rebuilt this tick (for the profiler)
+
+    def advance(self):
+        """Call once per server tick."""
+        self.tick += 1
+        self.fields_built = 0
+        if self.tick % FLOW_FIELD_IDLE_TICKS == 0:
+            for player_id in [pid for pid, t in self.last_used.items() if self.tick - t > FLOW_FIELD_IDLE_TICKS]:
+                self.fields.pop(player_id, None); self.last_used.pop(player_id, None)
+
+    def field_for(self, player):
+        if self.nav is None:
+            self.nav = NavGrid.from_index(self.index, self.world_width, self.world_height)
+        goal = self.nav.cell_of(player.x, player.y)
+        field = self.fields.get(player.player_id)
+        if field is None or field.goal != goal or field.nav_version != self.nav.version:
+            radius_cells = int(math.ceil((self.reach + self.margin) / self.nav.cell_size))
+            field = self.fields[player.player_id] = FlowField(self.nav, goal[0], goal[1], radius_cells)
+            self.fields_built += 1
+        self.last_used[player.player_id] = self.tick
+        return field
+
+    def direction(self, player, x, y):
+        """Unit direction for a chaser at (x, y) heading to `player`, or None to go straight."""
+        return self.field_for(player).direction(x, y)
@@ -6,6 +6,7 @@ class QuadtreeNode:
     def __init__(self, boundary, capacity, depth=0):
         self.boundary = pygame.Rect(boundary); self.capacity = capacity; self.items = []; self.depth = depth
         self.divided = False; self.north_west = None; self.north_east = None; self.south_west = None; self.south_east = None
+        self.version = 0 # Bumped on every insert so collider caches know the tree changed
     def subdivide(self):
         x, y, w, h = self.boundary; hw, hh = w / 2, h / 2
         if hw < 1 or hh < 1: return # Prevent subdividing too small
@@ -26,6 +27,7 @@ class QuadtreeNode:
                 items_to_keep.append(item)
         self.items = items_to_keep # Add items that span subdivisions back to the current node
     def insert(self, item):
+        self.version += 1
         # Determine if item is a rect or point-like tuple
         item_rect = item if isinstance(item, pygame.Rect) else pygame.Rect(item[0]-1, item[1]-1, 2, 2) # Treat tuples as small rects for collision
         if not self.boundary.colliderect(item_rect): return False
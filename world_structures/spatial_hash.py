@@ -0,0 +1,104 @@
+from world_structures.world_constants import SPATIAL_HASH_CELL_SIZE
+
+# --- Spatial Hash Implementation ---
+class SpatialHash:
+    """
+    Uniform grid of buckets for moving entities (players, enemies, NPCs).
+
+    Entities are indexed by their center point. Moving an entity only touches
+    the buckets when it crosses into a different cell, so per-tick updates are O(1).
+    Queries return candidates from the covered cells; callers still do their own
+    exact distance check (as they did before) so results are unchanged.
+    """
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {} # {(cell_x, cell_y): set of entities}
+        self.entity_cells = {} # {entity: (cell_x, cell_y)} for O(1) move/remove
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def __contains__(self, entity):
+        return entity in self.entity_cells
+
+    def cell_of(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, entity, x, y):
+        """Adds an entity at (x, y). Re-inserting an indexed entity just moves it."""
+        if entity in self.entity_cells:
+            self.move(entity, x, y); return
+        cell = self.cell_of(x, y)
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            bucket = self.cells[cell] = set()
+        bucket.add(entity)
+        self.entity_cells[entity] = cell
+
+    def remove(self, entity):
+        cell = self.entity_cells.pop(entity, None)
+        if cell is None: return False
+        bucket = self.cells.get(cell)
+        if bucket is not None:
+            bucket.discard(entity)
+            if not bucket: del self.cells[cell] # Keep the dict from growing with empty cells
+        return True
+
+    def move(self, entity, x, y):
+        """Updates an entity's position; only touches buckets when its cell changes."""
+        old_cell = self.entity_cells.get(entity)
+        new_cell = self.cell_of(x, y)
+        if old_cell == new_cell: return
+        if old_cell is None:
+            self.insert(entity, x, y); return
+        bucket = self.cells[old_cell]
+        bucket.discard(entity)
+        if not bucket: del self.cells[old_cell]
+        bucket = self.cells.get(new_cell)
+        if bucket is None:
+            bucket = self.cells[new_cell] = set()
+        bucket.add(entity)
+        self.entity_cells[entity] = new_cell
+
+    def clear(self):
+        self.cells.clear(); self.entity_cells.clear()
+
+    # --- Queries ---
+    def query_cells(self, min_x, min_y, max_x, max_y):
+        """Returns every entity in the cells overlapping the given world-space bounds."""
+        size = self.cell_size
+        cx0, cy0 = int(min_x // size), int(min_y // size)
+        cx1, cy1 = int(max_x // size), int(max_y // size)
+        found = []
+        cells = self.cells
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket: found.extend(bucket)
+        return found
+
+    def query_rect(self, rect):
+        """Candidates whose cell overlaps a pygame.Rect (or any (x, y, w, h))."""
+        x, y, w, h = rect
+        return self.query_cells(x, y, x + w, y + h)
+
+    def query_radius(self, x, y, radius):
+        """Entities whose center lies within `radius` of (x, y)."""
+        radius_sq = radius * radius
+        return [entity for entity in self.query_cells(x - radius, y - radius, x + radius, y + radius)
+                if (entity.x - x) ** 2 + (entity.y - y) ** 2 <= radius_sq]
+
+    def sync(self, entities):
+        """
+        Brings the index in line with an iterable of entities (adds new, moves, drops missing).
+        Used for small collections owned elsewhere, e.g. the shared player dictionary.
+        """
+        seen = set()
+        for entity in entities:
+            if entity is None: continue
+            seen.add(entity)
+            self.move(entity, entity.x, entity.y)
+        if len(seen) != len(self.entity_cells):
+            for entity in [e for e in self.entity_cells if e not in seen]:
+                self.remove(entity)
+
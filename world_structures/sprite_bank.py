@@ -0,0 +1,63 @@
+import pygame
+
+from world_structures.world_constants import SPRITE_FLASH_TINT, SPRITE_FLASH_INTERVAL_MS
+from world_structures.animation import ANIMATION_NAMES
+
+# Variant order inside an AnimationBank entry: index = (0 facing right / 1 facing left) + (2 if flashing)
+RIGHT, LEFT, RIGHT_FLASH, LEFT_FLASH = range(4)
+
+
+def prepare_frame(frame):
+    """Per-pixel-alpha copy in the display's pixel format (blits faster). Kept as-is without a display (server)."""
+    try:
+        return frame.convert_alpha()
+    except pygame.error: # No display mode set (dedicated server, benchmarks)
+        return frame
+
+
+def flash_frame(frame):
+    """Copy of a frame with SPRITE_FLASH_TINT added to its color (alpha untouched)."""
+    flashed = frame.copy()
+    flashed.fill(SPRITE_FLASH_TINT, special_flags=pygame.BLEND_RGB_ADD)
+    return flashed
+
+
+def flash_phase(now_ms):
+    """Whether an invulnerable entity shows its flash frame at this clock time."""
+    return int(now_ms // SPRITE_FLASH_INTERVAL_MS) % 2 == 1
+
+
+# --- Animation Bank ---
+class AnimationBank:
+    """
+    Every frame variant one entity type draws, built once: converted, facing right/left and
+    flash-tinted. Draw calls only index into it instead of flipping/tinting per entity per frame.
+    One bank per frame set (see of()); run_loading_screen builds them up front.
+    """
+    __slots__ = ('sources', 'variants')
+    _banks = {} # {frame list ids: AnimationBank}
+
+    def __init__(self, animations):
+        self.sources = tuple(animations.get(name) for name in ANIMATION_NAMES) # Keeps the source lists (and their ids) alive
+        self.variants = {} # {anim_type: (right frames, left frames, right flash frames, left flash frames)}
+        for name, frames in zip(ANIMATION_NAMES, self.sources):
+            if not frames: continue
+            right = [prepare_frame(frame) for frame in frames]
+            left = [pygame.transform.flip(frame, True, False) for frame in right]
+            self.variants[name] = (right, left, [flash_frame(frame) for frame in right], [flash_frame(frame) for frame in left])
+
+    @classmethod
+    def of(cls, animations):
+        """The bank for an {anim_type: frames} dict, built on first use."""
+        key = tuple(id(animations.get(name)) for name in ANIMATION_NAMES)
+        bank = cls._banks.get(key)
+        if bank is None:
+            bank = cls._banks[key] = cls(animations)
+        return bank
+
+    def frame(self, anim_type, frame_index, facing_right=True, flash=False):
+        """The surface to blit, or None if the type has no frames for this animation."""
+        variants = self.variants.get(anim_type)
+        if variants is None: return None
+        frames = variants[(RIGHT if facing_right else LEFT) + (RIGHT_FLASH if flash else 0)]
+        return frames[max(0, min(frame_index, len(frames) - 1))]
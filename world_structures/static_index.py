@@ -0,0 +1,313 @@
+from array import array
+from itertools import chain
+import pygame
+from world_structures.world_constants import STATIC_INDEX_CELL_SIZE
+from world_structures.line_of_sight import iter_segment_cells, collider_blocks_segment
+
+# NumPy is optional: it vectorizes batched queries; without it they fall back to a per-query loop
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_NO_HITS = () # Shared (immutable) result for batched queries that found nothing
+
+# --- Static Collision Index ---
+class StaticGridIndex:
+    """
+    Immutable, bulk-built collision index for colliders that never move (overworld walls,
+    tree trunks, buildings). Drop-in for QuadtreeNode.query().
+    Colliders are pygame.Rects or shapes with a `.rect` bounding box (e.g. WallSegment);
+    shapes are matched by their bounding box and returned as-is.
+
+    Layout (flat `array` buffers, no tree of per-node Python objects):
+        lefts/tops/rights/bottoms : collider bounds by collider index
+        cell_start                : offsets into cell_items, one entry per grid cell (+1)
+        cell_items                : collider indices, grouped by cell (CSR layout)
+        cell_rects                : per cell, the Rects of cell_items[cell_start[c]:cell_start[c+1]]
+
+    A query walks the covered cells in a flat loop and tests each cell's Rects with
+    Rect.collidelistall (one C call per cell). Colliders spanning several cells are
+    reported once (deduplicated with a per-collider query stamp).
+    """
+    def __init__(self, boundary, rects=(), cell_size=STATIC_INDEX_CELL_SIZE):
+        self.boundary = pygame.Rect(boundary)
+        self.origin_x, self.origin_y = self.boundary.x, self.boundary.y
+        self.cell_size = cell_size
+        self.cols = max(1, -(-self.boundary.width // cell_size)) # Ceil division
+        self.rows = max(1, -(-self.boundary.height // cell_size))
+        self.version = 0 # Bumped on every (re)build so caches can tell the index changed
+        self.build(rects)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def build(self, rects):
+        """(Re)builds the packed arrays from a list of colliders (Rects or shapes with .rect)."""
+        self.rects = [r if hasattr(r, 'rect') else pygame.Rect(r) for r in rects]
+        bounds = [r.rect if hasattr(r, 'rect') else r for r in self.rects]
+        count = len(self.rects)
+        self.lefts = array('i', [r.left for r in bounds])
+        self.tops = array('i', [r.top for r in bounds])
+        self.rights = array('i', [r.right for r in bounds])
+        self.bottoms = array('i', [r.bottom for r in bounds])
+
+        # Pass 1: count how many colliders touch each cell
+        num_cells = self.cols * self.rows
+        cell_counts = array('i', [0]) * num_cells
+        cell_spans = []
+        for i in range(count):
+            cx0, cy0, cx1, cy1 = self._cell_span(self.lefts[i], self.tops[i], self.rights[i], self.bottoms[i])
+            cell_spans.append((cx0, cy0, cx1, cy1))
+            for cy in range(cy0, cy1 + 1):
+                row = cy * self.cols
+                for cx in range(cx0, cx1 + 1):
+                    cell_counts[row + cx] += 1
+
+        # Pass 2: prefix sums give each cell's slice of cell_items
+        self.cell_start = array('i', [0]) * (num_cells + 1)
+        running = 0
+        for c in range(num_cells):
+            self.cell_start[c] = running
+            running += cell_counts[c]
+        self.cell_start[num_cells] = running
+
+        # Pass 3: scatter collider indices into their cells
+        self.cell_items = array('i', [0]) * running
+        fill = array('i', self.cell_start[:num_cells])
+        for i, (cx0, cy0, cx1, cy1) in enumerate(cell_spans):
+            for cy in range(cy0, cy1 + 1):
+                row = cy * self.cols
+                for cx in range(cx0, cx1 + 1):
+                    self.cell_items[fill[row + cx]] = i
+                    fill[row + cx] += 1
+
+        # Rect lists aligned with each cell's slice of cell_items, for collidelistall
+        rects = self.rects; cell_start = self.cell_start; cell_items = self.cell_items
+        self.cell_rects = [[rects[i] for i in cell_items[cell_start[c]:cell_start[c + 1]]] for c in range(num_cells)]
+
+        # NumPy views of the packed buffers for batched queries (no copies)
+        if np is not None:
+            self._np_bounds = tuple(np.frombuffer(a, dtype=np.int32) if len(a) else np.zeros(0, np.int32)
+                                    for a in (self.lefts, self.tops, self.rights, self.bottoms))
+            self._np_cell_start = np.frombuffer(self.cell_start, dtype=np.int32)
+            self._np_cell_items = np.frombuffer(self.cell_items, dtype=np.int32) if running else np.zeros(0, np.int32)
+
+        self._stamp = array('i', [0]) * count # Last query id that visited each collider
+        self._query_id = 0
+        self.version += 1
+
+    def _cell_span(self, left, top, right, bottom):
+        """Inclusive cell range covered by [left, right) x [top, bottom), clamped to the grid."""
+        size = self.cell_size; last_col = self.cols - 1; last_row = self.rows - 1
+        bx = self.boundary.x; by = self.boundary.y
+        cx0 = (left - bx) // size; cy0 = (top - by) // size
+        cx1 = (right - 1 - bx) // size; cy1 = (bottom - 1 - by) // size
+        # Clamp with plain comparisons (this runs for every query)
+        if cx0 < 0: cx0 = 0
+        elif cx0 > last_col: cx0 = last_col
+        if cx1 < 0: cx1 = 0
+        elif cx1 > last_col: cx1 = last_col
+        if cy0 < 0: cy0 = 0
+        elif cy0 > last_row: cy0 = last_row
+        if cy1 < 0: cy1 = 0
+        elif cy1 > last_row: cy1 = last_row
+        return cx0, cy0, cx1, cy1
+
+    def _next_query_id(self):
+        self._query_id += 1
+        if self._query_id >= 0x7FFFFFFF: # Wrap before overflowing the signed stamp array
+            self._stamp = array('i', [0]) * len(self.rects)
+            self._query_id = 1
+        return self._query_id
+
+    # --- Queries ---
+    def query_indices(self, range_rect, out=None):
+        """
+        Appends the indices of colliders overlapping range_rect to `out` (a list the
+        caller may reuse between queries; it is cleared first) and returns it.
+        Overlap matches pygame.Rect.colliderect (touching edges do not count).
+        """
+        if out is None: out = []
+        else: del out[:]
+        if not isinstance(range_rect, pygame.Rect): range_rect = pygame.Rect(range_rect)
+        x, y, w, h = range_rect
+        if w <= 0 or h <= 0 or not self.rects: return out
+        cx0, cy0, cx1, cy1 = self._cell_span(x, y, x + w, y + h)
+
+        cell_start = self.cell_start; cell_items = self.cell_items; cell_rects = self.cell_rects
+        cols = self.cols
+        if cx0 == cx1 and cy0 == cy1: # Common case: the query sits inside one cell, no duplicates possible
+            c = cy0 * cols + cx0
+            base = cell_start[c]
+            out.extend([cell_items[base + j] for j in range_rect.collidelistall(cell_rects[c])])
+            return out
+
+        qid = self._next_query_id(); stamp = self._stamp
+        for cy in range(cy0, cy1 + 1):
+            row = cy * cols
+            for c in range(row + cx0, row + cx1 + 1):
+                base = cell_start[c]
+                for j in range_rect.collidelistall(cell_rects[c]):
+                    i = cell_items[base + j]
+                    if stamp[i] == qid: continue
+                    stamp[i] = qid
+                    out.append(i)
+        return out
+
+    def query(self, range_rect):
+        """Returns the collider Rects overlapping range_rect (same contract as QuadtreeNode.query)."""
+        if range_rect.__class__ is not pygame.Rect: range_rect = pygame.Rect(range_rect)
+        x, y, w, h = range_rect
+        # Fast path (inlined, runs for every mover every tick): the query sits inside one cell
+        size = self.cell_size; x -= self.origin_x; y -= self.origin_y
+        cx = x // size; cy = y // size
+        if (0 <= cx < self.cols and 0 <= cy < self.rows and w > 0 and h > 0
+                and (x + w - 1) // size == cx and (y + h - 1) // size == cy):
+            cell = self.cell_rects[cy * self.cols + cx]
+            return [cell[j] for j in range_rect.collidelistall(cell)]
+        rects = self.rects
+        return [rects[i] for i in self.query_indices(range_rect)]
+
+    def _span_candidates(self, cx0, cy0, cx1, cy1):
+        """Deduplicated Rects of every collider touching the inclusive cell range."""
+        qid = self._next_query_id(); stamp = self._stamp
+        cell_start = self.cell_start; cell_items = self.cell_items; rects = self.rects
+        candidates = []
+        for cy in range(cy0, cy1 + 1):
+            row = cy * self.cols
+            for c in range(row + cx0, row + cx1 + 1):
+                for k in range(cell_start[c], cell_start[c + 1]):
+                    i = cell_items[k]
+                    if stamp[i] != qid:
+                        stamp[i] = qid
+                        candidates.append(rects[i])
+        return candidates
+
+    def query_batch_arrays(self, xs, ys, ws, hs):
+        """
+        (NumPy) Vectorized batch query. xs/ys/ws/hs are equal-length integer arrays of
+        query rects. Returns (offsets, items) in CSR form: the collider indices overlapping
+        query q are items[offsets[q]:offsets[q + 1]], ascending.
+
+        All queries are answered together: each query is expanded into its covered cells,
+        each (query, cell) pair into (query, collider) pairs, and the overlap test runs
+        once over the whole pair array.
+        """
+        xs = np.asarray(xs, dtype=np.int64); ys = np.asarray(ys, dtype=np.int64)
+        ws = np.asarray(ws, dtype=np.int64); hs = np.asarray(hs, dtype=np.int64)
+        num_queries = len(xs)
+        empty = (np.zeros(num_queries + 1, np.int64), np.zeros(0, np.int64))
+        if num_queries == 0 or not self.rects: return empty
+
+        size = self.cell_size
+        valid = (ws > 0) & (hs > 0)
+        cx0 = np.clip((xs - self.origin_x) // size, 0, self.cols - 1)
+        cy0 = np.clip((ys - self.origin_y) // size, 0, self.rows - 1)
+        cx1 = np.clip((xs + ws - 1 - self.origin_x) // size, 0, self.cols - 1)
+        cy1 = np.clip((ys + hs - 1 - self.origin_y) // size, 0, self.rows - 1)
+        span_w = np.where(valid, cx1 - cx0 + 1, 0); span_h = np.where(valid, cy1 - cy0 + 1, 0)
+
+        # 1. (query, cell) pairs
+        cells_per_query = span_w * span_h
+        pair_query = np.repeat(np.arange(num_queries), cells_per_query)
+        if len(pair_query) == 0: return empty
+        local = np.arange(len(pair_query)) - np.repeat(np.cumsum(cells_per_query) - cells_per_query, cells_per_query)
+        safe_w = np.maximum(span_w, 1)[pair_query]
+        pair_cell = (cy0[pair_query] + local // safe_w) * self.cols + cx0[pair_query] + local % safe_w
+
+        # 2. (query, collider) pairs from each cell's slice of cell_items
+        starts = self._np_cell_start[pair_cell]; counts = self._np_cell_start[pair_cell + 1] - starts
+        cand_query = np.repeat(pair_query, counts)
+        if len(cand_query) == 0: return empty
+        within = np.arange(len(cand_query)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cand_item = self._np_cell_items[np.repeat(starts, counts) + within]
+
+        # 3. Exact overlap test (pygame colliderect semantics) over all pairs at once
+        lefts, tops, rights, bottoms = self._np_bounds
+        qx = xs[cand_query]; qy = ys[cand_query]
+        hit = ((lefts[cand_item] < qx + ws[cand_query]) & (qx < rights[cand_item]) &
+               (tops[cand_item] < qy + hs[cand_query]) & (qy < bottoms[cand_item]))
+        hit_query = cand_query[hit]; hit_item = cand_item[hit]
+
+        # 4. Colliders spanning several cells show up once per cell; keep one per query
+        pair_key = np.unique(hit_query.astype(np.int64) * len(self.rects) + hit_item)
+        hit_query = pair_key // len(self.rects); hit_item = pair_key % len(self.rects)
+        offsets = np.searchsorted(hit_query, np.arange(num_queries + 1))
+        return offsets, hit_item
+
+    def query_batch(self, query_rects):
+        """
+        Answers many queries in one pass (e.g. every enemy's inflated rect for this tick).
+        Returns a list aligned with query_rects; each entry holds the same Rects query()
+        would return (queries that hit nothing share one empty tuple).
+
+        With NumPy this is one vectorized pass (query_batch_arrays); without it,
+        queries covering the same cells share one candidate list.
+        """
+        if np is not None and len(query_rects) > 1:
+            num_queries = len(query_rects)
+            bounds = np.fromiter(chain.from_iterable(query_rects), dtype=np.int64, count=4 * num_queries).reshape(-1, 4)
+            offsets, items = self.query_batch_arrays(bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3])
+            # Most queries hit nothing; they all share one empty tuple instead of a fresh list each
+            results = [_NO_HITS] * num_queries
+            rects = self.rects; offsets = offsets.tolist(); items = items.tolist()
+            for q in np.flatnonzero(np.diff(offsets)).tolist():
+                results[q] = [rects[i] for i in items[offsets[q]:offsets[q + 1]]]
+            return results
+        return self._query_batch_loop(query_rects)
+
+    def _query_batch_loop(self, query_rects):
+        """Pure-Python batch query used when NumPy is not installed."""
+        results = []
+        if not self.rects:
+            return [[] for _ in query_rects]
+        size = self.cell_size; origin_x = self.origin_x; origin_y = self.origin_y
+        last_col = self.cols - 1; last_row = self.rows - 1; cols = self.cols
+        cell_rects = self.cell_rects
+        shared_spans = {} # {(cx0, cy0, cx1, cy1): candidate Rects} for multi-cell queries in this batch
+        for rect in query_rects:
+            if rect.__class__ is not pygame.Rect: rect = pygame.Rect(rect)
+            x, y, w, h = rect
+            if w <= 0 or h <= 0:
+                results.append([]); continue
+            x -= origin_x; y -= origin_y
+            cx0 = x // size; cy0 = y // size; cx1 = (x + w - 1) // size; cy1 = (y + h - 1) // size
+            if cx0 < 0: cx0 = 0
+            elif cx0 > last_col: cx0 = last_col
+            if cx1 < 0: cx1 = 0
+            elif cx1 > last_col: cx1 = last_col
+            if cy0 < 0: cy0 = 0
+            elif cy0 > last_row: cy0 = last_row
+            if cy1 < 0: cy1 = 0
+            elif cy1 > last_row: cy1 = last_row
+
+            if cx0 == cx1 and cy0 == cy1:
+                candidates = cell_rects[cy0 * cols + cx0]
+            else:
+                key = (cx0, cy0, cx1, cy1)
+                candidates = shared_spans.get(key)
+                if candidates is None:
+                    candidates = shared_spans[key] = self._span_candidates(cx0, cy0, cx1, cy1)
+            results.append([candidates[j] for j in rect.collidelistall(candidates)])
+        return results
+
+
+    def line_of_sight(self, x0, y0, x1, y1):
+        """
+        True if no collider blocks the segment (x0, y0)-(x1, y1). Only the cells the
+        segment crosses are visited (grid DDA), stopping at the first blocker.
+        """
+        if not self.rects: return True
+        cols = self.cols; last_col = cols - 1; last_row = self.rows - 1
+        cell_rects = self.cell_rects; last_cell = -1
+        for cx, cy in iter_segment_cells(x0, y0, x1, y1, self.cell_size, self.origin_x, self.origin_y):
+            # Colliders beyond the boundary were clamped into the edge cells at build time
+            cx = 0 if cx < 0 else (last_col if cx > last_col else cx)
+            cy = 0 if cy < 0 else (last_row if cy > last_row else cy)
+            c = cy * cols + cx
+            if c == last_cell: continue
+            last_cell = c
+            for collider in cell_rects[c]:
+                if collider_blocks_segment(collider, x0, y0, x1, y1): return False
+        return True
@@ -0,0 +1,62 @@
+import pygame
+from world_structures.world_constants import DUNGEON_TILE_SIZE, TILE_WALL
+from world_structures.line_of_sight import iter_segment_cells
+
+# --- Tile Grid Collision Backend ---
+class TileGridCollider:
+    """
+    Collision index for tile maps (the dungeon). Answers "which solid tiles overlap
+    this rect" by index arithmetic on the grid itself, so there is nothing to build
+    at load and a query costs O(tiles touched). Same interface as QuadtreeNode /
+    StaticGridIndex: query(rect) -> list of Rects, query_batch(rects), line_of_sight(), version.
+    """
+    def __init__(self, grid, tile_size=DUNGEON_TILE_SIZE, solid_value=TILE_WALL):
+        self.grid = grid or [] # Rows of tile values, indexed grid[y][x]
+        self.tile_size = tile_size
+        self.solid_value = solid_value
+        self.rows = len(self.grid)
+        self.cols = len(self.grid[0]) if self.rows else 0
+        self.boundary = pygame.Rect(0, 0, self.cols * tile_size, self.rows * tile_size)
+        self.version = 0 # Bump via mark_changed() if tiles are edited at runtime
+        self._tile_rects = {} # {(x, y): Rect}, created on first use and then reused
+
+    def __len__(self):
+        return sum(row.count(self.solid_value) for row in self.grid)
+
+    def mark_changed(self):
+        """Call after editing self.grid so collider caches re-query."""
+        self._tile_rects.clear()
+        self.version += 1
+
+    def is_solid(self, tile_x, tile_y):
+        return 0 <= tile_y < self.rows and 0 <= tile_x < self.cols and self.grid[tile_y][tile_x] == self.solid_value
+
+    def query(self, range_rect):
+        """Rects of solid tiles overlapping range_rect (colliderect semantics: touching edges do not count)."""
+        x, y, w, h = range_rect
+        if w <= 0 or h <= 0 or not self.rows: return []
+        size = self.tile_size
+        tx0 = max(0, x // size); ty0 = max(0, y // size)
+        tx1 = min(self.cols - 1, (x + w - 1) // size); ty1 = min(self.rows - 1, (y + h - 1) // size)
+        found = []
+        grid = self.grid; solid = self.solid_value; tile_rects = self._tile_rects
+        for ty in range(ty0, ty1 + 1):
+            row = grid[ty]
+            for tx in range(tx0, tx1 + 1):
+                if row[tx] == solid:
+                    tile_rect = tile_rects.get((tx, ty))
+                    if tile_rect is None:
+                        tile_rect = tile_rects[(tx, ty)] = pygame.Rect(tx * size, ty * size, size, size)
+                    found.append(tile_rect)
+        return found
+
+    def query_batch(self, query_rects):
+        """One result list per query rect (queries are already O(tiles touched))."""
+        return [self.query(rect) for rect in query_rects]
+
+    def line_of_sight(self, x0, y0, x1, y1):
+        """True if the segment crosses no solid tile (walks exactly the tiles it passes through)."""
+        grid = self.grid; solid = self.solid_value; cols = self.cols; rows = self.rows
+        for tx, ty in iter_segment_cells(x0, y0, x1, y1, self.tile_size):
+            if 0 <= ty < rows and 0 <= tx < cols and grid[ty][tx] == solid: return False
+        return True
@@ -1,6 +1,12 @@
 import pygame
 import math
 
+# NumPy is optional: it vectorizes the batch geometry kernels; without them they loop in Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # --- Geometry Helpers ---
 def is_point_in_polygon(point, polygon_vertices):
     """Checks if a point is inside a given polygon using the Ray Casting algorithm."""
@@ -32,6 +38,57 @@ def point_segment_distance_sq(px, py, ax, ay, bx, by):
     dist_sq = (px - closest_x)**2 + (py - closest_y)**2
     return dist_sq
 
+# --- Batch Geometry Kernels ---
+# Array versions of the helpers above for testing thousands of candidates at once
+# (grass, spawns, distance fields). Without NumPy they return plain lists.
+def points_in_polygon(xs, ys, polygon_vertices):
+    """
+    is_point_in_polygon for arrays of x and y. Uses the same crossing rule and the
+    same arithmetic per edge, so every result matches the scalar version exactly.
+    Returns a bool array (or a list without NumPy).
+    """
+    if np is None:
+        return [is_point_in_polygon((x, y), polygon_vertices) for x, y in zip(xs, ys)]
+    xs = np.asarray(xs, dtype=np.float64); ys = np.asarray(ys, dtype=np.float64)
+    inside = np.zeros(xs.shape, dtype=bool)
+    n = len(polygon_vertices)
+    if n < 3: return inside
+    for i in range(n):
+        p1x, p1y = polygon_vertices[i]; p2x, p2y = polygon_vertices[(i + 1) % n]
+        if p1y == p2y: continue # A horizontal edge can never satisfy min_y < y <= max_y
+        crosses = (ys > min(p1y, p2y)) & (ys <= max(p1y, p2y)) & (xs <= max(p1x, p2x))
+        if p1x != p2x: # Vertical edges flip for every point left of them (already in `crosses`)
+            xinters = (ys - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
+            crosses &= xs <= xinters
+        inside ^= crosses
+    return inside
+
+def points_segments_min_distance_sq(xs, ys, segments):
+    """
+    Squared distance from each point to the nearest of `segments` ((ax, ay, bx, by) tuples).
+    Returns a float array (or a list without NumPy); inf if there are no segments.
+    """
+    if np is None:
+        return [min((point_segment_distance_sq(x, y, *seg) for seg in segments), default=float('inf'))
+                for x, y in zip(xs, ys)]
+    xs = np.asarray(xs, dtype=np.float64); ys = np.asarray(ys, dtype=np.float64)
+    best = np.full(xs.shape, np.inf)
+    for ax, ay, bx, by in segments:
+        dx = bx - ax; dy = by - ay
+        seg_len_sq = dx * dx + dy * dy
+        if seg_len_sq == 0:
+            dist_sq = (xs - ax) ** 2 + (ys - ay) ** 2 # Segment is a point
+        else:
+            t = np.clip(((xs - ax) * dx + (ys - ay) * dy) / seg_len_sq, 0.0, 1.0)
+            dist_sq = (xs - (ax + t * dx)) ** 2 + (ys - (ay + t * dy)) ** 2
+        np.minimum(best, dist_sq, out=best)
+    return best
+
+def polygon_edges(vertices):
+    """Closed polygon -> list of (ax, ay, bx, by) edges, for points_segments_min_distance_sq."""
+    n = len(vertices)
+    return [(vertices[i][0], vertices[i][1], vertices[(i + 1) % n][0], vertices[(i + 1) % n][1]) for i in range(n)]
+
 # --- Camera Helpers ---
 def apply_camera_to_point(world_x, world_y, camera_x, camera_y):
     """Converts world coordinates to screen coordinates based on camera position."""
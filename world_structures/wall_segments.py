@@ -0,0 +1,152 @@
+import math
+import pygame
+
+# --- Thick Wall Segment Colliders ---
+class WallSegment:
+    """
+    A wall collider shaped like a capsule: every point within `radius` of the segment
+    A-B is solid. `rect` is its bounding box, so spatial indexes (and pygame's
+    collidelist* functions) can store WallSegments next to ordinary Rect colliders.
+    Movers resolve against it with resolve_rect_against_segments().
+    """
+    __slots__ = ('ax', 'ay', 'bx', 'by', 'radius', 'rect', '_dx', '_dy', '_len_sq')
+
+    def __init__(self, a, b, thickness):
+        self.ax, self.ay = float(a[0]), float(a[1])
+        self.bx, self.by = float(b[0]), float(b[1])
+        self.radius = thickness / 2.0
+        self._dx = self.bx - self.ax; self._dy = self.by - self.ay
+        self._len_sq = self._dx * self._dx + self._dy * self._dy
+        pad = int(math.ceil(self.radius))
+        left = int(math.floor(min(self.ax, self.bx))) - pad; top = int(math.floor(min(self.ay, self.by))) - pad
+        right = int(math.ceil(max(self.ax, self.bx))) + pad; bottom = int(math.ceil(max(self.ay, self.by))) + pad
+        self.rect = pygame.Rect(left, top, right - left, bottom - top)
+
+    def __repr__(self):
+        return f"WallSegment(({self.ax:.0f},{self.ay:.0f})-({self.bx:.0f},{self.by:.0f}), r={self.radius:.1f})"
+
+    def to_stamp_rects(self, step_factor=0.8):
+        """Square stamps along the segment (the old generate_wall_rects shape), for Rect-only indexes."""
+        thickness = int(round(self.radius * 2)); step = max(1.0, thickness * step_factor)
+        length = math.sqrt(self._len_sq)
+        stamps = []
+        for j in range(int(length / step) + 1):
+            t = min(j * step, length) / length if length > 0 else 0.0
+            stamp = pygame.Rect(0, 0, thickness, thickness)
+            stamp.center = (int(self.ax + self._dx * t), int(self.ay + self._dy * t))
+            stamps.append(stamp)
+        return stamps
+
+    def closest_point(self, px, py):
+        """Closest point on the segment's core line A-B to (px, py)."""
+        if self._len_sq == 0: return self.ax, self.ay
+        t = ((px - self.ax) * self._dx + (py - self.ay) * self._dy) / self._len_sq
+        t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+        return self.ax + t * self._dx, self.ay + t * self._dy
+
+    def blocks_segment(self, x0, y0, x1, y1):
+        """True if the segment (x0, y0)-(x1, y1) passes through this capsule (line-of-sight test)."""
+        r_sq = self.radius * self.radius
+        # Crossing the core line blocks outright
+        px = x1 - x0; py = y1 - y0
+        denom = px * self._dy - py * self._dx
+        if denom != 0:
+            t = ((self.ax - x0) * self._dy - (self.ay - y0) * self._dx) / denom # Along the sight line
+            u = ((self.ax - x0) * py - (self.ay - y0) * px) / denom # Along the wall
+            if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0: return True
+        # Otherwise the closest approach involves an endpoint of one of the two segments
+        for qx, qy in ((x0, y0), (x1, y1)):
+            cx, cy = self.closest_point(qx, qy)
+            if (qx - cx) ** 2 + (qy - cy) ** 2 < r_sq: return True
+        seg_len_sq = px * px + py * py
+        for qx, qy in ((self.ax, self.ay), (self.bx, self.by)):
+            if seg_len_sq == 0: cx, cy = x0, y0
+            else:
+                t = ((qx - x0) * px + (qy - y0) * py) / seg_len_sq
+                t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+                cx, cy = x0 + t * px, y0 + t * py
+            if (qx - cx) ** 2 + (qy - cy) ** 2 < r_sq: return True
+        return False
+
+    def separation_from_rect(self, left, top, right, bottom):
+        """
+        Minimum push (dx, dy) that moves the box [left, right] x [top, bottom] out of
+        this capsule, or None if they do not overlap. The closest pair between the core
+        segment and the box is found by alternating projections (both are convex).
+        """
+        cx = (left + right) * 0.5; cy = (top + bottom) * 0.5
+        px, py = self.closest_point(cx, cy)
+        for _ in range(3):
+            qx = left if px < left else (right if px > right else px)
+            qy = top if py < top else (bottom if py > bottom else py)
+            px, py = self.closest_point(qx, qy)
+        qx = left if px < left else (right if px > right else px)
+        qy = top if py < top else (bottom if py > bottom else py)
+
+        dx = qx - px; dy = qy - py
+        dist_sq = dx * dx + dy * dy
+        if dist_sq >= self.radius * self.radius: return None
+        if dist_sq > 1e-9:
+            dist = math.sqrt(dist_sq)
+            push = self.radius - dist
+            return dx / dist * push, dy / dist * push
+        # The core line passes through the box: push perpendicular to the wall, towards the box center's side
+        if self._len_sq == 0:
+            nx, ny = 1.0, 0.0
+        else:
+            length = math.sqrt(self._len_sq)
+            nx, ny = -self._dy / length, self._dx / length
+            if (cx - px) * nx + (cy - py) * ny < 0: nx, ny = -nx, -ny
+        # Distance from the core line to the box's farthest corner along -n, plus the wall radius
+        half_w = (right - left) * 0.5; half_h = (bottom - top) * 0.5
+        depth = abs(nx) * half_w + abs(ny) * half_h - ((cx - px) * nx + (cy - py) * ny)
+        return nx * (depth + self.radius), ny * (depth + self.radius)
+
+
+def resolve_rect_against_segments(rect, segments, iterations=2):
+    """
+    Pushes `rect` (a pygame.Rect, modified in place) out of every overlapping
+    WallSegment. Returns True if it was moved. A couple of passes settle corners
+    where two segments meet.
+    """
+    moved = False
+    for _ in range(iterations):
+        pushed = False
+        for segment in segments:
+            if not rect.colliderect(segment.rect): continue
+            push = segment.separation_from_rect(rect.left, rect.top, rect.right, rect.bottom)
+            if push is None: continue
+            # Round away from zero so the integer rect really leaves the capsule
+            push_x = math.ceil(push[0]) if push[0] > 0 else math.floor(push[0])
+            push_y = math.ceil(push[1]) if push[1] > 0 else math.floor(push[1])
+            rect.move_ip(push_x, push_y)
+            pushed = moved = True
+        if not pushed: break
+    return moved
+
+
+def build_wall_segments(vertices, thickness, gate_segment_index, gate_point1, gate_point2):
+    """
+    One WallSegment per polygon edge (same signature as generate_wall_rects).
+    The gate edge is split into two segments leaving the opening between
+    gate_point1 and gate_point2.
+    """
+    segments = []; num_vertices = len(vertices)
+    for i in range(num_vertices):
+        p1 = pygame.math.Vector2(vertices[i]); p2 = pygame.math.Vector2(vertices[(i + 1) % num_vertices])
+        if i == gate_segment_index and gate_point1 and gate_point2:
+            if (gate_point1 - p1).length() > 1: segments.append(WallSegment(p1, gate_point1, thickness))
+            if (p2 - gate_point2).length() > 1: segments.append(WallSegment(gate_point2, p2, thickness))
+            continue
+        if (p2 - p1).length() < 1: continue # Skip zero-length segments
+        segments.append(WallSegment(p1, p2, thickness))
+    return segments
+
+
+def split_segments(colliders):
+    """Splits a mixed collider list into (rects, wall_segments)."""
+    rects = []; segments = []
+    for collider in colliders:
+        if collider.__class__ is WallSegment: segments.append(collider)
+        else: rects.append(collider)
+    return rects, segments
@@ -9,6 +9,9 @@ random.seed(RANDOM_SEED) # Seed should be set early
 
 # --- Animation Speed ---
 ANIMATION_SPEED_MS = 150 
+ANIMATION_CLOCK_RESYNC_MS = 1000 # (Client) Re-sync to the server clock if a snapshot disagrees by more than this
+SPRITE_FLASH_TINT = (180, 180, 180) # Added to a frame's RGB for the hurt/invulnerability flash variant
+SPRITE_FLASH_INTERVAL_MS = 100 # Invulnerable entities alternate normal/flash frames this often
 
 # --- Screen & General ---
 SCREEN_WIDTH = 1370
@@ -31,6 +34,7 @@ PLAYER_MAX_AGILITY = 0.60
 WORLD_WIDTH = 20000
 WORLD_HEIGHT = 20000
 SAVE_FILE_GRASS = "world_grass.pkl"
+SAVE_FILE_HPA = "world_hpa.pkl" # Cached hierarchical pathfinding graph (rebuilt if the colliders change)
 
 # --- Zone Definitions ---
 FOREST_CENTER_X = WORLD_WIDTH // 2
@@ -122,6 +126,22 @@ RIVER_CENTERLINE_STEP_Y = 50 # How often (in world pixels Y-direction) to sample
 # Quadtree Constants
 QT_NODE_CAPACITY = 4
 QT_MAX_DEPTH = 10
+STATIC_INDEX_CELL_SIZE = 256 # Cell size of the packed static collider grid (StaticGridIndex)
+COLLIDER_CACHE_MARGIN = 128 # Extra reach of each mover's cached collider region (px)
+SPATIAL_HASH_CELL_SIZE = 256 # Cell size for the dynamic entity hash (~ enemy detection radius)
+ENTITY_SLOT_BITS = 20 # Low bits of an entity id hold its registry slot (up to ~1M live entities), the rest its generation
+ZONE_MASK_CELL_SIZE = 64 # Cell size of the rasterized Zone membership masks
+WALL_FIELD_CELL_SIZE = 32 # Node spacing of the kingdom wall distance field
+WALL_FIELD_MARGIN = 400 # How far beyond the wall polygon's bounds the field extends (px)
+LOS_CACHE_TICKS = 6 # Server ticks a cached line-of-sight result stays valid (~0.1s at 60 ticks/s)
+NAV_CELL_SIZE = 32 # Navigation grid cell size (matches DUNGEON_TILE_SIZE so dungeon tiles map 1:1)
+NAV_AGENT_CLEARANCE = 12 # Colliders are grown by this much when marking blocked nav cells (px)
+FLOW_FIELD_MARGIN = 256 # Flow fields reach this far beyond the chasers' detection radius (px)
+FLOW_FIELD_IDLE_TICKS = 120 # Flow fields nobody has read for this many ticks are dropped
+HPA_CLUSTER_CELLS = 20 # Nav cells per side of an HPA* cluster (20 * 32px = 640px)
+HPA_ENTRANCE_SPLIT = 6 # Border openings at least this wide get a transition at each end instead of one in the middle
+HPA_SEARCH_BUDGET_MS = 2.0 # Abstract path searches the server runs per tick, in milliseconds (at least one)
+HPA_MIN_PATH_DISTANCE = 320 # Shorter trips just walk straight (px)
 
 # Dungeon Constants (Imported from dungeon_gen originally)
 # Need these for quadtree population and potentially drawing logic
@@ -129,4 +149,9 @@ DUNGEON_TILE_SIZE = 32
 TILE_FLOOR = 0
 TILE_WALL = 1
 DUNGEON_GRID_WIDTH = 150 # Example, match dungeon_gen
-DUNGEON_GRID_HEIGHT = 150 # Example, match dungeon_gen
\ No newline at end of file
+DUNGEON_GRID_HEIGHT = 150 # Example, match dungeon_gen
+# World Instance Constants (server hosts one instance per active mode)
+DUNGEON_ENTRANCE_X = KINGDOM_CENTER_X + KINGDOM_RADIUS + 600 # Overworld portal into the dungeon instance
+DUNGEON_ENTRANCE_Y = KINGDOM_CENTER_Y + 400
+PORTAL_SIZE = 64
+PORTAL_COLOR = (120, 40, 160)
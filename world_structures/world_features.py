@@ -1,6 +1,13 @@
+import math
 import pygame # For pygame.Rect
 # Assuming utils.py is in the same package 'world_structures'
-from .utils import is_point_in_polygon as util_is_point_in_polygon
+from .utils import is_point_in_polygon as util_is_point_in_polygon, point_segment_distance_sq, points_in_polygon, np
+from .world_constants import ZONE_MASK_CELL_SIZE
+
+# Zone mask cell classes
+MASK_OUTSIDE = 0
+MASK_INSIDE = 1
+MASK_BOUNDARY = 2 # An edge passes near this cell: use the exact polygon test
 
 class Zone:
     """
@@ -30,6 +37,55 @@ class Zone:
         else:
             self.bounds = pygame.Rect(0,0,0,0) # Invalid or empty polygon
 
+        self.mask = None # Optional membership bitmap, see build_mask()
+
+    def build_mask(self, cell_size=ZONE_MASK_CELL_SIZE):
+        """
+        Rasterizes the polygon into a coarse grid of inside/outside/boundary cells so
+        is_point_inside() is a single lookup away from the edges. A cell is "boundary"
+        if any edge comes within the cell's half-diagonal (+1px) of its center; only
+        those cells fall back to the exact ray-casting test, so results are identical.
+        """
+        if not self.polygon_points or len(self.polygon_points) < 3:
+            self.mask = None; return
+        # One spare cell on every side: points beyond the grid are strictly outside the polygon
+        self.mask_cell_size = cell_size
+        self.mask_origin_x = self.bounds.left - cell_size; self.mask_origin_y = self.bounds.top - cell_size
+        self.mask_cols = self.bounds.width // cell_size + 3; self.mask_rows = self.bounds.height // cell_size + 3
+        cols, rows = self.mask_cols, self.mask_rows
+        ox, oy = self.mask_origin_x, self.mask_origin_y
+        reach = cell_size * math.sqrt(0.5) + 1.0; reach_sq = reach * reach
+        boundary = bytearray(cols * rows)
+
+        # 1. Mark boundary cells by walking each edge's (padded) cell range
+        points = self.polygon_points; n = len(points)
+        for i in range(n):
+            ax, ay = points[i]; bx, by = points[(i + 1) % n]
+            cx0 = max(0, int((min(ax, bx) - reach - ox) // cell_size)); cx1 = min(cols - 1, int((max(ax, bx) + reach - ox) // cell_size))
+            cy0 = max(0, int((min(ay, by) - reach - oy) // cell_size)); cy1 = min(rows - 1, int((max(ay, by) + reach - oy) // cell_size))
+            for cy in range(cy0, cy1 + 1):
+                center_y = oy + (cy + 0.5) * cell_size
+                for cx in range(cx0, cx1 + 1):
+                    center_x = ox + (cx + 0.5) * cell_size
+                    if point_segment_distance_sq(center_x, center_y, ax, ay, bx, by) <= reach_sq:
+                        boundary[cy * cols + cx] = 1
+
+        # 2. Classify the rest row by row. Neighbouring non-boundary cells are edge-free, so
+        #    they share a side; the exact test only runs after each run of boundary cells.
+        mask = bytearray(cols * rows)
+        for cy in range(rows):
+            center_y = oy + (cy + 0.5) * cell_size
+            state = None
+            for cx in range(cols):
+                idx = cy * cols + cx
+                if boundary[idx]:
+                    mask[idx] = MASK_BOUNDARY; state = None; continue
+                if state is None:
+                    inside = util_is_point_in_polygon((ox + (cx + 0.5) * cell_size, center_y), points)
+                    state = MASK_INSIDE if inside else MASK_OUTSIDE
+                mask[idx] = state
+        self.mask = mask
+
     def is_point_inside(self, point):
         """
         Checks if a given point is inside this zone's polygon.
@@ -42,4 +98,38 @@ class Zone:
         """
         if not self.polygon_points or len(self.polygon_points) < 3:
             return False # Cannot be inside an invalid or empty polygon
-        return util_is_point_in_polygon(point, self.polygon_points)
\ No newline at end of file
+        mask = self.mask
+        if mask is not None:
+            cx = int((point[0] - self.mask_origin_x) // self.mask_cell_size)
+            cy = int((point[1] - self.mask_origin_y) // self.mask_cell_size)
+            if cx < 0 or cy < 0 or cx >= self.mask_cols or cy >= self.mask_rows:
+                return False # Beyond the padded bounding box
+            cell = mask[cy * self.mask_cols + cx]
+            if cell != MASK_BOUNDARY:
+                return cell == MASK_INSIDE
+        return util_is_point_in_polygon(point, self.polygon_points)
+
+    def points_inside(self, xs, ys):
+        """
+        Batch is_point_inside for arrays of x and y: mask lookups for every point, the
+        exact polygon kernel only for points in boundary cells. Returns a bool array
+        (or a list without NumPy).
+        """
+        if np is None:
+            return [self.is_point_inside((x, y)) for x, y in zip(xs, ys)]
+        xs = np.asarray(xs, dtype=np.float64); ys = np.asarray(ys, dtype=np.float64)
+        if not self.polygon_points or len(self.polygon_points) < 3:
+            return np.zeros(xs.shape, dtype=bool)
+        if self.mask is None:
+            return points_in_polygon(xs, ys, self.polygon_points)
+        cxs = np.floor((xs - self.mask_origin_x) / self.mask_cell_size).astype(np.int64)
+        cys = np.floor((ys - self.mask_origin_y) / self.mask_cell_size).astype(np.int64)
+        in_grid = (cxs >= 0) & (cys >= 0) & (cxs < self.mask_cols) & (cys < self.mask_rows)
+        cells = np.full(xs.shape, MASK_OUTSIDE, dtype=np.uint8) # Beyond the padded bounding box
+        mask = np.frombuffer(self.mask, dtype=np.uint8)
+        cells[in_grid] = mask[cys[in_grid] * self.mask_cols + cxs[in_grid]]
+        inside = cells == MASK_INSIDE
+        near_edge = np.nonzero(cells == MASK_BOUNDARY)[0]
+        if near_edge.size:
+            inside[near_edge] = points_in_polygon(xs[near_edge], ys[near_edge], self.polygon_points)
+        return inside